@@ -4,16 +4,446 @@
 # Description: Several classes relating to the various parts of chess to be used in a class named ChessVar
 # which plays an abstract variant of Chess
 
+import marshal
+import os
+import random
+import sys
+from array import array
+
+# Letters naming the columns of boards up to MAX_SIZE spots wide
+COLUMN_LETTERS = 'abcdefghijklmnop'
+MAX_SIZE = 16
+# Raised whenever the layout of the cached geometry tables changes, so older cache files are built again
+TABLE_VERSION = 1
+
+
+def _build_rays(width, height):
+    """Builds the bitboard rays leaving every square in each of the 8 directions, keyed by (column step, row step)"""
+    rays = {}
+    for step in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)):
+        rays[step] = []
+        for index in range(width * height):
+            col, row = index % width + step[0], index // width + step[1]
+            mask = 0
+            while 0 <= col < width and 0 <= row < height:
+                mask |= 1 << (row * width + col)
+                col, row = col + step[0], row + step[1]
+            rays[step].append(mask)
+        rays[step] = tuple(rays[step])
+    return rays
+
+
+def _build_between(rays, size):
+    """Builds a table holding, for every two squares, the bitboard of the squares strictly between them on a shared
+    line, or 0 if the squares do not share a row, column or diagonal"""
+    between = [[0] * size for _ in range(size)]
+    for ray in rays.values():
+        for start in range(size):
+            mask = ray[start]
+            while mask:
+                end_bit = mask & -mask
+                end = end_bit.bit_length() - 1
+                between[start][end] = ray[start] & ~ray[end] & ~end_bit
+                mask ^= end_bit
+    return tuple(tuple(row) for row in between)
+
+
+def _build_jumps(steps, width, height):
+    """Builds the bitboard of the squares a fixed set of (column step, row step) jumps reaches from every square"""
+    jumps = []
+    for index in range(width * height):
+        mask = 0
+        for col_step, row_step in steps:
+            col, row = index % width + col_step, index // width + row_step
+            if 0 <= col < width and 0 <= row < height:
+                mask |= 1 << (row * width + col)
+        jumps.append(mask)
+    return tuple(jumps)
+
+
+def _build_named_rays(steps, squares, width, height):
+    """Builds a dictionary from every square name to a tuple holding, for each (column step, row step) in steps,
+    the tuple of square names a piece passes over moving that way, nearest first"""
+    named_rays = {}
+    for index, name in enumerate(squares):
+        rays = []
+        for col_step, row_step in steps:
+            col, row = index % width + col_step, index // width + row_step
+            ray = []
+            while 0 <= col < width and 0 <= row < height:
+                ray.append(squares[row * width + col])
+                col, row = col + col_step, row + row_step
+            rays.append(tuple(ray))
+        named_rays[name] = tuple(rays)
+    return named_rays
+
+
+def _build_tables(width, height):
+    """Builds the tables of a Geometry that take time to work out, as a dictionary marshal can write to disk"""
+    squares = tuple(col + str(row) for row in range(1, height + 1) for col in COLUMN_LETTERS[:width])
+    rays = _build_rays(width, height)
+    king_bits = _build_jumps([(col, row) for col in (-1, 0, 1) for row in (-1, 0, 1) if col or row], width, height)
+    knight_bits = _build_jumps([(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)], width,
+                               height)
+    return {
+        'version': TABLE_VERSION,
+        'width': width,
+        'height': height,
+        'rays': rays,
+        'between': _build_between(rays, width * height),
+        'king_bits': king_bits,
+        'knight_bits': knight_bits,
+        # rook rays are ordered right, left, up, down and bishop rays up right, up left, down right, down left, the
+        # same order the rays have always been checked in
+        'rook_rays': _build_named_rays([(1, 0), (-1, 0), (0, 1), (0, -1)], squares, width, height),
+        'bishop_rays': _build_named_rays([(1, 1), (-1, 1), (1, -1), (-1, -1)], squares, width, height),
+    }
+
+
+class Geometry:
+    """The spots of a board of the inputted width and height, up to MAX_SIZE by MAX_SIZE, and the lookup tables the
+    move rules use for them, so no geometry is worked out while playing. Spots are numbered along each row from a1,
+    so a spot's bit in a bitboard is 1 << number. The tables are plain attributes so the rules can read them
+    without a method call:
+
+    width, height, size         the number of columns, rows and spots
+    columns, squares            the column letters, and the spot names in number order
+    square_index, spot_bits     spot name to number, and spot name to bit
+    rays                        (column step, row step) to the bitboard ray leaving every spot
+    between                     the bitboard of the spots strictly between two spots on a shared line
+    king_bits, knight_bits      the bitboard of the spots a king or knight jump reaches from every spot
+    rook_rays, bishop_rays      spot name to the rays of spot names a piece passes over, nearest first
+    king_area, knight_spots     spot name to the spot names around it (itself included) or a knight jump away
+    up_rays, down_rays, row_lines, bishop_lines     the lines used to find pins
+    row_masks                   the bitboard of each row, row_masks[row - 1]
+    rook_ray_indexes, bishop_ray_indexes, king_area_indexes, knight_indexes     the named tables by spot number
+
+    tables is a dictionary made by _build_tables; use get_geometry rather than building one directly"""
+    def __init__(self, width=8, height=8, tables=None):
+        if not (1 <= width <= MAX_SIZE and 1 <= height <= MAX_SIZE):
+            raise ValueError('boards can be 1 to ' + str(MAX_SIZE) + ' spots wide and high')
+        if tables is None:
+            tables = _build_tables(width, height)
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.columns = tuple(COLUMN_LETTERS[:width])
+        self.squares = tuple(col + str(row) for row in range(1, height + 1) for col in self.columns)
+        self.square_index = {name: index for index, name in enumerate(self.squares)}
+        self.spot_bits = {name: 1 << index for index, name in enumerate(self.squares)}
+        self.rays = tables['rays']
+        self.between = tables['between']
+        self.king_bits = tables['king_bits']
+        self.knight_bits = tables['knight_bits']
+        self.rook_rays = tables['rook_rays']
+        self.bishop_rays = tables['bishop_rays']
+        self.king_area = {name: self.spot_names(self.king_bits[index] | 1 << index)
+                          for index, name in enumerate(self.squares)}
+        self.knight_spots = {name: self.spot_names(self.knight_bits[index])
+                             for index, name in enumerate(self.squares)}
+        self.up_rays = self.rays[(0, 1)]
+        self.down_rays = self.rays[(0, -1)]
+        self.row_lines = tuple(right | left for right, left in zip(self.rays[(1, 0)], self.rays[(-1, 0)]))
+        self.bishop_lines = tuple(a | b | c | d for a, b, c, d in zip(self.rays[(1, 1)], self.rays[(-1, 1)],
+                                                                     self.rays[(1, -1)], self.rays[(-1, -1)]))
+        self.row_masks = tuple(((1 << width) - 1) << (row * width) for row in range(height))
+        # the named tables with spot numbers in place of names, used by CompactBoard
+        self.rook_ray_indexes = self._to_indexes(self.rook_rays)
+        self.bishop_ray_indexes = self._to_indexes(self.bishop_rays)
+        self.king_area_indexes = tuple(tuple(self.square_index[spot] for spot in self.king_area[name])
+                                       for name in self.squares)
+        self.knight_indexes = tuple(tuple(self.square_index[spot] for spot in self.knight_spots[name])
+                                    for name in self.squares)
+
+    def __repr__(self):
+        return 'Geometry(' + str(self.width) + ', ' + str(self.height) + ')'
+
+    def _to_indexes(self, named_rays):
+        """Returns a table of named rays as a tuple indexed by spot number, holding the rays as spot numbers"""
+        return tuple(tuple(tuple(self.square_index[spot] for spot in ray) for ray in named_rays[name])
+                     for name in self.squares)
+
+    def spot_names(self, mask):
+        """Returns the tuple of spot names for the spots set in a bitboard, lowest number first"""
+        names = []
+        while mask:
+            low_bit = mask & -mask
+            names.append(self.squares[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return tuple(names)
+
+    def is_spot(self, pos):
+        """Returns True if pos names a spot on the board"""
+        return pos in self.square_index
+
+
+def table_cache_dir():
+    """Returns the directory geometry tables are cached in: $CHESSVAR_CACHE if it is set, or else ~/.cache/chessvar"""
+    return os.environ.get('CHESSVAR_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'chessvar')
+
+
+def _table_path(width, height, cache_dir):
+    """Returns the cache file name of the tables of a width by height board"""
+    return os.path.join(cache_dir, 'geometry-' + str(width) + 'x' + str(height) + '.tables')
+
+
+_geometries = {}
+
+
+def get_geometry(width=8, height=8, cache_dir=None):
+    """Returns the Geometry of a width by height board. Each size is only built once per process. Other sizes than
+    8 by 8 are also cached on disk in cache_dir (table_cache_dir() if none is entered), so later processes read the
+    tables back instead of building them. A cache that can not be read or written is built around, not an error"""
+    geometry = _geometries.get((width, height))
+    if geometry is not None:
+        return geometry
+    if not (1 <= width <= MAX_SIZE and 1 <= height <= MAX_SIZE):
+        raise ValueError('boards can be 1 to ' + str(MAX_SIZE) + ' spots wide and high')
+    path = _table_path(width, height, cache_dir or table_cache_dir())
+    tables = None
+    try:
+        with open(path, 'rb') as table_file:
+            tables = marshal.loads(table_file.read())
+        if tables.get('version') != TABLE_VERSION or (tables.get('width'), tables.get('height')) != (width, height):
+            tables = None
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        tables = None
+    if tables is None:
+        tables = _build_tables(width, height)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'wb') as table_file:
+                marshal.dump(tables, table_file)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+    geometry = Geometry(width, height, tables)
+    _geometries[(width, height)] = geometry
+    return geometry
+
+
+# The standard 8 by 8 board, built at import without using the disk cache. The module level tables below are its
+# tables under their original names
+DEFAULT_GEOMETRY = Geometry(8, 8)
+_geometries[(8, 8)] = DEFAULT_GEOMETRY
+
+# Square names in index order. Index 0 is a1, index 7 is h1 and index 63 is h8, so a square's bit in a bitboard
+# is 1 << index
+COLUMNS = DEFAULT_GEOMETRY.columns
+SQUARES = DEFAULT_GEOMETRY.squares
+SQUARE_INDEX = DEFAULT_GEOMETRY.square_index
+ROW_8 = DEFAULT_GEOMETRY.row_masks[7]
+RAYS = DEFAULT_GEOMETRY.rays
+BETWEEN = DEFAULT_GEOMETRY.between
+# The lines used to find pins: up and down a column, along a row, and both diagonals
+UP_RAYS = DEFAULT_GEOMETRY.up_rays
+DOWN_RAYS = DEFAULT_GEOMETRY.down_rays
+ROW_LINES = DEFAULT_GEOMETRY.row_lines
+BISHOP_LINES = DEFAULT_GEOMETRY.bishop_lines
+KING_BITS = DEFAULT_GEOMETRY.king_bits
+KNIGHT_BITS = DEFAULT_GEOMETRY.knight_bits
+# Lookup tables used by the piece_access methods. King areas hold the spot itself as well as the 8 around it
+ROOK_RAYS = DEFAULT_GEOMETRY.rook_rays
+BISHOP_RAYS = DEFAULT_GEOMETRY.bishop_rays
+KING_AREA = DEFAULT_GEOMETRY.king_area
+KNIGHT_SPOTS = DEFAULT_GEOMETRY.knight_spots
+# The bit of every square name, used to build the access bitboards
+SPOT_BITS = DEFAULT_GEOMETRY.spot_bits
+
+
+def _slide(ray, index, blockers, forward):
+    """Returns the part of a ray leaving the spot numbered index up to and including the first spot in blockers.
+    forward is True for rays that move towards higher spot numbers"""
+    hits = ray[index] & blockers
+    if not hits:
+        return ray[index]
+    if forward:
+        stop = (hits & -hits).bit_length() - 1
+    else:
+        stop = hits.bit_length() - 1
+    return ray[index] & ~ray[stop]
+
+
+def _unpack_position(data, board=None):
+    """Returns the (spots, to_move, last_move) of a position packed by ChessVar.to_bytes for the inputted board, or
+    for a Board() if none is entered: the spot of each piece in the order of the white and then black piece lists"""
+    if board is None:
+        geometry, king_numbers, white_count, count = DEFAULT_GEOMETRY, (1, 7), 6, 12
+    else:
+        geometry, king_numbers = board.get_geometry(), board.get_king_numbers()
+        white_count, count = len(board.get_white_pcs()), len(board.get_white_pcs()) + len(board.get_black_pcs())
+    bits = _spot_bit_count(geometry)
+    mask = (1 << bits) - 1
+    packed = int.from_bytes(data, 'little')
+    spots = []
+    for number in range(count):
+        index = packed >> (bits * number) & mask
+        king_number = king_numbers[0] if number < white_count else king_numbers[1]
+        if number != king_number and index == packed >> (bits * king_number) & mask:
+            spots.append('0')
+        else:
+            spots.append(geometry.squares[index])
+    flags = packed >> (bits * count)
+    return tuple(spots), 'b' if flags & 1 else 'w', not flags >> 1 & 1
+
+
+def _spot_bit_count(geometry):
+    """Returns the number of bits to_bytes uses for each spot of the inputted geometry"""
+    return max(1, (geometry.size - 1).bit_length())
+
+
+class GameEvent:
+    """The base class of the structured events a ChessVar game gives to its observers"""
+    def __repr__(self):
+        return type(self).__name__ + repr(vars(self))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __hash__(self):
+        # events of one class set their fields in the same order, so equal events give equal tuples
+        return hash((type(self), tuple(vars(self).values())))
+
+
+class MoveMade(GameEvent):
+    """A piece was moved. game_state is the state of the game after the move"""
+    def __init__(self, move_from, move_to, token, game_state):
+        self._move_from = move_from
+        self._move_to = move_to
+        self._token = token
+        self._game_state = game_state
+
+    def get_move(self):
+        """Returns the (move_from, move_to) pair of the move"""
+        return self._move_from, self._move_to
+
+    def get_token(self):
+        """Returns the token of the piece that moved"""
+        return self._token
+
+    def get_game_state(self):
+        """Returns the state of the game after the move"""
+        return self._game_state
+
+
+class Capture(GameEvent):
+    """A piece was captured at pos. Sent just before the MoveMade event of the capturing move"""
+    def __init__(self, pos, captured_token, token):
+        self._pos = pos
+        self._captured_token = captured_token
+        self._token = token
+
+    def get_pos(self):
+        """Returns the spot the capture happened on"""
+        return self._pos
+
+    def get_captured_token(self):
+        """Returns the token of the captured piece"""
+        return self._captured_token
+
+    def get_token(self):
+        """Returns the token of the capturing piece"""
+        return self._token
+
+
+class IllegalMove(GameEvent):
+    """A move was turned down by make_move. The reason is one of the reason constants of this class"""
+    GAME_OVER = 'GAME_OVER'
+    BAD_SPOT = 'BAD_SPOT'
+    NO_PIECE = 'NO_PIECE'
+    OUT_OF_TURN = 'OUT_OF_TURN'
+    OWN_PIECE = 'OWN_PIECE'
+    INVALID_MOVEMENT = 'INVALID_MOVEMENT'
+
+    def __init__(self, move_from, move_to, reason):
+        self._move_from = move_from
+        self._move_to = move_to
+        self._reason = reason
+
+    def get_move(self):
+        """Returns the (move_from, move_to) pair that was entered"""
+        return self._move_from, self._move_to
+
+    def get_reason(self):
+        """Returns why the move was turned down"""
+        return self._reason
+
+
+class GameOver(GameEvent):
+    """The game ended. game_state is 'WHITE_WON', 'BLACK_WON' or 'TIE'"""
+    def __init__(self, game_state):
+        self._game_state = game_state
+
+    def get_game_state(self):
+        """Returns the final state of the game"""
+        return self._game_state
+
+
+class BufferedRenderer:
+    """An observer that draws the board after every move into a buffer instead of printing it, so a headless game
+    can still be shown. The text is the same as print_board's"""
+    def __init__(self, game):
+        self._board = game.get_board()
+        self._buffer = []
+        game.add_observer(self)
+
+    def __call__(self, event):
+        if isinstance(event, MoveMade):
+            self._buffer.append(self._board.render_board())
+        elif isinstance(event, GameOver):
+            self._buffer.append(event.get_game_state() + '\n')
+
+    def get_output(self):
+        """Returns everything drawn since the buffer was last flushed"""
+        return ''.join(self._buffer)
+
+    def flush(self, stream=None):
+        """Writes everything drawn to the inputted stream, standard output by default, and empties the buffer"""
+        if stream is None:
+            stream = sys.stdout
+        stream.write(self.get_output())
+        self._buffer = []
+
 
 class ChessVar:
     """Uses several classes to represent an abstract variant of Chess"""
-    def __init__(self):
+    def __init__(self, board=None, headless=False):
+        """Starts a new game. A Board, or any class that extends it such as BitBoard, can be passed in to play on
+        instead of the default Board, and boards can be set up for another Variant. A headless game never prints
+        anything; use add_observer to follow it"""
         self._game_state = "UNFINISHED"
         self._to_move = 'w'
         self._waiting = 'b'
-        self._board = Board()
+        if board is None:
+            board = Board()
+        self._board = board
+        self._square_index = board.get_geometry().square_index
         self._last_move = True
-        self._board.print_board()
+        self._undo_stack = []
+        self._snapshot = None
+        self._searcher = None
+        self._headless = headless
+        self._observers = []
+        if not headless:
+            self._board.print_board()
+
+    def is_headless(self):
+        """Returns True if the game never prints anything"""
+        return self._headless
+
+    def add_observer(self, observer):
+        """Adds a callable that make_move calls with a GameEvent for every move made, illegal move, capture and
+        game over"""
+        self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        """Removes a callable added with add_observer"""
+        self._observers.remove(observer)
+
+    def _notify(self, event):
+        """Calls every observer with the inputted GameEvent"""
+        for observer in self._observers:
+            observer(event)
 
     def get_game_state(self):
         """Returns the value of the variable self._game_state"""
@@ -22,24 +452,56 @@ class ChessVar:
     def check_kings(self):
         """Checks the current row that the king pieces are located in throughout the game and will change the
         self._game_state accordingly"""
-        if self._board.get_white_king_row() == 8:
+        self._update_game_state()
+        if self._game_state != 'UNFINISHED' and not self._headless:
+            print(self._game_state)
+
+    def _update_game_state(self):
+        """Does the work of check_kings without printing anything. The kings race to the goal row of the board's
+        Variant, which is row 8 of the standard game"""
+        goal_row = self._board.get_goal_row()
+        if self._board.get_white_king_row() == goal_row:
             if self._last_move is True:
                 self._last_move = False
                 return
-            elif self._board.get_black_king_row() != 8:
+            elif self._board.get_black_king_row() != goal_row:
                 self._game_state = 'WHITE_WON'
-                print(self._game_state)
-            elif self._board.get_black_king_row() == 8:
+            elif self._board.get_black_king_row() == goal_row:
                 self._game_state = 'TIE'
-                print(self._game_state)
-        elif self._board.get_black_king_row() == 8:
+        elif self._board.get_black_king_row() == goal_row:
             self._game_state = 'BLACK_WON'
-            print(self._game_state)
 
     def get_board(self):
         """Returns the value of the variable self._board"""
         return self._board
 
+    def get_zobrist_key(self):
+        """Returns a 64-bit Zobrist hash of the position: where the pieces are, whose turn it is and if white's king
+        has already used the extra move check_kings gives after reaching row 8. Equal positions reached by
+        different move orders get the same key"""
+        key = self._board.get_zobrist_key()
+        if self._to_move == 'b':
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        if self._last_move is False:
+            key ^= ZOBRIST_LAST_MOVE_USED
+        return key
+
+    def best_move(self, time_limit=None, max_depth=None):
+        """Searches for the best move for the player whose turn it is with the alpha-beta engine in search.py and
+        returns it as a (move_from, move_to) pair, or None if there is no legal move. The search stops after
+        time_limit seconds or max_depth moves ahead. get_search_info returns the nodes searched and nodes/second.
+        Raises ValueError if the board is set up for any other variant than the standard game"""
+        if self._searcher is None:
+            from search import Searcher
+            self._searcher = Searcher()
+        return self._searcher.search(self, time_limit, max_depth)
+
+    def get_search_info(self):
+        """Returns a dictionary describing the last search made by best_move, or None if there has not been one"""
+        if self._searcher is None:
+            return None
+        return self._searcher.get_info()
+
     def get_to_move(self):
         """Returns the value of the variable self._to_move"""
         return self._to_move
@@ -48,10 +510,18 @@ class ChessVar:
         """Returns the value of the variable self._waiting"""
         return self._waiting
 
+    def legal_moves(self):
+        """Returns a list of every (move_from, move_to) pair that make_move would accept for the player whose turn it
+        is. The board and game are not changed and nothing is printed"""
+        if self._game_state != 'UNFINISHED':
+            return []
+        return self._board.generate_legal_moves(self._to_move)
+
     @staticmethod
     def check_moves(move_from, move_to):
         """A static method that returns True or False based on if the player entered positions are valid
-         positions on the board or not"""
+         positions on the standard 8 by 8 board or not. get_illegal_reason checks the spots of the game's own
+         board instead"""
         row_set = {'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'}
         col_set = {'1', '2', '3', '4', '5', '6', '7', '8'}
         if move_from != move_to:
@@ -60,52 +530,230 @@ class ChessVar:
                     return True
         return False
 
-    def make_move(self, move_from, move_to):
-        """Method to move a piece on the current game's board from its current position to a new position on the
-         board. Makes any checks and updates to the game as necessary"""
+    def get_illegal_reason(self, move_from, move_to):
+        """Returns None if make_move would accept moving the piece at move_from to move_to, or else the IllegalMove
+        reason it would be turned down for. Nothing is changed or printed"""
         if self._game_state != 'UNFINISHED':
-            print('The game is over: ' + self.get_game_state())
-            return False
-        elif self.check_moves(move_from, move_to):
+            return IllegalMove.GAME_OVER
+        elif move_from != move_to and move_from in self._square_index and move_to in self._square_index:
             # check what piece is at the inputted position
             piece = self._board.get_piece(move_from)  # store actual obj of piece
-            if self._board.get_piece(move_from) == '___':
-                print("No piece at entered spot")
-                return False
+            if piece == '___':
+                return IllegalMove.NO_PIECE
             # check if piece can be moved
             if piece.token()[0] != self._to_move:
-                print('Invalid move! Out of turn order')
-                return False
-            else:
-                # if piece is valid, check if the position it is being moved to is also valid
-                pc_at_new_spot = self._board.get_piece(move_to)
-                if pc_at_new_spot == '___' or pc_at_new_spot.get_color() == self._waiting:
-                    # check if attempted move is valid
-                    if piece.valid_movement(move_to, self.get_board()):
-                        # update piece pos and board
-                        if pc_at_new_spot != '___':
-                            pc_at_new_spot.update_pos('0')
-                        piece.update_pos(move_to)
-                        self._board.update_board(move_from, '___')
-                        self._board.update_board(move_to, piece)
-                        self._board.print_board()
-                        # check positions of kings and change move turn
-                        self.check_kings()
-                        self._to_move, self._waiting = self._waiting, self._to_move
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+                return IllegalMove.OUT_OF_TURN
+            # if piece is valid, check if the position it is being moved to is also valid
+            pc_at_new_spot = self._board.get_piece(move_to)
+            if pc_at_new_spot != '___' and pc_at_new_spot.get_color() != self._waiting:
+                return IllegalMove.OWN_PIECE
+            # check if attempted move is valid
+            if not piece.valid_movement(move_to, self.get_board()):
+                return IllegalMove.INVALID_MOVEMENT
+            return None
         else:
+            return IllegalMove.BAD_SPOT
+
+    def make_move(self, move_from, move_to):
+        """Method to move a piece on the current game's board from its current position to a new position on the
+         board. Makes any checks and updates to the game as necessary. Observers are told about the result"""
+        reason = self.get_illegal_reason(move_from, move_to)
+        if reason is not None:
+            if not self._headless:
+                if reason == IllegalMove.GAME_OVER:
+                    print('The game is over: ' + self.get_game_state())
+                elif reason == IllegalMove.NO_PIECE:
+                    print("No piece at entered spot")
+                elif reason == IllegalMove.OUT_OF_TURN:
+                    print('Invalid move! Out of turn order')
+            if self._observers:
+                self._notify(IllegalMove(move_from, move_to, reason))
             return False
 
+        # update piece pos and board, check positions of kings and change move turn
+        piece = self._board.get_piece(move_from)
+        captured = self._board.get_piece(move_to)
+        self.push((move_from, move_to))
+        if not self._headless:
+            self._board.print_board()
+            if self._game_state != 'UNFINISHED':
+                print(self._game_state)
+        if self._observers:
+            if captured != '___':
+                self._notify(Capture(move_to, captured.token(), piece.token()))
+            self._notify(MoveMade(move_from, move_to, piece.token(), self._game_state))
+            if self._game_state != 'UNFINISHED':
+                self._notify(GameOver(self._game_state))
+        return True
+
+    def push(self, move):
+        """Plays a (move_from, move_to) move without checking it or printing anything, and saves what is needed to
+        take it back with pop. The move should come from legal_moves"""
+        move_from, move_to = move
+        piece = self._board.get_piece(move_from)
+        captured = self._board.get_piece(move_to)
+        self._undo_stack.append((move_from, move_to, captured, self._last_move, self._game_state))
+        self._snapshot = None
+        if captured != '___':
+            captured.update_pos('0')
+        piece.update_pos(move_to)
+        self._board.update_spots(((move_from, '___'), (move_to, piece)))
+        self._update_game_state()
+        self._to_move, self._waiting = self._waiting, self._to_move
+
+    def pop(self):
+        """Takes back the last move played by push or make_move, putting back any captured piece, the turn, the
+        value of self._last_move and the game state. Returns the (move_from, move_to) move that was taken back"""
+        move_from, move_to, captured, last_move, game_state = self._undo_stack.pop()
+        self._snapshot = None
+        piece = self._board.get_piece(move_to)
+        piece.update_pos(move_from)
+        self._board.update_spots(((move_to, captured), (move_from, piece)))
+        if captured != '___':
+            captured.update_pos(move_to)
+        self._last_move = last_move
+        self._game_state = game_state
+        self._to_move, self._waiting = self._waiting, self._to_move
+        return move_from, move_to
+
+    def get_position(self):
+        """Returns a small tuple describing the current position that can be pickled and sent between processes:
+        the spots of the pieces in the order of the white and then black piece lists ('0' for a captured piece),
+        whose turn it is, the value of self._last_move and the game state"""
+        board = self._board
+        spots = tuple(piece.get_current_pos() for piece in board.get_white_pcs() + board.get_black_pcs())
+        return spots, self._to_move, self._last_move, self._game_state
+
+    def set_position(self, position):
+        """Puts the game into a position returned by get_position, or a Position from snapshot. A game state of None
+        is worked out from the position with the check_kings rules. Moves saved for pop are forgotten"""
+        spots, to_move, last_move, game_state = position[:4]
+        self._snapshot = None
+        self._board.place_pieces(spots)
+        self._to_move = to_move
+        self._waiting = 'b' if to_move == 'w' else 'w'
+        self._last_move = last_move
+        self._game_state = game_state
+        if game_state is None:
+            self._game_state = self._find_game_state()
+        self._undo_stack = []
+
+    def snapshot(self):
+        """Returns an immutable Position of the current position. The Position is kept until the next move, pop or
+        set_position, so asking for it again costs nothing, and no later change to the game can alter it"""
+        if self._snapshot is None:
+            spots, to_move, last_move, game_state = self.get_position()
+            self._snapshot = Position(spots, to_move, last_move, game_state, self._board.get_variant())
+        return self._snapshot
+
+    @classmethod
+    def from_snapshot(cls, position, board_class=None, headless=True):
+        """Returns a new game in the inputted Position, on a new board of board_class (Board if none is entered)
+        set up for the Position's Variant. The game is headless unless headless is False"""
+        board = (Board if board_class is None else board_class)(position.get_variant())
+        board.place_pieces(position.get_spots())
+        game = cls(board, headless)
+        game.set_position(position)
+        return game
+
+    def _find_game_state(self):
+        """Works out the game state of the current position from where the kings are, whose turn it is and
+        self._last_move, using the same rules as check_kings"""
+        white_row = self._board.get_white_king_row()
+        black_row = self._board.get_black_king_row()
+        goal_row = self._board.get_goal_row()
+        if white_row == goal_row and self._last_move is False and self._to_move == 'w':
+            return 'TIE' if black_row == goal_row else 'WHITE_WON'
+        if black_row == goal_row and white_row != goal_row:
+            return 'BLACK_WON'
+        return 'UNFINISHED'
+
+    def get_fen(self):
+        """Returns a FEN-style text description of the position: the piece placement, whose turn it is, and 'g' if
+        white's king has reached row 8 and black is using its last move or '-' if not"""
+        return self._board.get_fen_placement() + ' ' + self._to_move + ' ' + ('-' if self._last_move else 'g')
+
+    def set_fen(self, fen):
+        """Puts the game into the position described by a get_fen style text. Raises ValueError if it is not
+        valid"""
+        fields = self._split_fen(fen)
+        spots = self._board.fen_to_spots(fields[0])
+        self.set_position((spots, fields[1], fields[2] == '-', None))
+
+    @staticmethod
+    def _split_fen(fen):
+        """Returns the three fields of a get_fen style text, raising ValueError if they are not valid"""
+        fields = fen.split()
+        if len(fields) != 3 or fields[1] not in ('w', 'b') or fields[2] not in ('-', 'g'):
+            raise ValueError('a position needs a placement, w or b, and - or g: ' + fen)
+        return fields
+
+    @classmethod
+    def from_fen(cls, fen, board=None, headless=False):
+        """Returns a new game in the position described by a get_fen style text. The board, which is a new Board
+        if none is entered, is set up before the game starts so the right position is printed"""
+        if board is None:
+            board = Board()
+        board.place_pieces(board.fen_to_spots(cls._split_fen(fen)[0]))
+        game = cls(board, headless)
+        game.set_fen(fen)
+        return game
+
+    def to_bytes(self):
+        """Returns the position packed into POSITION_BYTES bytes for the standard game: 6 bits for the spot of each
+        of the 12 pieces in piece list order (a captured piece is stored on its own king's spot, which no other piece
+        can hold), then a bit for black to move and a bit for white having used its last move. Other variants use
+        as many bits per spot as their number of spots needs and as many bytes as their pieces fill"""
+        spots, to_move, last_move, game_state = self.get_position()
+        geometry = self._board.get_geometry()
+        king_numbers = self._board.get_king_numbers()
+        bits = _spot_bit_count(geometry)
+        packed = 0
+        king_spots = {'w': geometry.square_index[spots[king_numbers[0]]],
+                      'b': geometry.square_index[spots[king_numbers[1]]]}
+        pieces = self._board.get_white_pcs() + self._board.get_black_pcs()
+        for number, spot in enumerate(spots):
+            if spot == '0':
+                index = king_spots[pieces[number].get_color()]
+            else:
+                index = geometry.square_index[spot]
+            packed |= index << (bits * number)
+        if to_move == 'b':
+            packed |= 1 << (bits * len(spots))
+        if last_move is False:
+            packed |= 1 << (bits * len(spots) + 1)
+        return packed.to_bytes((bits * len(spots) + 9) // 8, 'little')
+
+    def set_bytes(self, data):
+        """Puts the game into a position packed by to_bytes"""
+        spots, to_move, last_move = _unpack_position(data, self._board)
+        self.set_position((spots, to_move, last_move, None))
+
+    @classmethod
+    def from_bytes(cls, data, board=None, headless=False):
+        """Returns a new game in a position packed by to_bytes"""
+        if board is None:
+            board = Board()
+        board.place_pieces(_unpack_position(data, board)[0])
+        game = cls(board, headless)
+        game.set_bytes(data)
+        return game
+
+    def get_undo_depth(self):
+        """Returns how many moves can currently be taken back with pop"""
+        return len(self._undo_stack)
+
 
 class ChessPiece:
-    """The base class to represent a chess piece for the ChessVar class"""
-    def __init__(self, color, current_pos):
+    """The base class to represent a chess piece for the ChessVar class. Pieces use __slots__ so the many games held
+    by an engine or server do not each carry twelve instance dictionaries"""
+    __slots__ = ('_color', '_current_pos', '_access_bits', '_geometry')
+
+    def __init__(self, color, current_pos, geometry=None):
         self._color = color
         self._current_pos = current_pos
+        self._access_bits = 0
+        self._geometry = DEFAULT_GEOMETRY if geometry is None else geometry
 
     def get_color(self):
         """Returns the current value of the variable self._color"""
@@ -119,13 +767,24 @@ class ChessPiece:
         """Changes the value of the variable self._current_pos to equal the inputted value represented by new_pos"""
         self._current_pos = new_pos
 
+    def get_geometry(self):
+        """Returns the Geometry of the board the piece is played on"""
+        return self._geometry
+
+    def get_access_bits(self):
+        """Returns the spots found by the last piece_access call that returned True, as a bitboard"""
+        return self._access_bits
+
+    def get_access_set(self):
+        """Returns the set of spot names found by the last piece_access call that returned True. The set is built
+        from self._access_bits when asked for, so piece_access itself never makes one"""
+        return set(self._geometry.spot_names(self._access_bits))
+
 
 class King(ChessPiece):
     """An extension of the ChessPiece class. Represents the king piece type for the ChessVar class"""
-    def __init__(self, color, current_pos):
-        super().__init__(color, current_pos)
-        self._is_king = True
-        self._access_set = set()
+    __slots__ = ()
+    _is_king = True
 
     def token(self):
         """Creates the visual for the king piece type on the printed chess board"""
@@ -135,87 +794,56 @@ class King(ChessPiece):
         """Returns the current value of the self._is_king variable"""
         return self._is_king
 
-    def get_access_set(self):
-        """Returns the current value of the self._access_set variable"""
-        return self._access_set
-
     def piece_access(self, temp_pos, board, moving_pc_current_pos=None):
         """Checks where on the board a piece has access to based on its movement and position of other pieces
-        on the board. Stores valid positions in the self._access_set"""
-        row_tup = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
-        current_col = row_tup.index(temp_pos[0])
-        current_row = int(temp_pos[1])
-        temp_access_set = set()
-
-        for row in range(current_row - 1, current_row + 2):
-            if row <= 0 or row > 8:
-                continue
+        on the board. Stores valid positions in the self._access_bits"""
+        spot_bits = self._geometry.spot_bits
+        temp_access_bits = 0
 
-            new_row = str(row)
-            for col in range(current_col - 1, current_col + 2):
-                if col < 0 or col > 7:
-                    continue
-                new_col = row_tup[col]
-                spot = new_col + new_row
-                pc_at_spot = board.get_piece(spot)
-                if spot == self._current_pos:
-                    continue
-                elif spot == moving_pc_current_pos:
-                    temp_access_set.add(spot)
-                    continue
-                elif pc_at_spot == '___':
-                    temp_access_set.add(new_col + new_row)
-                elif pc_at_spot.get_color() == self._color:
-                    continue
-                elif pc_at_spot.is_king():
-                    return False
-        self._access_set = temp_access_set
+        for spot in self._geometry.king_area[temp_pos]:
+            if spot == self._current_pos:
+                continue
+            elif spot == moving_pc_current_pos:
+                temp_access_bits |= spot_bits[spot]
+                continue
+            pc_at_spot = board.get_piece(spot)
+            if pc_at_spot == '___':
+                temp_access_bits |= spot_bits[spot]
+            elif pc_at_spot.get_color() == self._color:
+                continue
+            elif pc_at_spot.is_king():
+                return False
+        self._access_bits = temp_access_bits
         return True
 
     def valid_movement(self, new_pos, board):
         """Checks if moving the king piece type on the board from its current position
          to the inputted new_pos on the board is a valid move"""
         new_pos_state = board.get_piece(new_pos)
-        row_tup = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
-        current_col = row_tup.index(self._current_pos[0])
-        new_col = row_tup.index(new_pos[0])
 
         # check new spot
         if new_pos_state != '___':
             if new_pos_state.get_color() == self._color:
                 return False
 
-        # check if row or column is more than one away from current
-        if abs(int(new_pos[1]) - int(self._current_pos[1])) <= 1:
-            if abs(new_col - current_col) <= 1:
+        # check the new spot is no more than one row and column away from current
+        if new_pos in self._geometry.king_area[self._current_pos]:
 
-                # KING IN CHECK...CHECK
-                if self.piece_access(new_pos, board):
-                    if board.all_pc_access(self._current_pos):
-                        if self._color == 'w':
-                            pc_sets = board.get_black_pcs()
-                        else:
-                            pc_sets = board.get_white_pcs()
-                        for pc in pc_sets:
-                            pc_pos = pc.get_current_pos()
-                            if pc_pos == '0':
-                                continue
-                            pc.piece_access(pc.get_current_pos(), board)
-                            pc_set = pc.get_access_set()
-                            if new_pos in pc_set:
-                                return False
-                        return True
-                    else:
+            # KING IN CHECK...CHECK
+            if not board.get_check_spots(self._color, King) & self._geometry.spot_bits[new_pos]:
+                if board.all_pc_access(self._current_pos):
+                    if board.king_spot_attacked(new_pos, self._color, self._current_pos):
                         return False
+                    return True
+                else:
+                    return False
         return False
 
 
 class Rook(ChessPiece):
     """An extension of the ChessPiece class. Represents the rook piece type for the ChessVar class"""
-    def __init__(self, color, current_pos):
-        super().__init__(color, current_pos)
-        self._is_king = False
-        self._access_set = set()
+    __slots__ = ()
+    _is_king = False
 
     def token(self):
         """Creates the visual for the rook piece type on the printed chess board"""
@@ -225,95 +853,67 @@ class Rook(ChessPiece):
         """Returns the current value of the self._is_king variable"""
         return self._is_king
 
-    def get_access_set(self):
-        """Returns the current value of the self._access_set variable"""
-        return self._access_set
-
     def piece_access(self, temp_pos, board, moving_pc_current_pos=None):
         """Checks where on the board a piece has access to based on its movement and position of other pieces
-               on the board. Stores valid positions in the self._access_set"""
-        row_tup = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
-        current_row = temp_pos[1]
-        current_col = row_tup.index(temp_pos[0])
-        temp_access_set = set()
+               on the board. Stores valid positions in the self._access_bits"""
+        spot_bits = self._geometry.spot_bits
+        right, left, up, down = self._geometry.rook_rays[temp_pos]
+        temp_access_bits = 0
 
         # Check rest of row this piece is in
-        # Right
-        for pos in range(current_col + 1, len(row_tup)):
-            spot = row_tup[pos] + temp_pos[1]
-            pc_at_spot = board.get_piece(spot)
-            if pc_at_spot == '___':
-                temp_access_set.add(spot)
-            if pc_at_spot != '___':
-                if spot == moving_pc_current_pos:
+        for ray in (right, left):
+            for spot in ray:
+                pc_at_spot = board.get_piece(spot)
+                if pc_at_spot == '___':
+                    temp_access_bits |= spot_bits[spot]
+                elif spot == moving_pc_current_pos:
                     continue
-                if pc_at_spot.get_color() != self._color:
+                elif pc_at_spot.get_color() != self._color:
                     if pc_at_spot.is_king():
                         return False
                     else:
-                        temp_access_set.add(spot)
-                        break
-                else:
-                    break
-        # Left
-        for pos_1 in range(current_col - 1, -1, -1):
-            spot_1 = row_tup[pos_1] + temp_pos[1]
-            pc_at_spot_1 = board.get_piece(spot_1)
-            if pc_at_spot_1 == '___':
-                temp_access_set.add(spot_1)
-            if pc_at_spot_1 != '___':
-                if spot_1 == moving_pc_current_pos:
-                    continue
-                if pc_at_spot_1.get_color() != self._color:
-                    if pc_at_spot_1.is_king():
-                        return False
-                    else:
-                        temp_access_set.add(spot_1)
+                        temp_access_bits |= spot_bits[spot]
                         break
                 else:
                     break
 
         # Check rest of column this piece is in
         # Up
-        for pos_2 in range(int(current_row) + 1, 9):
-            spot_2 = temp_pos[0] + str(pos_2)
-            pc_at_spot_2 = board.get_piece(spot_2)
-            if pc_at_spot_2 == '___':
-                temp_access_set.add(spot_2)
-            if pc_at_spot_2 != '___':
-                if spot_2 == moving_pc_current_pos:
-                    continue
-                if pc_at_spot_2.get_color() != self._color:
-                    temp_access_set.add(spot_2)
-                    if pc_at_spot_2.is_king():
-                        return False
+        for spot in up:
+            pc_at_spot = board.get_piece(spot)
+            if pc_at_spot == '___':
+                temp_access_bits |= spot_bits[spot]
+            elif spot == moving_pc_current_pos:
+                continue
+            elif pc_at_spot.get_color() != self._color:
+                temp_access_bits |= spot_bits[spot]
+                if pc_at_spot.is_king():
+                    return False
+            else:
+                break
+        # Down
+        for spot in down:
+            pc_at_spot = board.get_piece(spot)
+            if pc_at_spot == '___':
+                temp_access_bits |= spot_bits[spot]
+            elif spot == moving_pc_current_pos:
+                continue
+            elif pc_at_spot.get_color() != self._color:
+                temp_access_bits |= spot_bits[spot]
+                if pc_at_spot.is_king():
+                    return False
                 else:
                     break
-        # Down
-        for pos_3 in range(int(current_row) - 1, 0, -1):
-            spot_3 = temp_pos[0] + str(pos_3)
-            pc_at_spot_3 = board.get_piece(spot_3)
-            if pc_at_spot_3 == '___':
-                temp_access_set.add(spot_3)
-
-            elif pc_at_spot_3 != '___':
-                if spot_3 == moving_pc_current_pos:
-                    continue
-                if pc_at_spot_3.get_color() != self._color:
-                    temp_access_set.add(spot_3)
-                    if pc_at_spot_3.is_king():
-                        return False
-                    else:
-                        break
-        self._access_set = temp_access_set
+        self._access_bits = temp_access_bits
         return True
 
     def valid_movement(self, new_pos, board):
         """Checks if moving the rook piece on the board from its current position
                to the inputted new_pos on the board is a valid move"""
         if self.piece_access(self._current_pos, board):
-            if new_pos in self._access_set:
-                if self.piece_access(new_pos, board):
+            new_bit = self._geometry.spot_bits.get(new_pos, 0)
+            if self._access_bits & new_bit:
+                if not board.get_check_spots(self._color, Rook) & new_bit:
                     if board.all_pc_access(self._current_pos):
                         return True
                     else:
@@ -323,11 +923,12 @@ class Rook(ChessPiece):
 
 class Bishop(ChessPiece):
     """An extension of the ChessPiece class. Represents the bishop piece type for the ChessVar class"""
-    def __init__(self, color, current_pos, num):
-        super().__init__(color, current_pos)
+    __slots__ = ('_num',)
+    _is_king = False
+
+    def __init__(self, color, current_pos, num, geometry=None):
+        super().__init__(color, current_pos, geometry)
         self._num = num
-        self._is_king = False
-        self._access_set = set()
 
     def token(self):
         """Creates the visual for the bishop piece type on the printed chess board"""
@@ -337,69 +938,37 @@ class Bishop(ChessPiece):
         """Returns the current value of the self._is_king variable"""
         return self._is_king
 
-    def get_access_set(self):
-        """Returns the current value of the self._access_set variable"""
-        return self._access_set
-
     def piece_access(self, temp_pos, board, moving_pc_current_pos=None):
         """Checks where on the board a piece has access to based on its movement and position of other pieces
-            on the board. Stores valid positions in the self._access_set"""
-        row_tup = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
-        col_tup = (1, 2, 3, 4, 5, 6, 7, 8)
-        current_row = int(temp_pos[1])
-        current_col = row_tup.index(temp_pos[0])
-        temp_access_set = set()
-
-        up_right_list = []
-        down_right_list = []
-        up_left_list = []
-        down_left_list = []
-        diagonals_list = [up_right_list, up_left_list, down_right_list, down_left_list]
-
-        for new_diagonal in range(1, 8):
-            up = current_row + new_diagonal
-            down = current_row - new_diagonal
-            left = current_col - new_diagonal
-            right = current_col + new_diagonal
-
-            if 0 <= right <= 7 and up in col_tup:
-                up_right = str(row_tup[right]) + str(up)
-                up_right_list.append(up_right)
-            if 0 <= right <= 7 and down in col_tup:
-                down_right = str(row_tup[right]) + str(down)
-                down_right_list.append(down_right)
-            if 0 <= left <= 7 and up in col_tup:
-                up_left = str(row_tup[left]) + str(up)
-                up_left_list.append(up_left)
-            if 0 <= left <= 7 and down in col_tup:
-                down_left = str(row_tup[left]) + str(down)
-                down_left_list.append(down_left)
-
-        for diagonal in diagonals_list:
+            on the board. Stores valid positions in the self._access_bits"""
+        spot_bits = self._geometry.spot_bits
+        temp_access_bits = 0
+
+        for diagonal in self._geometry.bishop_rays[temp_pos]:
             for spot in diagonal:
                 pc_at_spot = board.get_piece(spot)
                 if pc_at_spot == '___':
-                    temp_access_set.add(spot)
-                elif pc_at_spot != '___':
-                    if spot == moving_pc_current_pos:
-                        temp_access_set.add(spot)
-                        continue
-                    if pc_at_spot.get_color() == self._color:
-                        break
-                    elif pc_at_spot.is_king():
-                        return False
-                    else:
-                        temp_access_set.add(spot)
-                        break
-        self._access_set = temp_access_set
+                    temp_access_bits |= spot_bits[spot]
+                elif spot == moving_pc_current_pos:
+                    temp_access_bits |= spot_bits[spot]
+                    continue
+                elif pc_at_spot.get_color() == self._color:
+                    break
+                elif pc_at_spot.is_king():
+                    return False
+                else:
+                    temp_access_bits |= spot_bits[spot]
+                    break
+        self._access_bits = temp_access_bits
         return True
 
     def valid_movement(self, new_pos, board):
         """Checks if moving the bishop piece on the board from its current position
             to the inputted new_pos on the board is a valid move"""
         if self.piece_access(self._current_pos, board):
-            if new_pos in self._access_set:
-                if self.piece_access(new_pos, board):
+            new_bit = self._geometry.spot_bits.get(new_pos, 0)
+            if self._access_bits & new_bit:
+                if not board.get_check_spots(self._color, Bishop) & new_bit:
                     if board.all_pc_access(self._current_pos):
                         return True
                     else:
@@ -409,70 +978,50 @@ class Bishop(ChessPiece):
 
 class Knight(ChessPiece):
     """An extension of the ChessPiece class. Represents the knight piece type for the ChessVar class"""
-    def __init__(self, color, current_pos, num):
-        super().__init__(color, current_pos)
+    __slots__ = ('_num',)
+    _is_king = False
+
+    def __init__(self, color, current_pos, num, geometry=None):
+        super().__init__(color, current_pos, geometry)
         self._num = num
-        self._is_king = False
-        self._access_set = set()
 
     def token(self):
         """Creates the visual for the knight piece type on the printed chess board"""
         return str(self._color) + 'k' + self._num
 
-    def get_access_set(self):
-        """Returns the current value of the self._access_set variable"""
-        return self._access_set
-
     def is_king(self):
         """Returns the current value of the self._is_king variable"""
         return self._is_king
 
     def piece_access(self, temp_pos, board, moving_pc_current_pos=None):
         """Checks where on the board a piece has access to based on its movement and position of other pieces
-            on the board. Stores valid positions in the self._access_set"""
-        row_tup = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
-        current_col = row_tup.index(temp_pos[0])
-        current_row = int(temp_pos[1])
-        temp_access_set = set()
-        temp_access_list = []
-
-        for col in range(current_col - 2, current_col + 3):
-            if col < 0 or col == current_col or col > 7:
-                continue
-            elif col == current_col - 2 or col == current_col + 2:
-                if current_row - 1 > 0:
-                    temp_access_list.append(str(row_tup[col]) + str(current_row - 1))
-                if current_row + 1 < 9:
-                    temp_access_list.append(str(row_tup[col]) + str(current_row + 1))
-            elif col == current_col - 1 or col == current_col + 1:
-                if current_row - 2 > 0:
-                    temp_access_list.append(str(row_tup[col]) + str(current_row - 2))
-                if current_row + 2 < 9:
-                    temp_access_list.append(str(row_tup[col]) + str(current_row + 2))
-
-        for spot in temp_access_list:
+            on the board. Stores valid positions in the self._access_bits"""
+        spot_bits = self._geometry.spot_bits
+        temp_access_bits = 0
+
+        for spot in self._geometry.knight_spots[temp_pos]:
             if spot == moving_pc_current_pos:
-                temp_access_set.add(spot)
+                temp_access_bits |= spot_bits[spot]
                 continue
             pc_at_spot = board.get_piece(spot)
             if pc_at_spot == '___':
-                temp_access_set.add(spot)
+                temp_access_bits |= spot_bits[spot]
             elif pc_at_spot.get_color() == self._color:
                 continue
             elif pc_at_spot.is_king():
                 return False
             else:
-                temp_access_set.add(spot)
-                continue
-        self._access_set = temp_access_set
+                temp_access_bits |= spot_bits[spot]
+        self._access_bits = temp_access_bits
         return True
 
     def valid_movement(self, new_pos, board):
         """Checks if moving the knight piece type on the board from its current position
             to the inputted new_pos on the board is a valid move"""
         if self.piece_access(self._current_pos, board):
-            if new_pos in self._access_set:
-                if self.piece_access(new_pos, board):
+            new_bit = self._geometry.spot_bits.get(new_pos, 0)
+            if self._access_bits & new_bit:
+                if not board.get_check_spots(self._color, Knight) & new_bit:
                     if board.all_pc_access(self._current_pos):
                         return True
                     else:
@@ -480,52 +1029,369 @@ class Knight(ChessPiece):
                 return False
 
 
+def _build_zobrist_keys(seed, size=64):
+    """Builds the random 64-bit numbers used for Zobrist hashing: one per piece type, color and spot, plus one for
+    black to move and one for white having used up its last move. A fixed seed keeps keys the same between runs"""
+    rng = random.Random(seed)
+    piece_keys = {}
+    for color in ('w', 'b'):
+        for piece_type in (King, Rook, Bishop, Knight):
+            piece_keys[(color, piece_type)] = [rng.getrandbits(64) for _ in range(size)]
+    return piece_keys, rng.getrandbits(64), rng.getrandbits(64)
+
+
+ZOBRIST_PIECES, ZOBRIST_BLACK_TO_MOVE, ZOBRIST_LAST_MOVE_USED = _build_zobrist_keys(20230817)
+
+# Letters used for each piece type in FEN-style position text. White pieces are written in upper case
+FEN_LETTERS = {King: 'k', Rook: 'r', Bishop: 'b', Knight: 'n'}
+FEN_TYPES = {letter: piece_type for piece_type, letter in FEN_LETTERS.items()}
+# Number of bytes in the packed binary form of a position of the standard game made by ChessVar.to_bytes
+POSITION_BYTES = 10
+
+
+def _parse_placement(placement, geometry):
+    """Returns the (letter, spot) of every piece written in the piece placement part of a FEN-style description of
+    a board of the inputted Geometry, in the order they are written: rows from the top down split by '/', each from
+    column a, with runs of empty spots as numbers. Raises ValueError if the text does not fit the board"""
+    rows = placement.split('/')
+    if len(rows) != geometry.height:
+        raise ValueError('a placement needs ' + str(geometry.height) + ' rows: ' + placement)
+    placed = []
+    for row_number, text in zip(range(geometry.height, 0, -1), rows):
+        col = 0
+        run = ''
+        for char in text + '/':
+            if char.isdigit():
+                run += char
+                continue
+            if run:
+                col += int(run)
+                run = ''
+            if char == '/':
+                break
+            if char.lower() not in FEN_TYPES:
+                raise ValueError('unknown piece letter ' + char + ': ' + placement)
+            if col >= geometry.width:
+                raise ValueError('too many spots in row ' + str(row_number) + ': ' + placement)
+            placed.append((char, geometry.columns[col] + str(row_number)))
+            col += 1
+        if col != geometry.width:
+            raise ValueError('row ' + str(row_number) + ' does not have ' + str(geometry.width) + ' spots: '
+                             + placement)
+    return placed
+
+
+def default_setup(width=8, height=8):
+    """Returns the starting placement of the standard game stretched to a width by height board: the pieces of each
+    color in the bottom two rows of their own side with the empty columns between them. Boards narrower than 6
+    columns or lower than 2 rows have no default setup"""
+    if width < 6 or height < 2:
+        raise ValueError('a ' + str(width) + 'x' + str(height) + ' board needs a setup to be entered')
+    gap = str(width - 6) if width > 6 else ''
+    return '/'.join([str(width)] * (height - 2) + ['RBN' + gap + 'nbr', 'KBN' + gap + 'nbk'])
+
+
+class Variant:
+    """The rules that can be changed between games: the width and height of the board, the starting placement of the
+    pieces written as the placement part of a FEN-style description (any number of rooks, bishops and knights, and
+    one king of each color), and the goal row the kings race to, which is the top row unless another is entered.
+    Every board takes a Variant; the default is the standard 8 by 8 game"""
+    def __init__(self, width=8, height=8, setup=None, goal_row=None, cache_dir=None):
+        self._geometry = get_geometry(width, height, cache_dir)
+        self._setup = default_setup(width, height) if setup is None else setup
+        self._goal_row = height if goal_row is None else goal_row
+        if not 1 <= self._goal_row <= height:
+            raise ValueError('the goal row must be from 1 to ' + str(height))
+        placed = _parse_placement(self._setup, self._geometry)
+        # each color's piece list holds its rooks, king, bishops and knights in that order, each type in the order
+        # it is written, which gives the piece lists of the standard game
+        self._placement = {'w': [], 'b': []}
+        for piece_type in (Rook, King, Bishop, Knight):
+            for char, spot in placed:
+                if FEN_TYPES[char.lower()] is piece_type:
+                    self._placement['w' if char.isupper() else 'b'].append((piece_type, spot))
+        for color in ('w', 'b'):
+            if [piece_type for piece_type, spot in self._placement[color]].count(King) != 1:
+                raise ValueError('a setup needs one king of each color: ' + self._setup)
+        white_king = [piece_type for piece_type, spot in self._placement['w']].index(King)
+        black_king = [piece_type for piece_type, spot in self._placement['b']].index(King)
+        self._king_numbers = (white_king, len(self._placement['w']) + black_king)
+
+    def __repr__(self):
+        return 'Variant' + repr(self.get_key())
+
+    def __eq__(self, other):
+        return isinstance(other, Variant) and self.get_key() == other.get_key()
+
+    def __hash__(self):
+        return hash(self.get_key())
+
+    def get_geometry(self):
+        """Returns the Geometry of the board"""
+        return self._geometry
+
+    def get_setup(self):
+        """Returns the starting placement"""
+        return self._setup
+
+    def get_goal_row(self):
+        """Returns the row the kings race to"""
+        return self._goal_row
+
+    def get_king_numbers(self):
+        """Returns the positions of the white and black kings in the white and then black piece lists"""
+        return self._king_numbers
+
+    def get_key(self):
+        """Returns a (width, height, setup, goal row) tuple that is equal for equal variants"""
+        return self._geometry.width, self._geometry.height, self._setup, self._goal_row
+
+    def is_default(self):
+        """Returns True if the variant is the standard 8 by 8 game"""
+        return self.get_key() == (8, 8, DEFAULT_SETUP, 8)
+
+    def new_pieces(self):
+        """Returns new (white pieces, black pieces) lists in their starting spots. Bishops and knights are numbered
+        in the order they are written, from 1"""
+        lists = []
+        for color in ('w', 'b'):
+            pieces = []
+            numbers = {Bishop: 0, Knight: 0}
+            for piece_type, spot in self._placement[color]:
+                if piece_type in numbers:
+                    numbers[piece_type] += 1
+                    pieces.append(piece_type(color, spot, sys.intern(str(numbers[piece_type])), self._geometry))
+                else:
+                    pieces.append(piece_type(color, spot, self._geometry))
+            lists.append(pieces)
+        return lists[0], lists[1]
+
+
+DEFAULT_SETUP = default_setup()
+DEFAULT_VARIANT = Variant()
+
+
+class Position(tuple):
+    """An immutable snapshot of a game: the spots of the pieces in the order of the white and then black piece lists
+    ('0' for a captured piece), whose turn it is, the value of ChessVar's self._last_move, the game state and the
+    Variant. It is a tuple, so it can be hashed, compared, pickled and shared between threads without copying, and
+    its first four items are the get_position tuple set_position takes. See rules.py for working with positions
+    without a game"""
+    __slots__ = ()
+
+    def __new__(cls, spots, to_move, last_move, game_state, variant=None):
+        return tuple.__new__(cls, (tuple(spots), to_move, last_move, game_state,
+                                   DEFAULT_VARIANT if variant is None else variant))
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    def __repr__(self):
+        return 'Position' + tuple.__repr__(self)
+
+    def get_spots(self):
+        """Returns the tuple of piece spots"""
+        return self[0]
+
+    def get_to_move(self):
+        """Returns 'w' or 'b' for the player whose turn it is"""
+        return self[1]
+
+    def get_last_move(self):
+        """Returns False if white's king has reached the goal row and black is using its last move, or else True"""
+        return self[2]
+
+    def get_game_state(self):
+        """Returns the game state"""
+        return self[3]
+
+    def get_variant(self):
+        """Returns the Variant the position is played in"""
+        return self[4]
+
+
+def starting_pieces():
+    """Returns new (white pieces, black pieces) lists in their starting spots. Each list holds the rook, king, two
+    bishops and two knights in that order, the piece list order every board uses"""
+    return DEFAULT_VARIANT.new_pieces()
+
+
+_zobrist_tables = {DEFAULT_GEOMETRY: ZOBRIST_PIECES}
+
+
+def get_zobrist_keys(geometry):
+    """Returns the Zobrist keys of the pieces on a board of the inputted Geometry, as a dictionary from (color, piece
+    class) to a list of one key per spot. The standard board uses ZOBRIST_PIECES; other sizes get their own fixed
+    keys. The black to move and last move keys are shared by every size"""
+    piece_keys = _zobrist_tables.get(geometry)
+    if piece_keys is None:
+        seed = '20230817-' + str(geometry.width) + 'x' + str(geometry.height)
+        piece_keys = _build_zobrist_keys(seed, geometry.size)[0]
+        _zobrist_tables[geometry] = piece_keys
+    return piece_keys
+
+
+# Small integer piece codes used by CompactBoard. A spot holds the piece's type code, plus BLACK_CODE for a black
+# piece, plus 16 times the piece's number in the white and then black piece lists, so an empty spot is 0
+TYPE_CODES = {King: 1, Rook: 2, Bishop: 3, Knight: 4}
+KING_CODE, ROOK_CODE, BISHOP_CODE, KNIGHT_CODE = 1, 2, 3, 4
+BLACK_CODE = 8
+# Spot number CompactBoard stores for a captured piece of the standard game. Other sizes use their number of spots
+CAPTURED = 64
+
+
+def _build_list_codes(pieces=None):
+    """Returns the code of each piece of a list of pieces, or of the 12 pieces of the standard game if none is
+    entered, in piece list order"""
+    if pieces is None:
+        white, black = starting_pieces()
+        pieces = white + black
+    return tuple(number << 4 | TYPE_CODES[type(piece)] | (BLACK_CODE if piece.get_color() == 'b' else 0)
+                 for number, piece in enumerate(pieces))
+
+
+def _build_zobrist_codes(piece_keys=None):
+    """Returns the Zobrist keys of ZOBRIST_PIECES, or of the entered keys, indexed by the type and color part of a
+    piece code"""
+    keys = [None] * 16
+    for (color, piece_type), type_keys in (ZOBRIST_PIECES if piece_keys is None else piece_keys).items():
+        keys[TYPE_CODES[piece_type] | (BLACK_CODE if color == 'b' else 0)] = type_keys
+    return keys
+
+
+_zobrist_code_tables = {}
+
+
+def _get_zobrist_codes(geometry):
+    """Returns the Zobrist keys of get_zobrist_keys(geometry) indexed by the type and color part of a piece code"""
+    codes = _zobrist_code_tables.get(geometry)
+    if codes is None:
+        codes = _build_zobrist_codes(get_zobrist_keys(geometry))
+        _zobrist_code_tables[geometry] = codes
+    return codes
+
+
+LIST_CODES = _build_list_codes()
+CODE_TYPES = {code: piece_type for piece_type, code in TYPE_CODES.items()}
+ZOBRIST_CODES = _build_zobrist_codes()
+# The square tables of the piece_access methods with spot numbers in place of names
+ROOK_RAY_INDEXES = DEFAULT_GEOMETRY.rook_ray_indexes
+BISHOP_RAY_INDEXES = DEFAULT_GEOMETRY.bishop_ray_indexes
+KING_AREA_INDEXES = DEFAULT_GEOMETRY.king_area_indexes
+KNIGHT_INDEXES = DEFAULT_GEOMETRY.knight_indexes
+
+
 class Board:
     """A class to represent a chess board to be used in the Class ChessVar"""
-    def __init__(self):
-        """Initializes chess piece objects on the chess board in the correct starting positions. Board is represented
-        as an array of arrays so each position can be clearly indexed"""
-        # WHITE PIECES
-        self._wr = Rook('w', 'a2')
-        self._wki = King('w', 'a1')
-        self._wb1 = Bishop('w', 'b2', '1')
-        self._wb2 = Bishop('w', 'b1', '2')
-        self._wk1 = Knight('w', 'c2', '1')
-        self._wk2 = Knight('w', 'c1', '2')
-        # BLACK PIECES
-        self._br = Rook('b', 'h2')
-        self._bki = King('b', 'h1')
-        self._bb1 = Bishop('b', 'g2', '1')
-        self._bb2 = Bishop('b', 'g1', '2')
-        self._bk1 = Knight('b', 'f2', '1')
-        self._bk2 = Knight('b', 'f1', '2')
-
-        self._white_pcs = [self._wr, self._wki, self._wb1, self._wb2, self._wk1, self._wk2]
-        self._black_pcs = [self._br, self._bki, self._bb1, self._bb2, self._bk1, self._bk2]
+    def __init__(self, variant=None):
+        """Initializes chess piece objects on the chess board in the starting positions of the inputted Variant, or
+        of the standard game if none is entered. Board is represented as an array of arrays so each position can be
+        clearly indexed"""
+        self._set_variant(variant)
+        self._board_state = [[sys.intern(str(row))] + ['___'] * self._geometry.width
+                             for row in range(self._height, 0, -1)]
+        self._board_state.append([''] + list(self._geometry.columns))
+
+        self._col_dict = {col: number for number, col in enumerate(self._geometry.columns, 1)}
+
+        self._zobrist_key = 0
+        for pc_list in self._all_pcs:
+            for piece in pc_list:
+                pos = piece.get_current_pos()
+                self._board_state[self._height - int(pos[1:])][self._col_dict[pos[0]]] = piece
+                self._zobrist_key ^= self._zobrist_pieces[(piece.get_color(), type(piece))][
+                    self._geometry.square_index[pos]]
+        self._pins = None
+
+    def _set_variant(self, variant):
+        """Makes the pieces of the inputted Variant, or of the standard game if it is None, and stores what every
+        board needs to know about it"""
+        if variant is None:
+            variant = DEFAULT_VARIANT
+        self._variant = variant
+        self._geometry = variant.get_geometry()
+        self._height = self._geometry.height
+        self._goal_row = variant.get_goal_row()
+        self._zobrist_pieces = get_zobrist_keys(self._geometry)
+        self._white_pcs, self._black_pcs = variant.new_pieces()
         self._all_pcs = [self._white_pcs, self._black_pcs]
-
-        self._board_state = [
-            ['8', '___', '___', '___', '___', '___', '___', '___', '___'],
-            ['7', '___', '___', '___', '___', '___', '___', '___', '___'],
-            ['6', '___', '___', '___', '___', '___', '___', '___', '___'],
-            ['5', '___', '___', '___', '___', '___', '___', '___', '___'],
-            ['4', '___', '___', '___', '___', '___', '___', '___', '___'],
-            ['3', '___', '___', '___', '___', '___', '___', '___', '___'],
-            ['2', self._wr, self._wb1, self._wk1, '___', '___', self._bk1, self._bb1, self._br],
-            ['1', self._wki, self._wb2, self._wk2, '___', '___', self._bk2, self._bb2, self._bki],
-            ['', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-        ]
-
-        self._col_dict = {
-            'a': 1,
-            'b': 2,
-            'c': 3,
-            'd': 4,
-            'e': 5,
-            'f': 6,
-            'g': 7,
-            'h': 8
-        }
+        self._king_numbers = variant.get_king_numbers()
+        self._wki = self._white_pcs[self._king_numbers[0]]
+        self._bki = self._black_pcs[self._king_numbers[1] - len(self._white_pcs)]
+
+    def get_variant(self):
+        """Returns the Variant the board was set up for"""
+        return self._variant
+
+    def get_geometry(self):
+        """Returns the Geometry of the board"""
+        return self._geometry
+
+    def get_goal_row(self):
+        """Returns the row the kings race to"""
+        return self._goal_row
+
+    def get_king_numbers(self):
+        """Returns the positions of the white and black kings in the white and then black piece lists"""
+        return self._king_numbers
+
+    def get_fen_placement(self):
+        """Returns the piece placement part of a FEN-style description of the board: rows from the top down split by
+        '/', white pieces as K R B N, black pieces as k r b n and runs of empty spots as numbers"""
+        rows = []
+        for row in range(self._height, 0, -1):
+            text = ''
+            empty = 0
+            for col in self._geometry.columns:
+                piece = self.get_piece(col + str(row))
+                if piece == '___':
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                letter = FEN_LETTERS[type(piece)]
+                text += letter.upper() if piece.get_color() == 'w' else letter
+            if empty:
+                text += str(empty)
+            rows.append(text)
+        return '/'.join(rows)
+
+    def fen_to_spots(self, placement):
+        """Returns the spots tuple for place_pieces that matches the piece placement part of a FEN-style description.
+        Pieces of the same type are given out in the order they are written, so bishops and knights keep their
+        numbers for the starting layout. Pieces that are not written are captured. Raises ValueError if the text is
+        not a valid placement for this board's pieces"""
+        pieces = self._white_pcs + self._black_pcs
+        spots = ['0'] * len(pieces)
+        for char, spot in _parse_placement(placement, self._geometry):
+            color = 'w' if char.isupper() else 'b'
+            for number, piece in enumerate(pieces):
+                if spots[number] == '0' and piece.get_color() == color and FEN_LETTERS[type(piece)] == char.lower():
+                    spots[number] = spot
+                    break
+            else:
+                raise ValueError('no piece left to place for ' + char + ': ' + placement)
+        if spots[self._king_numbers[0]] == '0' or spots[self._king_numbers[1]] == '0':
+            raise ValueError('both kings must be on the board: ' + placement)
+        return tuple(spots)
+
+    def place_pieces(self, spots):
+        """Moves every piece to a new spot. spots holds one spot per piece in the order of the white and then black
+        piece lists, with '0' for a piece that has been captured"""
+        pieces = self._white_pcs + self._black_pcs
+        for piece in pieces:
+            if piece.get_current_pos() != '0':
+                self.update_board(piece.get_current_pos(), '___')
+        for piece, spot in zip(pieces, spots):
+            piece.update_pos(spot)
+            if spot != '0':
+                self.update_board(spot, piece)
+
+    def get_zobrist_key(self):
+        """Returns the Zobrist hash of where the pieces are on the board. It is updated by update_board, so it never
+        has to be worked out from the whole board again"""
+        return self._zobrist_key
 
     def get_board_state(self):
         """Returns the current value of the self._board_state """
@@ -533,11 +1399,11 @@ class Board:
 
     def get_white_king_row(self):
         """Returns the row that the white king is currently located at on the board"""
-        return int(self._wki.get_current_pos()[1])
+        return int(self._wki.get_current_pos()[1:])
 
     def get_black_king_row(self):
         """Returns the row that the black king is currently located at on the board"""
-        return int(self._bki.get_current_pos()[1])
+        return int(self._bki.get_current_pos()[1:])
 
     def get_white_pcs(self):
         """Returns self._white_pcs, which is an array that holds all the white piece objects"""
@@ -554,48 +1420,937 @@ class Board:
     def get_piece(self, pos):
         """Returns the chess piece currently located at the inputted position on the board"""
         col = self._col_dict[pos[0]]
-        row = 8 - int(pos[1])
+        row = self._height - int(pos[1:])
         return self._board_state[row][col]
 
     def update_board(self, pos, update):
         """Updates the board based on new positions of chess pieces during gameplay"""
         col = self._col_dict[pos[0]]
-        row = 8 - int(pos[1])
+        row = self._height - int(pos[1:])
+        old = self._board_state[row][col]
+        if old != '___':
+            self._zobrist_key ^= self._zobrist_pieces[(old.get_color(), type(old))][self._geometry.square_index[pos]]
+        if update != '___':
+            self._zobrist_key ^= self._zobrist_pieces[(update.get_color(), type(update))][
+                self._geometry.square_index[pos]]
         self._board_state[row][col] = update
+        self._pins = None
+
+    def update_spots(self, updates):
+        """Does update_board for every (pos, update) pair of updates in order. A move changes two spots, and a board
+        that keeps what it works out from the whole position can then work it out once for both"""
+        for pos, update in updates:
+            self.update_board(pos, update)
+
+    def generate_legal_moves(self, color):
+        """Returns a list of every legal (move_from, move_to) pair for the pieces of the inputted color, in the
+        order of that color's piece list and then spot order. Gives the same moves as trying every pair through
+        valid_movement, but each piece's all_pc_access result is found once and shared by all its moves"""
+        if color == 'w':
+            pc_list = self._white_pcs
+        else:
+            pc_list = self._black_pcs
+        geometry = self._geometry
+        moves = []
+        for piece in pc_list:
+            move_from = piece.get_current_pos()
+            if move_from == '0':
+                continue
+            if piece.is_king():
+                candidates = [spot for spot in geometry.king_area[move_from] if spot != move_from]
+            elif piece.piece_access(move_from, self):
+                candidates = geometry.spot_names(piece.get_access_bits())
+            else:
+                continue
+            checks = self.get_check_spots(color, type(piece))
+            all_access = None
+            for move_to in candidates:
+                pc_at_new_spot = self.get_piece(move_to)
+                if pc_at_new_spot != '___' and pc_at_new_spot.get_color() == color:
+                    continue
+                if checks & geometry.spot_bits[move_to]:
+                    continue
+                if all_access is None:
+                    all_access = self.all_pc_access(move_from)
+                if not all_access:
+                    break
+                if piece.is_king() and self.king_spot_attacked(move_to, color, move_from):
+                    continue
+                moves.append((move_from, move_to))
+        return moves
+
+    def generate_candidate_moves(self, color):
+        """Returns (captures, others): two lists of the (move_from, move_to) pairs the pieces of the inputted color
+        could make by their movement rules alone, each in the order of generate_legal_moves. The king safety tests
+        of is_king_safe are left out, so the lists can hold moves that are not legal; the legal moves are exactly
+        the ones that pass them"""
+        if color == 'w':
+            pc_list = self._white_pcs
+        else:
+            pc_list = self._black_pcs
+        geometry = self._geometry
+        captures = []
+        others = []
+        for piece in pc_list:
+            move_from = piece.get_current_pos()
+            if move_from == '0':
+                continue
+            if piece.is_king():
+                candidates = [spot for spot in geometry.king_area[move_from] if spot != move_from]
+            elif piece.piece_access(move_from, self):
+                candidates = geometry.spot_names(piece.get_access_bits())
+            else:
+                continue
+            for move_to in candidates:
+                pc_at_new_spot = self.get_piece(move_to)
+                if pc_at_new_spot == '___':
+                    others.append((move_from, move_to))
+                elif pc_at_new_spot.get_color() != color:
+                    captures.append((move_from, move_to))
+        return captures, others
+
+    def is_king_safe(self, move_from, move_to, color):
+        """Returns True if a move from generate_candidate_moves for the inputted color passes the king safety tests
+        of valid_movement: it does not move onto a check spot, all_pc_access allows the piece to move, and a king
+        does not step onto a spot the other color would reach"""
+        piece = self.get_piece(move_from)
+        if self.get_check_spots(color, type(piece)) & self._geometry.spot_bits[move_to]:
+            return False
+        if not self.all_pc_access(move_from):
+            return False
+        return not (piece.is_king() and self.king_spot_attacked(move_to, color, move_from))
+
+    def render_board(self):
+        """Returns the visual representation of the board that print_board prints, as a string"""
+        board_state = self.get_board_state()
+        lines = []
+        for row in range(0, len(board_state) - 1):
+            cells = [board_state[row][0]]
+            for col in board_state[row][1:]:
+                cells.append(col if col == '___' else col.token())
+            lines.append(' '.join(cells) + '\n')
+        lines.append(''.join(letter + '   ' for letter in board_state[-1]) + '\n\n')
+        lines.append('------------------------------------------------------\n\n')
+        return ''.join(lines)
 
     def print_board(self):
         """Prints a visual representation of the current state of the board during gameplay. Only for visualization
         purposes"""
-        for row in range(0, len(self._board_state) - 1):
-            for index, col in enumerate(self._board_state[row]):
-                if index == 8:
-                    if col == '___':
-                        print(col)
-                    else:
-                        print(col.token())
-                elif index == 0 or col == '___':
-                    print(col, end=' ')
+        print(self.render_board(), end='')
+
+    def king_spot_attacked(self, pos, color, king_pos):
+        """Checks if any piece of the color opposite to the inputted color would have access to pos once the king
+        at king_pos has left its spot. Returns True if the spot is attacked"""
+        if color == 'w':
+            pc_sets = self._black_pcs
+        else:
+            pc_sets = self._white_pcs
+        for pc in pc_sets:
+            pc_pos = pc.get_current_pos()
+            if pc_pos == '0':
+                continue
+            # the king's current spot is passed as the moving spot so each access set is found as
+            # if the king has already left it
+            pc.piece_access(pc_pos, self, king_pos)
+            if pc.get_access_bits() & self._geometry.spot_bits[pos]:
+                return True
+        return False
+
+    def get_king_danger(self, color):
+        """Returns the bitboard of the empty spots the king of the inputted color could not move onto because a piece
+        of the other color would have access to them once the king has left its spot"""
+        if color == 'w':
+            king_pos, pc_sets = self._wki.get_current_pos(), self._black_pcs
+        else:
+            king_pos, pc_sets = self._bki.get_current_pos(), self._white_pcs
+        danger = 0
+        for pc in pc_sets:
+            pc_pos = pc.get_current_pos()
+            if pc_pos == '0':
+                continue
+            pc.piece_access(pc_pos, self, king_pos)
+            for spot in self._geometry.spot_names(pc.get_access_bits()):
+                if self.get_piece(spot) == '___':
+                    danger |= self._geometry.spot_bits[spot]
+        return danger
+
+    def _find_pins(self):
+        """Works out what the check tests need to know about the current position in one pass over the pieces.
+        Returns (checked, pinned, check_spots, occupied, kings): the bitboard of the kings a piece of the other
+        color reaches now, a dictionary from spot number to the bitboard of the kings a piece would reach if it
+        could see through that spot (it is the only piece in the way, so whatever stands there is pinned), an empty
+        dictionary that get_check_spots fills in when asked, and the occupied bitboard and king spot number of each
+        color. Rays are blocked the same way as in the piece_access methods: up a column a rook only stops at its
+        own color, down a column only at the other color"""
+        geometry = self._geometry
+        square_index = geometry.square_index
+        occupied = {'w': 0, 'b': 0}
+        placed = {'w': [], 'b': []}
+        kings = {}
+        for pc_list in self._all_pcs:
+            for piece in pc_list:
+                pos = piece.get_current_pos()
+                if pos == '0':
+                    continue
+                index = square_index[pos]
+                occupied[piece.get_color()] |= 1 << index
+                placed[piece.get_color()].append((type(piece), index))
+                if type(piece) is King:
+                    kings[piece.get_color()] = index
+        return self._scan_pins(occupied, placed, kings)
+
+    def _scan_pins(self, occupied, placed, kings):
+        """Does the work of _find_pins from the occupied bitboard, the list of (class, spot number) pairs of the
+        placed pieces and the king spot number of each color"""
+        geometry = self._geometry
+        every = occupied['w'] | occupied['b']
+        checked = 0
+        pinned = {}
+        for color, enemy in (('w', 'b'), ('b', 'w')):
+            king = kings[enemy]
+            king_bit = 1 << king
+            for piece_type, index in placed[color]:
+                if piece_type is Knight:
+                    if geometry.knight_bits[index] & king_bit:
+                        checked |= king_bit
+                    continue
+                if piece_type is King:
+                    if geometry.king_bits[index] & king_bit:
+                        checked |= king_bit
+                    continue
+                if piece_type is Bishop:
+                    if not geometry.bishop_lines[index] & king_bit:
+                        continue
+                    blockers = every
+                elif geometry.up_rays[index] & king_bit:
+                    blockers = occupied[color]
+                elif geometry.down_rays[index] & king_bit:
+                    blockers = occupied[enemy]
+                elif geometry.row_lines[index] & king_bit:
+                    blockers = every
                 else:
-                    print(col.token(), end=' ')
-        for letter in self._board_state[8]:
-            print(letter, end='   ')
-            if letter == 'h':
-                print()
-                print()
-                print('------------------------------------------------------')
-                print()
+                    continue
+                between = geometry.between[index][king] & blockers
+                if not between:
+                    checked |= king_bit
+                elif not between & (between - 1):
+                    spot = between.bit_length() - 1
+                    pinned[spot] = pinned.get(spot, 0) | king_bit
+        return checked, pinned, {}, occupied, kings
+
+    def get_pins(self):
+        """Returns the (checked, pinned, check_spots, occupied, kings) of _find_pins for the current position. They
+        are only worked out again after the board changes"""
+        if self._pins is None:
+            self._pins = self._find_pins()
+        return self._pins
+
+    def restore_pins(self, pins):
+        """Puts back pins returned by get_pins for the position the board is in now, so a caller that has played
+        moves and taken them back does not pay for working them out again"""
+        self._pins = pins
+
+    def get_check_spots(self, color, piece_type):
+        """Returns the bitboard of the spots from which a piece of the inputted color and class would reach the other
+        color's king, with the rest of the board as it is. piece_access returns False from exactly these spots"""
+        pins = self.get_pins()
+        check_spots = pins[2].get((color, piece_type))
+        if check_spots is None:
+            occupied, kings = pins[3], pins[4]
+            enemy = 'b' if color == 'w' else 'w'
+            king = kings[enemy]
+            every = occupied['w'] | occupied['b']
+            rays = self._geometry.rays
+            if piece_type is Rook:
+                # a rook below the king moves up to it and one above moves down, so the spots are found from the king
+                check_spots = (_slide(rays[(0, -1)], king, occupied[color], False)
+                               | _slide(rays[(0, 1)], king, occupied[enemy], True)
+                               | _slide(rays[(1, 0)], king, every, True)
+                               | _slide(rays[(-1, 0)], king, every, False))
+            elif piece_type is Bishop:
+                check_spots = (_slide(rays[(1, 1)], king, every, True) | _slide(rays[(-1, 1)], king, every, True)
+                               | _slide(rays[(1, -1)], king, every, False)
+                               | _slide(rays[(-1, -1)], king, every, False))
+            elif piece_type is Knight:
+                check_spots = self._geometry.knight_bits[king]
+            else:
+                # a king's area holds the spot it moves to as well as the spots around it
+                check_spots = self._geometry.king_bits[king] | 1 << king
+            pins[2][(color, piece_type)] = check_spots
+        return check_spots
 
     def all_pc_access(self, moving_pc_current_pos):
-        """Runs the piece_access method on every piece on the board to check if the movement of a piece would
-        result in either team's king being put in check. Returns True or False based on if a king would be subjected
-        to check or not"""
+        """Checks if the movement of the piece at moving_pc_current_pos would result in either team's king being put
+        in check, as running piece_access on every piece with that spot seen through would. Only the pins and kings
+        already reached of the position are looked at, so each call takes constant time. Returns True or False
+        based on if a king would be subjected to check or not"""
+        checked, pinned = self.get_pins()[:2]
+        index = self._geometry.square_index[moving_pc_current_pos]
+        # a king that is being moved can not be reached on the spot it is leaving
+        return not checked & ~(1 << index) and index not in pinned
+
+
+class BitBoard(Board):
+    """An alternative to the Board class that stores where each piece type of each color is as an integer bitboard
+    (bit 0 is a1 and bit 63 is h8 on the standard board). Gives the same results as Board through ChessVar.make_move,
+    get_piece and all_pc_access, but occupancy, attack and king row checks are bit operations instead of list of
+    lists lookups.
+
+    BitBoard also keeps the reach of every piece: the spots its rays pass over, up to and including the piece that
+    stops each ray. Knight and king reaches only change when the piece moves, so a change at a spot only works out
+    again the reach of the rooks and bishops whose stored reach holds it. From the reaches it keeps how many pieces
+    of each color attack every spot. The counts are stored bit-sliced: plane k of a color is the bitboard of the
+    spots whose count has bit k set, so a changed reach is added to or taken from every spot's count with a few
+    bit operations per plane, and checking if a king is attacked is a single bit test"""
+    def __init__(self, variant=None):
+        """Initializes the same chess piece objects as Board, then stores their positions in bitboards. A flat
+        list of every spot is kept next to the bitboards so get_piece can still return the piece objects"""
+        self._set_variant(variant)
+        self._square_index = self._geometry.square_index
+        self._goal_mask = self._geometry.row_masks[self._goal_row - 1]
+        self._board_state = None
+        self._squares = ['___'] * self._geometry.size
+        self._bitboards = {}
+        self._occupied = {'w': 0, 'b': 0}
+        self._piece_index = {}
+        self._reach = {}
+        # enough planes to count every piece of a color attacking the same spot
+        self._attack_planes = {pc_list[0].get_color(): [0] * len(pc_list).bit_length() for pc_list in self._all_pcs}
+        # only the rays of rooks and bishops can be lengthened or shortened by a change somewhere else
+        self._sliders = [piece for pc_list in self._all_pcs for piece in pc_list if type(piece) in (Rook, Bishop)]
+        # (piece, color, other color, is a bishop) of every slider, for finding pins without method calls
+        self._slider_info = [(piece, piece.get_color(), 'b' if piece.get_color() == 'w' else 'w', type(piece) is Bishop)
+                             for piece in self._sliders]
+        self._zobrist_key = 0
+        self._pins = None
+        for pc_list in self._all_pcs:
+            for piece in pc_list:
+                self._bitboards[(piece.get_color(), type(piece))] = 0
         for pc_list in self._all_pcs:
             for piece in pc_list:
-                pc_pos = piece.get_current_pos()
-                if pc_pos == '0':
+                self.update_board(piece.get_current_pos(), piece)
+
+    def get_board_state(self):
+        """Returns a list of lists in the same layout as Board's self._board_state, built from the bitboards"""
+        width = self._geometry.width
+        board_state = []
+        for row in range(self._height, 0, -1):
+            board_state.append([str(row)] + self._squares[(row - 1) * width:row * width])
+        board_state.append([''] + list(self._geometry.columns))
+        return board_state
+
+    def get_bitboard(self, color, piece_type):
+        """Returns the bitboard of the pieces of the inputted color and piece class (King, Rook, Bishop or Knight)"""
+        return self._bitboards[(color, piece_type)]
+
+    def get_occupied(self, color=None):
+        """Returns the bitboard of the spots holding a piece of the inputted color, or of either color if no color
+        is entered"""
+        if color is None:
+            return self._occupied['w'] | self._occupied['b']
+        return self._occupied[color]
+
+    def get_white_king_row(self):
+        """Returns the row that the white king is currently located at on the board"""
+        return (self._bitboards[('w', King)].bit_length() - 1) // self._geometry.width + 1
+
+    def get_black_king_row(self):
+        """Returns the row that the black king is currently located at on the board"""
+        return (self._bitboards[('b', King)].bit_length() - 1) // self._geometry.width + 1
+
+    def king_on_row_8(self, color):
+        """Returns True if the king of the inputted color is on the goal row, which is row 8 of the standard game"""
+        return self._bitboards[(color, King)] & self._goal_mask != 0
+
+    def get_attack_count(self, pos, color):
+        """Returns the number of pieces of the inputted color that attack the inputted position"""
+        index = self._square_index[pos]
+        return sum((plane >> index & 1) << place for place, plane in enumerate(self._attack_planes[color]))
+
+    def get_attacked(self, color):
+        """Returns the bitboard of every spot attacked by at least one piece of the inputted color"""
+        attacked = 0
+        for plane in self._attack_planes[color]:
+            attacked |= plane
+        return attacked
+
+    def king_in_check(self, color):
+        """Returns True if the king of the inputted color is attacked by a piece of the other color"""
+        enemy = 'b' if color == 'w' else 'w'
+        return self.get_attacked(enemy) & self._bitboards[(color, King)] != 0
+
+    def get_piece(self, pos):
+        """Returns the chess piece currently located at the inputted position on the board"""
+        return self._squares[self._square_index[pos]]
+
+    def update_board(self, pos, update):
+        """Updates the board based on new positions of chess pieces during gameplay. The reaches are updated
+        for the pieces leaving and arriving at pos and for the rooks and bishops with a ray passing over pos"""
+        self.update_spots(((pos, update),))
+
+    def update_spots(self, updates):
+        """Does update_board for every (pos, update) pair of updates in order, then updates the reaches once for
+        them all: of the pieces taken off the board, the pieces put on it and the rooks and bishops with a ray
+        passing over a changed spot. The piece a move carries between the spots keeps its reach until it is worked
+        out on the new spot, so only the spots it gains and loses change the attack counts"""
+        square_index = self._square_index
+        squares = self._squares
+        bitboards = self._bitboards
+        occupied = self._occupied
+        piece_index = self._piece_index
+        changed = 0
+        lifted = []
+        placed = []
+        for pos, update in updates:
+            index = square_index[pos]
+            bit = 1 << index
+            changed |= bit
+            old = squares[index]
+            if old != '___':
+                key = (old.get_color(), type(old))
+                bitboards[key] &= ~bit
+                occupied[key[0]] &= ~bit
+                self._zobrist_key ^= self._zobrist_pieces[key][index]
+                lifted.append(old)
+            if update != '___':
+                key = (update.get_color(), type(update))
+                bitboards[key] |= bit
+                occupied[key[0]] |= bit
+                self._zobrist_key ^= self._zobrist_pieces[key][index]
+                piece_index[update] = index
+                placed.append(update)
+            squares[index] = update
+        self._pins = None
+
+        reach = self._reach
+        for piece in lifted:
+            if piece not in placed:
+                self._set_reach(piece, 0)
+                del reach[piece]
+                del piece_index[piece]
+        for piece in self._sliders:
+            if reach.get(piece, 0) & changed and piece not in placed:
+                self._set_reach(piece, self._find_reach(piece, piece_index[piece]))
+        for piece in placed:
+            self._set_reach(piece, self._find_reach(piece, piece_index[piece]))
+
+    def _set_reach(self, piece, reach):
+        """Replaces the stored reach of a piece and moves the attack counts of its color by the spots it stopped or
+        started reaching"""
+        old = self._reach.get(piece, 0)
+        if old != reach:
+            planes = self._attack_planes[piece.get_color()]
+            # take one from the count of every spot left: a borrow moves up the planes while a count bit was 0
+            borrow = old & ~reach
+            place = 0
+            while borrow:
+                plane = planes[place]
+                planes[place] = plane ^ borrow
+                borrow &= ~plane
+                place += 1
+            # add one to the count of every spot reached: a carry moves up the planes while a count bit was 1
+            carry = reach & ~old
+            place = 0
+            while carry:
+                plane = planes[place]
+                planes[place] = plane ^ carry
+                carry &= plane
+                place += 1
+        self._reach[piece] = reach
+
+    def _find_reach(self, piece, index, moving_bit=0):
+        """Returns the bitboard of the spots the inputted piece, standing at the spot numbered index, attacks. Each
+        ray stops at the first piece that would stop it in the piece's piece_access method. moving_bit is the
+        bitboard of a spot to see through"""
+        piece_type = type(piece)
+        if piece_type is Knight:
+            return self._geometry.knight_bits[index]
+        if piece_type is King:
+            return self._geometry.king_bits[index]
+        rays = self._geometry.rays
+        color = piece.get_color()
+        enemy = 'b' if color == 'w' else 'w'
+        occupied = (self._occupied['w'] | self._occupied['b']) & ~moving_bit
+        if piece_type is Bishop:
+            return (_slide(rays[(1, 1)], index, occupied, True) | _slide(rays[(-1, 1)], index, occupied, True)
+                    | _slide(rays[(1, -1)], index, occupied, False) | _slide(rays[(-1, -1)], index, occupied, False))
+        # moving up a column the rook passes over pieces of the other color, moving down it passes over its own
+        return (_slide(rays[(1, 0)], index, occupied, True) | _slide(rays[(-1, 0)], index, occupied, False)
+                | _slide(rays[(0, 1)], index, self._occupied[color] & ~moving_bit, True)
+                | _slide(rays[(0, -1)], index, self._occupied[enemy] & ~moving_bit, False))
+
+    def reaches_king(self, piece, index, moving_bit=0):
+        """Returns True if the inputted piece, standing at the spot numbered index, would reach the other color's
+        king with the same rules its piece_access method uses. moving_bit is the bitboard of a spot to see through,
+        in the same way as the moving_pc_current_pos argument of piece_access"""
+        color = piece.get_color()
+        enemy = 'b' if color == 'w' else 'w'
+        king_bit = self._bitboards[(enemy, King)]
+        if king_bit & moving_bit:
+            return False
+        piece_type = type(piece)
+        if piece_type is Knight:
+            return self._geometry.knight_bits[index] & king_bit != 0
+        if piece_type is King:
+            return self._geometry.king_bits[index] & king_bit != 0
+        rays = self._geometry.rays
+        king_index = king_bit.bit_length() - 1
+        if piece_type is Bishop:
+            if not (rays[(1, 1)][index] | rays[(-1, 1)][index] | rays[(1, -1)][index] | rays[(-1, -1)][index]) \
+                    & king_bit:
+                return False
+            blockers = self._occupied['w'] | self._occupied['b']
+        elif rays[(0, 1)][index] & king_bit:
+            # moving up a column the rook passes over pieces of the other color
+            blockers = self._occupied[color]
+        elif rays[(0, -1)][index] & king_bit:
+            # moving down a column the rook passes over pieces of its own color
+            blockers = self._occupied[enemy]
+        elif (rays[(1, 0)][index] | rays[(-1, 0)][index]) & king_bit:
+            blockers = self._occupied['w'] | self._occupied['b']
+        else:
+            return False
+        return self._geometry.between[index][king_index] & blockers & ~moving_bit == 0
+
+    def generate_legal_moves(self, color):
+        """Returns a list of every legal (move_from, move_to) pair for the pieces of the inputted color, in the
+        same order as Board.generate_legal_moves. Targets come from the stored reach bitboards and are checked
+        against the pins and check spots of the position, so no access sets are built"""
+        enemy = 'b' if color == 'w' else 'w'
+        own = self._occupied[color]
+        enemy_king = self._bitboards[(enemy, King)]
+        checked, pinned = self.get_pins()[:2]
+        squares = self._geometry.squares
+        if color == 'w':
+            pc_list = self._white_pcs
+        else:
+            pc_list = self._black_pcs
+        moves = []
+        for piece in pc_list:
+            if piece not in self._piece_index:
+                continue
+            index = self._piece_index[piece]
+            if checked & ~(1 << index) or index in pinned:
+                # all_pc_access is False for every move of this piece
+                continue
+            move_from = squares[index]
+            if type(piece) is King:
+                targets = self._geometry.king_bits[index]
+            elif self._reach[piece] & enemy_king:
+                # a piece that already reaches the other king has no access to any spot
+                continue
+            else:
+                targets = self._reach[piece]
+            # the check spots of a king are next to or on the other king
+            targets &= ~own & ~self.get_check_spots(color, type(piece))
+            while targets:
+                low_bit = targets & -targets
+                targets ^= low_bit
+                move_to = squares[low_bit.bit_length() - 1]
+                if type(piece) is King and self.king_spot_attacked(move_to, color, move_from):
                     continue
-                if piece.piece_access(pc_pos, self, moving_pc_current_pos):
+                moves.append((move_from, move_to))
+        return moves
+
+    def generate_candidate_moves(self, color):
+        """Returns the (captures, others) lists of Board.generate_candidate_moves. Targets come from the stored
+        reach bitboards, and captures are the ones on the other color's occupied bitboard"""
+        enemy = 'b' if color == 'w' else 'w'
+        own = self._occupied[color]
+        enemy_occupied = self._occupied[enemy]
+        enemy_king = self._bitboards[(enemy, King)]
+        squares = self._geometry.squares
+        if color == 'w':
+            pc_list = self._white_pcs
+        else:
+            pc_list = self._black_pcs
+        captures = []
+        others = []
+        for piece in pc_list:
+            if piece not in self._piece_index:
+                continue
+            index = self._piece_index[piece]
+            move_from = squares[index]
+            if type(piece) is King:
+                targets = self._geometry.king_bits[index] & ~own
+            elif self._reach[piece] & enemy_king:
+                # piece_access is False for a piece that already reaches the other king
+                continue
+            else:
+                targets = self._reach[piece] & ~own
+            while targets:
+                low_bit = targets & -targets
+                targets ^= low_bit
+                if low_bit & enemy_occupied:
+                    captures.append((move_from, squares[low_bit.bit_length() - 1]))
+                else:
+                    others.append((move_from, squares[low_bit.bit_length() - 1]))
+        return captures, others
+
+    def _find_pins(self):
+        """Returns what Board._find_pins does. The kings reached are read from the attack counts, so only the rooks
+        and bishops on a line with the other color's king that do not reach it are looked at for pins"""
+        geometry = self._geometry
+        occupied = self._occupied
+        every = occupied['w'] | occupied['b']
+        king_bits = {'w': self._bitboards[('w', King)], 'b': self._bitboards[('b', King)]}
+        kings = {'w': king_bits['w'].bit_length() - 1, 'b': king_bits['b'].bit_length() - 1}
+        checked = king_bits['w'] & self.get_attacked('b') | king_bits['b'] & self.get_attacked('w')
+        pinned = {}
+        reach = self._reach
+        piece_index = self._piece_index
+        for piece, color, enemy, is_bishop in self._slider_info:
+            index = piece_index.get(piece)
+            if index is None:
+                continue
+            king_bit = king_bits[enemy]
+            if reach[piece] & king_bit:
+                continue
+            if is_bishop:
+                if not geometry.bishop_lines[index] & king_bit:
                     continue
+                blockers = every
+            elif geometry.up_rays[index] & king_bit:
+                blockers = occupied[color]
+            elif geometry.down_rays[index] & king_bit:
+                blockers = occupied[enemy]
+            elif geometry.row_lines[index] & king_bit:
+                blockers = every
+            else:
+                continue
+            between = geometry.between[index][kings[enemy]] & blockers
+            if not between & (between - 1):
+                spot = between.bit_length() - 1
+                pinned[spot] = pinned.get(spot, 0) | king_bit
+        # the pins are kept after later moves change self._occupied, so they get their own copy
+        return checked, pinned, {}, dict(occupied), kings
+
+    def get_king_danger(self, color):
+        """Returns the bitboard of the empty spots the king of the inputted color could not move onto because a piece
+        of the other color would have access to them once the king has left its spot"""
+        enemy = 'b' if color == 'w' else 'w'
+        king_bit = self._bitboards[(color, King)]
+        danger = self.get_attacked(enemy)
+        # seeing through the king only lengthens the rays of the rooks and bishops that reach it
+        for piece in self._slider_pieces(king_bit, enemy):
+            danger |= self._find_reach(piece, self._piece_index[piece], king_bit)
+        return danger & ~(self._occupied['w'] | self._occupied['b'])
+
+    def king_spot_attacked(self, pos, color, king_pos):
+        """Checks if any piece of the color opposite to the inputted color would have access to pos once the king
+        at king_pos has left its spot, using the attacked bitboards. Returns True if the spot is attacked"""
+        enemy = 'b' if color == 'w' else 'w'
+        index = self._square_index[pos]
+        if self._squares[index] != '___':
+            if self._squares[index].get_color() == enemy:
+                # no piece ever has access to a spot held by its own color
+                return False
+            return super().king_spot_attacked(pos, color, king_pos)
+        if self.get_attacked(enemy) >> index & 1:
+            return True
+        # the king leaving its spot can only open up the rays of rooks and bishops that pass over it
+        king_bit = 1 << self._square_index[king_pos]
+        for piece in self._slider_pieces(king_bit, enemy):
+            if self._find_reach(piece, self._piece_index[piece], king_bit) >> index & 1:
+                return True
+        return False
+
+    def _slider_pieces(self, bit, color):
+        """Returns a list of the rooks and bishops of the inputted color on the board whose reach holds bit"""
+        reach = self._reach
+        return [piece for piece in self._sliders if reach.get(piece, 0) & bit and piece.get_color() == color]
+
+
+class CompactBoard(Board):
+    """An alternative to the Board class for holding many games in memory at once. Every spot is a small integer
+    piece code (see TYPE_CODES) in a flat bytearray of the spots, and the spot number of every piece is kept in a
+    second bytearray, so there is no list of lists, column dictionary or bitboard dictionary per board. Move
+    generation and the check tests read the codes directly instead of comparing piece objects with '___'. Boards
+    with more spots or pieces than a byte can number use unsigned short arrays instead of bytearrays.
+
+    The piece objects are still kept as a thin view of the codes, so get_piece, token and valid_movement behave as
+    they do on Board and the board can be used by ChessVar.make_move unchanged"""
+    def __init__(self, variant=None):
+        """Initializes the same chess piece objects as Board and writes their codes into the bytearrays"""
+        self._set_variant(variant)
+        geometry = self._geometry
+        self._pieces = self._white_pcs + self._black_pcs
+        self._white_count = len(self._white_pcs)
+        self._square_index = geometry.square_index
+        if self._variant is DEFAULT_VARIANT:
+            self._list_codes = LIST_CODES
+        else:
+            self._list_codes = _build_list_codes(self._pieces)
+        self._zobrist_codes = _get_zobrist_codes(geometry)
+        # a captured piece is given the spot number one past the last spot
+        self._captured = geometry.size
+        if geometry.size < 256 and len(self._pieces) <= 16:
+            self._squares = bytearray(geometry.size)
+            self._spots = bytearray([self._captured]) * len(self._pieces)
+        else:
+            self._squares = array('H', [0]) * geometry.size
+            self._spots = array('H', [self._captured]) * len(self._pieces)
+        self._zobrist_key = 0
+        self._pins = None
+        for piece in self._pieces:
+            self.update_board(piece.get_current_pos(), piece)
+
+    def get_board_state(self):
+        """Returns a list of lists in the same layout as Board's self._board_state, built from the codes"""
+        board_state = []
+        for row in range(self._height, 0, -1):
+            board_state.append([str(row)] + [self.get_piece(col + str(row)) for col in self._geometry.columns])
+        board_state.append([''] + list(self._geometry.columns))
+        return board_state
+
+    def get_squares(self):
+        """Returns a copy of the piece codes of every spot, a1 first"""
+        return bytes(self._squares) if isinstance(self._squares, bytearray) else self._squares.tolist()
+
+    def get_code(self, pos):
+        """Returns the type and color part of the code of the piece at the inputted position, or 0 if it is
+        empty"""
+        return self._squares[self._square_index[pos]] & 15
+
+    def get_white_king_row(self):
+        """Returns the row that the white king is currently located at on the board"""
+        return self._spots[self._king_numbers[0]] // self._geometry.width + 1
+
+    def get_black_king_row(self):
+        """Returns the row that the black king is currently located at on the board"""
+        return self._spots[self._king_numbers[1]] // self._geometry.width + 1
+
+    def get_piece(self, pos):
+        """Returns the chess piece currently located at the inputted position on the board"""
+        code = self._squares[self._square_index[pos]]
+        if code:
+            return self._pieces[code >> 4]
+        return '___'
+
+    def update_board(self, pos, update):
+        """Updates the board based on new positions of chess pieces during gameplay. A piece that is written over
+        without having been moved first has been captured"""
+        index = self._square_index[pos]
+        old = self._squares[index]
+        self._pins = None
+        if old:
+            self._zobrist_key ^= self._zobrist_codes[old & 15][index]
+            if self._spots[old >> 4] == index:
+                self._spots[old >> 4] = self._captured
+        if update == '___':
+            self._squares[index] = 0
+            return
+        number = self._pieces.index(update)
+        code = self._list_codes[number]
+        self._squares[index] = code
+        self._spots[number] = index
+        self._zobrist_key ^= self._zobrist_codes[code & 15][index]
+
+    def _access(self, number, index, moving=-1):
+        """Returns the bitboard of the spots the piece numbered number in the piece lists has access to from the
+        spot numbered index, seeing through the spot numbered moving, with the same rules as its piece_access
+        method. Returns None where piece_access would return False"""
+        squares = self._squares
+        geometry = self._geometry
+        code = self._list_codes[number]
+        color = code & BLACK_CODE
+        piece_type = code & 7
+        bits = 0
+        if piece_type == ROOK_CODE:
+            right, left, up, down = geometry.rook_ray_indexes[index]
+            for ray in (right, left):
+                for spot in ray:
+                    at_spot = squares[spot]
+                    if not at_spot:
+                        bits |= 1 << spot
+                    elif spot == moving:
+                        continue
+                    elif at_spot & BLACK_CODE != color:
+                        if at_spot & 7 == KING_CODE:
+                            return None
+                        bits |= 1 << spot
+                        break
+                    else:
+                        break
+            # moving up a column the rook passes over pieces of the other color
+            for spot in up:
+                at_spot = squares[spot]
+                if not at_spot:
+                    bits |= 1 << spot
+                elif spot == moving:
+                    continue
+                elif at_spot & BLACK_CODE != color:
+                    if at_spot & 7 == KING_CODE:
+                        return None
+                    bits |= 1 << spot
                 else:
-                    return False
-        return True
+                    break
+            # moving down a column the rook passes over pieces of its own color
+            for spot in down:
+                at_spot = squares[spot]
+                if not at_spot:
+                    bits |= 1 << spot
+                elif spot == moving:
+                    continue
+                elif at_spot & BLACK_CODE != color:
+                    if at_spot & 7 == KING_CODE:
+                        return None
+                    bits |= 1 << spot
+                    break
+            return bits
+        if piece_type == BISHOP_CODE:
+            for diagonal in geometry.bishop_ray_indexes[index]:
+                for spot in diagonal:
+                    at_spot = squares[spot]
+                    if not at_spot or spot == moving:
+                        bits |= 1 << spot
+                    elif at_spot & BLACK_CODE == color:
+                        break
+                    elif at_spot & 7 == KING_CODE:
+                        return None
+                    else:
+                        bits |= 1 << spot
+                        break
+            return bits
+        if piece_type == KNIGHT_CODE:
+            for spot in geometry.knight_indexes[index]:
+                at_spot = squares[spot]
+                if not at_spot or spot == moving:
+                    bits |= 1 << spot
+                elif at_spot & BLACK_CODE == color:
+                    continue
+                elif at_spot & 7 == KING_CODE:
+                    return None
+                else:
+                    bits |= 1 << spot
+            return bits
+        current = self._spots[number]
+        for spot in geometry.king_area_indexes[index]:
+            if spot == current:
+                continue
+            at_spot = squares[spot]
+            if not at_spot or spot == moving:
+                bits |= 1 << spot
+            elif at_spot & BLACK_CODE != color and at_spot & 7 == KING_CODE:
+                return None
+        return bits
+
+    def _spot_attacked(self, target, color, moving):
+        """Does the work of king_spot_attacked with spot numbers in place of names"""
+        spots = self._spots
+        captured = self._captured
+        if color == 'w':
+            numbers = range(self._white_count, len(spots))
+        else:
+            numbers = range(self._white_count)
+        for number in numbers:
+            if spots[number] == captured:
+                continue
+            bits = self._access(number, spots[number], moving)
+            if bits is not None and bits >> target & 1:
+                return True
+        return False
+
+    def generate_legal_moves(self, color):
+        """Returns a list of every legal (move_from, move_to) pair for the pieces of the inputted color, in the
+        same order as Board.generate_legal_moves, working on the piece codes and the pins of the position"""
+        squares = self._squares
+        spots = self._spots
+        list_codes = self._list_codes
+        geometry = self._geometry
+        own = 0 if color == 'w' else BLACK_CODE
+        if color == 'w':
+            numbers = range(self._white_count)
+        else:
+            numbers = range(self._white_count, len(spots))
+        checked, pinned = self.get_pins()[:2]
+        moves = []
+        for number in numbers:
+            move_from = spots[number]
+            if move_from == self._captured:
+                continue
+            is_king = list_codes[number] & 7 == KING_CODE
+            if checked & ~(1 << move_from) or move_from in pinned:
+                # all_pc_access is False for every move of this piece
+                continue
+            checks = self.get_check_spots(color, CODE_TYPES[list_codes[number] & 7])
+            if is_king:
+                candidates = [spot for spot in geometry.king_area_indexes[move_from] if spot != move_from]
+            else:
+                bits = self._access(number, move_from)
+                if bits is None:
+                    continue
+                candidates = []
+                while bits:
+                    low_bit = bits & -bits
+                    bits ^= low_bit
+                    candidates.append(low_bit.bit_length() - 1)
+            for move_to in candidates:
+                at_spot = squares[move_to]
+                if at_spot and at_spot & BLACK_CODE == own:
+                    continue
+                if checks >> move_to & 1:
+                    continue
+                if is_king and self._spot_attacked(move_to, color, move_from):
+                    continue
+                moves.append((geometry.squares[move_from], geometry.squares[move_to]))
+        return moves
+
+    def generate_candidate_moves(self, color):
+        """Returns the (captures, others) lists of Board.generate_candidate_moves, working on the piece codes"""
+        squares = self._squares
+        spots = self._spots
+        list_codes = self._list_codes
+        geometry = self._geometry
+        names = geometry.squares
+        own = 0 if color == 'w' else BLACK_CODE
+        if color == 'w':
+            numbers = range(self._white_count)
+        else:
+            numbers = range(self._white_count, len(spots))
+        captures = []
+        others = []
+        for number in numbers:
+            move_from = spots[number]
+            if move_from == self._captured:
+                continue
+            if list_codes[number] & 7 == KING_CODE:
+                candidates = [spot for spot in geometry.king_area_indexes[move_from] if spot != move_from]
+            else:
+                bits = self._access(number, move_from)
+                if bits is None:
+                    continue
+                candidates = []
+                while bits:
+                    low_bit = bits & -bits
+                    bits ^= low_bit
+                    candidates.append(low_bit.bit_length() - 1)
+            for move_to in candidates:
+                at_spot = squares[move_to]
+                if not at_spot:
+                    others.append((names[move_from], names[move_to]))
+                elif at_spot & BLACK_CODE != own:
+                    captures.append((names[move_from], names[move_to]))
+        return captures, others
+
+    def king_spot_attacked(self, pos, color, king_pos):
+        """Checks if any piece of the color opposite to the inputted color would have access to pos once the king
+        at king_pos has left its spot. Returns True if the spot is attacked"""
+        return self._spot_attacked(self._square_index[pos], color, self._square_index[king_pos])
+
+    def get_king_danger(self, color):
+        """Returns the bitboard of the empty spots the king of the inputted color could not move onto because a piece
+        of the other color would have access to them once the king has left its spot"""
+        spots = self._spots
+        king_index = spots[self._king_numbers[0] if color == 'w' else self._king_numbers[1]]
+        danger = 0
+        occupied = 0
+        for number in range(len(spots)):
+            if spots[number] == self._captured:
+                continue
+            occupied |= 1 << spots[number]
+            if (number >= self._white_count) == (color == 'w'):
+                bits = self._access(number, spots[number], king_index)
+                if bits is not None:
+                    danger |= bits
+        return danger & ~occupied
@@ -0,0 +1,405 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Vectorized move checking and evaluation for many ChessVar positions at once. Positions are rows of an
+# (N, 64) int8 array and every rule of piece_access, valid_movement and all_pc_access is applied to all rows in
+# one array pass with NumPy, so a server running thousands of games can check a tick's moves without looping over
+# ChessVar objects. NumPy is only needed by this module
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ChessVar import King, Rook, Bishop, Knight
+from search import WIN_SCORE, NO_PATH, PIECE_VALUES, ROW_VALUE, PATH_VALUE, RACE_VALUE
+
+# Piece codes in a position row. White pieces are positive and black pieces negative. Row index 0 is a1 and 63 is
+# h8, the same numbering as ChessVar.SQUARE_INDEX
+EMPTY = 0
+KING = 1
+ROOK = 2
+BISHOP = 3
+KNIGHT = 4
+PIECE_CODES = {King: KING, Rook: ROOK, Bishop: BISHOP, Knight: KNIGHT}
+WHITE = 1
+BLACK = -1
+
+# How each kind of ray treats the spot it reaches, matching the piece_access methods: whether a spot is added to
+# the access set and whether the ray carries on past it, for the moving spot when it holds a piece, a piece of
+# the ray's own color, another piece of the other color and the other king. Reaching the other king makes
+# piece_access return False; here the ray carries on as the BitBoard reach does
+RAY_RULES = {
+    'side': {'moving': (False, True), 'own': (False, False), 'enemy': (True, False), 'king': (True, False)},
+    'up': {'moving': (False, True), 'own': (False, False), 'enemy': (True, True), 'king': (True, True)},
+    'down': {'moving': (False, True), 'own': (False, True), 'enemy': (True, False), 'king': (True, False)},
+    'diagonal': {'moving': (True, True), 'own': (False, False), 'enemy': (True, False), 'king': (True, False)},
+}
+SLIDES = (
+    (ROOK, (1, 0), 'side'), (ROOK, (-1, 0), 'side'), (ROOK, (0, 1), 'up'), (ROOK, (0, -1), 'down'),
+    (BISHOP, (1, 1), 'diagonal'), (BISHOP, (-1, 1), 'diagonal'), (BISHOP, (1, -1), 'diagonal'),
+    (BISHOP, (-1, -1), 'diagonal'),
+)
+KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_STEPS = tuple((col, row) for col in (-1, 0, 1) for row in (-1, 0, 1) if col or row)
+
+_tables = {}
+
+
+def _require_numpy():
+    """Raises ImportError if NumPy is not installed"""
+    if np is None:
+        raise ImportError('the batch module needs NumPy: pip install numpy')
+
+
+def _step_table(steps):
+    """Returns a (64, len(steps)) table of the spot each (column step, row step) reaches from every spot, with 64 for
+    steps that leave the board"""
+    table = np.full((64, len(steps)), 64, dtype=np.intp)
+    for index in range(64):
+        for number, (col_step, row_step) in enumerate(steps):
+            col, row = index % 8 + col_step, index // 8 + row_step
+            if 0 <= col <= 7 and 0 <= row <= 7:
+                table[index, number] = row * 8 + col
+    return table
+
+
+def _get_tables():
+    """Builds the lookup tables the first time they are needed"""
+    if not _tables:
+        _require_numpy()
+        for piece, step, rule in SLIDES:
+            _tables[step] = _step_table([(step[0] * distance, step[1] * distance) for distance in range(1, 8)])
+        _tables['knight'] = _step_table(KNIGHT_STEPS)
+        _tables['king'] = _step_table(KING_STEPS)
+        area = np.zeros((65, 65), dtype=bool)
+        for index in range(64):
+            area[index, _tables['king'][index]] = True
+            area[index, index] = True
+        # king_area[index] is the 3x3 block of spots around index, including index itself
+        _tables['king_area'] = area[:64, :64]
+        _tables['origins'] = np.arange(64)
+        # bits[spot] is the uint64 bit of each spot, with 0 for the off the board spot 64
+        _tables['bits'] = np.append(np.uint64(1) << np.arange(64, dtype=np.uint64), np.uint64(0))
+    return _tables
+
+
+def encode_game(game):
+    """Returns the (64,) int8 position row for the board of the inputted ChessVar game and WHITE or BLACK for the
+    player whose turn it is"""
+    _require_numpy()
+    board = game.get_board()
+    row = np.zeros(64, dtype=np.int8)
+    for pc_list, sign in ((board.get_white_pcs(), WHITE), (board.get_black_pcs(), BLACK)):
+        for piece in pc_list:
+            pos = piece.get_current_pos()
+            if pos != '0':
+                row[(int(pos[1]) - 1) * 8 + 'abcdefgh'.index(pos[0])] = sign * PIECE_CODES[type(piece)]
+    return row, WHITE if game.get_to_move() == 'w' else BLACK
+
+
+def encode_games(games):
+    """Returns the (N, 64) int8 array of position rows and the (N,) int8 array of players to move for a list of
+    ChessVar games"""
+    _require_numpy()
+    encoded = [encode_game(game) for game in games]
+    return (np.array([row for row, to_move in encoded], dtype=np.int8).reshape(-1, 64),
+            np.array([to_move for row, to_move in encoded], dtype=np.int8))
+
+
+def _padded(positions):
+    """Returns the positions with a 65th empty column, so spot 64 can stand for off the board"""
+    return np.concatenate([positions, np.zeros((len(positions), 1), dtype=np.int8)], axis=1)
+
+
+def _spot_kinds(padded, signs, spots, moving):
+    """Returns the (empty, moving, own, enemy, king) masks for the spots each origin looks at in one step, relative
+    to signs, the color of the piece at each origin. spots is a (64,) array of spot numbers with 64 for off the
+    board"""
+    found = padded[:, spots]
+    relative = found * signs
+    empty = found == 0
+    is_moving = moving[:, spots] & ~empty
+    held = ~empty & ~is_moving
+    return empty, is_moving, held & (relative > 0), held & (relative < 0) & (relative != -KING), \
+        held & (relative == -KING)
+
+
+def _moving_mask(count, moving):
+    """Returns the (N, 65) bool mask of the moving spot of each position, from a (N,) array of spot numbers with -1
+    for none"""
+    mask = np.zeros((count, 65), dtype=bool)
+    if moving is not None:
+        moving = np.asarray(moving)
+        rows = np.nonzero(moving >= 0)[0]
+        mask[rows, moving[rows]] = True
+    return mask
+
+
+def _pack(spots):
+    """Returns the uint64 bit sets of (..., 64) bool spot maps, bit n standing for spot n"""
+    return np.bitwise_or.reduce(np.where(spots, _get_tables()['bits'][:64], np.uint64(0)), axis=-1)
+
+
+def _unpack(bit_sets):
+    """Returns the (..., 64) bool spot maps of uint64 bit sets"""
+    return (bit_sets[..., None] >> np.arange(64, dtype=np.uint64) & np.uint64(1)).astype(bool)
+
+
+def _access_bits(positions, moving=None, pieces=None, with_access=True):
+    """Does the work of access_maps, returning each access set as a uint64 bit set so the (N, 64, 64) array is
+    only built when it is asked for"""
+    tables = _get_tables()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    pieces = positions if pieces is None else np.asarray(pieces, dtype=np.int8).reshape(-1, 64)
+    count = len(positions)
+    moving = _moving_mask(count, moving)
+    kinds = np.abs(pieces)
+    signs = np.sign(pieces)
+    padded = _padded(positions)
+    access = np.zeros((count, 64), dtype=np.uint64) if with_access else None
+    hits = np.zeros((count, 64), dtype=bool)
+
+    for piece, step, rule_name in SLIDES:
+        rule = RAY_RULES[rule_name]
+        alive = kinds == piece
+        table = tables[step]
+        for distance in range(7):
+            spots = table[:, distance]
+            alive &= spots < 64
+            if not alive.any():
+                break
+            empty, is_moving, own, enemy, king = _spot_kinds(padded, signs, spots, moving)
+            hits |= alive & king
+            if with_access:
+                added = empty.copy()
+                for kind_name, kind in (('moving', is_moving), ('own', own), ('enemy', enemy), ('king', king)):
+                    if rule[kind_name][0]:
+                        added |= kind
+                access |= np.where(alive & added, tables['bits'][spots], np.uint64(0))
+            passes = empty.copy()
+            for kind_name, kind in (('moving', is_moving), ('own', own), ('enemy', enemy), ('king', king)):
+                if rule[kind_name][1]:
+                    passes |= kind
+            alive &= passes
+
+    for piece, table in ((KNIGHT, tables['knight']), (KING, tables['king'])):
+        present = kinds == piece
+        for number in range(table.shape[1]):
+            spots = table[:, number]
+            alive = present & (spots < 64)
+            if not alive.any():
+                continue
+            empty, is_moving, own, enemy, king = _spot_kinds(padded, signs, spots, moving)
+            hits |= alive & king
+            if with_access:
+                # kings do not get access to spots held by the other color, knights do
+                added = empty | is_moving | king | (enemy if piece == KNIGHT else False)
+                access |= np.where(alive & added, tables['bits'][spots], np.uint64(0))
+    return access, hits
+
+
+def access_maps(positions, moving=None, pieces=None, with_access=True):
+    """Returns (access, hits) for every spot of every position. access[n, origin] is the (64,) bool access set the
+    piece at origin gets from piece_access, and hits[n, origin] is True where piece_access would return False
+    because the piece reaches the other king. moving is an optional (N,) array of the moving_pc_current_pos spot of
+    each position, -1 for none. pieces replaces the piece standing at each origin, to ask where a piece would reach
+    if it were moved there while the board stays the same. access is None if with_access is False"""
+    access, hits = _access_bits(positions, moving, pieces, with_access)
+    return (None if access is None else _unpack(access)), hits
+
+
+def _attacked_bits(positions, color, moving=None):
+    """Returns the (N,) uint64 bit sets of the spots in the access set of any piece of the inputted color"""
+    access, hits = _access_bits(positions, moving)
+    return np.bitwise_or.reduce(np.where(positions * color > 0, access, np.uint64(0)), axis=1)
+
+
+def attacked_squares(positions, color, moving=None):
+    """Returns the (N, 64) bool map of the spots in the access set of any piece of the inputted color (WHITE or
+    BLACK), with an optional (N,) array of moving spots as in access_maps"""
+    _require_numpy()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    return _unpack(_attacked_bits(positions, color, moving))
+
+
+def king_squares(positions):
+    """Returns the (N,) spot numbers of the white kings and of the black kings"""
+    _require_numpy()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    return np.argmax(positions == KING, axis=1), np.argmax(positions == -KING, axis=1)
+
+
+def king_rows(positions):
+    """Returns the (N, 2) int8 array of the rows (1 to 8) of the white and black kings"""
+    white_kings, black_kings = king_squares(positions)
+    return np.stack([white_kings // 8 + 1, black_kings // 8 + 1], axis=1).astype(np.int8)
+
+
+def all_pc_access(positions):
+    """Returns the (N, 64) bool array whose [n, spot] entry equals Board.all_pc_access(spot) for position n: False
+    if moving the piece at spot would leave any piece able to reach the other color's king. Every spot of every
+    position is answered from a single pass that finds, for each ray heading at a king, the pieces in its way"""
+    tables = _get_tables()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    count = len(positions)
+    kinds = np.abs(positions)
+    signs = np.sign(positions)
+    padded = _padded(positions)
+    no_moving = _moving_mask(count, None)
+    # spots that reach a king with nothing in the way, and spots whose piece is the only thing in the way
+    unused, direct = _access_bits(positions, with_access=False)
+    opened = np.zeros((count, 65), dtype=bool)
+
+    for piece, step, rule_name in SLIDES:
+        rule = RAY_RULES[rule_name]
+        alive = kinds == piece
+        blocked = np.zeros((count, 64), dtype=bool)
+        blocker = np.zeros((count, 64), dtype=np.intp)
+        table = tables[step]
+        for distance in range(7):
+            spots = table[:, distance]
+            alive &= spots < 64
+            if not alive.any():
+                break
+            empty, is_moving, own, enemy, king = _spot_kinds(padded, signs, spots, no_moving)
+            found = alive & king & blocked
+            found_rows, found_origins = np.nonzero(found)
+            opened[found_rows, blocker[found_rows, found_origins]] = True
+            passes = empty.copy()
+            for kind_name, kind in (('own', own), ('enemy', enemy)):
+                if rule[kind_name][1]:
+                    passes |= kind
+            stops = alive & ~king & ~passes
+            alive &= ~king & (passes | ~blocked)
+            blocker = np.where(stops & ~blocked, spots[None, :], blocker)
+            blocked |= stops
+
+    white_kings, black_kings = king_squares(positions)
+    white_checked = (direct & (positions < 0)).any(axis=1)
+    black_checked = (direct & (positions > 0)).any(axis=1)
+    spots = tables['origins'][None, :]
+    # a king that is itself the moving piece can not be reached on the spot it is leaving
+    failed = (white_checked[:, None] & (spots != white_kings[:, None])) \
+        | (black_checked[:, None] & (spots != black_kings[:, None])) | opened[:, :64]
+    return ~failed
+
+
+def _legal_bits(positions, to_move):
+    """Does the work of legal_move_masks, returning the spots each piece can move to as uint64 bit sets"""
+    tables = _get_tables()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    to_move = np.asarray(to_move, dtype=np.int8).reshape(-1)
+    count = len(positions)
+    rows = np.arange(count)
+    kinds = np.abs(positions)
+    own = positions * to_move[:, None] > 0
+    access, hits = _access_bits(positions)
+    pc_access = all_pc_access(positions)
+
+    moves = np.zeros((count, 64), dtype=np.uint64)
+    for piece in (ROOK, BISHOP, KNIGHT):
+        movers = own & (kinds == piece) & ~hits & pc_access
+        if not movers.any():
+            continue
+        # the piece must not reach the other king from its new spot either, with the board left as it is
+        placed = np.broadcast_to((piece * to_move)[:, None], (count, 64))
+        unused, reaches_king = _access_bits(positions, pieces=placed, with_access=False)
+        moves |= np.where(movers, access & ~_pack(reaches_king)[:, None], np.uint64(0))
+
+    white_kings, black_kings = king_squares(positions)
+    kings = np.where(to_move == WHITE, white_kings, black_kings)
+    enemy_kings = np.where(to_move == WHITE, black_kings, white_kings)
+    # the other color's access sets are found with the moving king's spot seen through
+    attacked = _attacked_bits(positions, -to_move[:, None], kings)
+    area = tables['king_area']
+    targets = _pack(area[kings] & ~own & ~area[enemy_kings]) & ~attacked
+    moves[rows, kings] = np.where(pc_access[rows, kings], targets, np.uint64(0))
+    return moves
+
+
+def legal_move_masks(positions, to_move):
+    """Returns the (N, 64, 64) bool array whose [n, move_from, move_to] entry is True when the piece of the player
+    to move at move_from could move to move_to by its valid_movement method in position n. to_move is an (N,)
+    array of WHITE or BLACK. Whether the game is already over is not checked"""
+    return _unpack(_legal_bits(positions, to_move))
+
+
+def validate_moves(positions, to_move, move_from, move_to):
+    """Returns the (N,) bool array telling whether the move from spot move_from[n] to spot move_to[n] is valid for
+    the player to move in position n"""
+    moves = _legal_bits(positions, to_move)
+    rows = np.arange(len(moves))
+    move_to = np.asarray(move_to).astype(np.uint64)
+    return (moves[rows, np.asarray(move_from)] >> move_to & np.uint64(1)).astype(bool)
+
+
+def _spread(reached):
+    """Returns the (N, 64) bool map of the spots a king could reach in one move from any reached spot, plus the
+    reached spots themselves"""
+    grid = reached.reshape(-1, 8, 8)
+    sideways = grid.copy()
+    sideways[:, :, 1:] |= grid[:, :, :-1]
+    sideways[:, :, :-1] |= grid[:, :, 1:]
+    spread = sideways.copy()
+    spread[:, 1:, :] |= sideways[:, :-1, :]
+    spread[:, :-1, :] |= sideways[:, 1:, :]
+    return spread.reshape(-1, 64)
+
+
+def king_distances(positions, color):
+    """Returns the (N,) fewest king moves the king of the inputted color needs to reach row 8 without stepping onto
+    its own pieces or spots the other color has access to once the king has left its spot, or NO_PATH, as
+    search.king_distance does for each position"""
+    _require_numpy()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    count = len(positions)
+    rows = np.arange(count)
+    white_kings, black_kings = king_squares(positions)
+    kings = white_kings if color == WHITE else black_kings
+    danger = attacked_squares(positions, -color, kings) & (positions == 0)
+    allowed = ~(positions * color > 0) & ~danger
+
+    reached = np.zeros((count, 64), dtype=bool)
+    reached[rows, kings] = True
+    distances = np.full(count, NO_PATH, dtype=np.int64)
+    done = kings >= 56
+    distances[done] = 0
+    for distance in range(NO_PATH):
+        if done.all():
+            break
+        grown = _spread(reached) & allowed | reached
+        stuck = ~done & (grown == reached).all(axis=1)
+        done |= stuck
+        reached = np.where(done[:, None], reached, grown)
+        arrived = ~done & reached[:, 56:].any(axis=1)
+        distances[arrived] = distance + 1
+        done |= arrived
+    return distances
+
+
+def evaluate(positions, to_move):
+    """Returns the (N,) scores search.evaluate gives each position, from the point of view of the player to move"""
+    _require_numpy()
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    to_move = np.asarray(to_move, dtype=np.int8).reshape(-1)
+    rows = king_rows(positions).astype(np.int64)
+    white_distance = king_distances(positions, WHITE)
+    black_distance = king_distances(positions, BLACK)
+
+    white_to_move = to_move == WHITE
+    white_ahead = np.where(white_distance < black_distance, 1, np.where(white_distance == black_distance, 0, -1))
+    black_ahead = np.where(black_distance <= white_distance, -1,
+                           np.where(black_distance == white_distance + 1, 0, 1))
+    race = np.where(white_to_move, white_ahead, black_ahead)
+    race[(white_distance >= NO_PATH) & (black_distance >= NO_PATH)] = 0
+
+    material = np.zeros(len(positions), dtype=np.int64)
+    for piece, name in ((ROOK, 'Rook'), (BISHOP, 'Bishop'), (KNIGHT, 'Knight')):
+        material += PIECE_VALUES[name] * ((positions == piece).sum(axis=1) - (positions == -piece).sum(axis=1))
+    score = ROW_VALUE * (rows[:, 0] - rows[:, 1]) + PATH_VALUE * (black_distance - white_distance) \
+        + RACE_VALUE * race + material
+    score = np.where(white_to_move, score, -score)
+    # white has arrived and black is using its last move: only a black king one move from row 8 can tie
+    arrived = np.where(black_distance <= 1, 0, -WIN_SCORE + 1)
+    return np.where(rows[:, 0] == 8, arrived, score)
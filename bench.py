@@ -0,0 +1,468 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: A benchmark and regression suite for the ChessVar rules engine. Every workload is built from a fixed
+# seed, so two runs play exactly the same moves: random legal games replayed through make_move, storms of mostly
+# illegal moves, valid_movement checks on every spot of middlegame positions, perft and engine searches. Each run
+# reports ops/second, latency percentiles and peak memory per workload and board class, with a digest of every
+# legality result. A run fails if the board classes disagree on the legality results. Results are saved as JSON,
+# and a run compared with a saved baseline fails if a workload got slower by more than a threshold or if any board
+# now accepts a different set of moves
+
+import abc
+import argparse
+import gc
+import hashlib
+import json
+import platform
+import random
+import time
+import tracemalloc
+
+from ChessVar import ChessVar, Board, BitBoard, CompactBoard, SQUARES
+from perft import perft
+from search import Searcher
+from stats import percentile
+
+BOARD_CLASSES = {'board': Board, 'bitboard': BitBoard, 'compact': CompactBoard}
+
+# Version of the JSON results. Results of another version are not compared
+RESULTS_VERSION = 2
+
+# Spots that are not on the board, mixed into the illegal move storms to exercise the spot checks
+BAD_SPOTS = ('a0', 'a9', 'i1', 'z', '')
+
+
+def random_games(rng, count, max_plies=120):
+    """Returns a list of count random legal games, each a list of (move_from, move_to) moves from the starting
+    position, played until the game ends or max_plies moves are made"""
+    games = []
+    for _ in range(count):
+        game = ChessVar(CompactBoard(), headless=True)
+        moves = []
+        for _ in range(max_plies):
+            legal = game.legal_moves()
+            if not legal:
+                break
+            move = rng.choice(legal)
+            game.push(move)
+            moves.append(move)
+        games.append(moves)
+    return games
+
+
+def random_positions(rng, count, min_plies, max_plies):
+    """Returns a list of count get_position tuples of unfinished games reached by min_plies to max_plies random
+    legal moves from the starting position"""
+    positions = []
+    game = ChessVar(CompactBoard(), headless=True)
+    start = game.get_position()
+    while len(positions) < count:
+        game.set_position(start)
+        for _ in range(rng.randint(min_plies, max_plies)):
+            legal = game.legal_moves()
+            if not legal:
+                break
+            game.push(rng.choice(legal))
+        if game.get_game_state() == 'UNFINISHED':
+            positions.append(game.get_position())
+    return positions
+
+
+class Workload(abc.ABC):
+    """A named benchmark. prepare builds its inputs from a random.Random once per run, so every board class is timed
+    on the same moves, and run times it on one board class. run returns (ops, latencies, results): the number of
+    operations done, a list of the seconds taken by each timed step and a list of its results, which are digested.
+    If legality is True the results only depend on the rules, so every board class must give the same ones and a
+    changed digest means legality changed"""
+    name = None
+    description = None
+    legality = True
+
+    @abc.abstractmethod
+    def prepare(self, rng, scale):
+        """Returns the inputs of the workload at the inputted scale"""
+
+    @abc.abstractmethod
+    def run(self, board_class, data):
+        """Returns (ops, latencies, results) for one timed run on the inputted board class"""
+
+
+class ReplayWorkload(Workload):
+    """Replays random legal games through make_move on a fresh headless game. One op is one move"""
+    name = 'replay'
+    description = 'random legal games replayed through make_move'
+
+    def prepare(self, rng, scale):
+        return random_games(rng, 30 * scale)
+
+    def run(self, board_class, data):
+        perf_counter = time.perf_counter
+        latencies = []
+        results = []
+        for moves in data:
+            game = ChessVar(board_class(), headless=True)
+            for move_from, move_to in moves:
+                start = perf_counter()
+                accepted = game.make_move(move_from, move_to)
+                latencies.append(perf_counter() - start)
+                if not accepted:
+                    results.append(('refused', move_from, move_to))
+                    break
+            results.append((game.get_game_state(), game.get_fen()))
+        return len(latencies), latencies, results
+
+
+class IllegalWorkload(Workload):
+    """Sends random pairs of spots to make_move in middlegame positions. Most are turned down; an accepted move is
+    taken back with pop outside the timing. One op is one make_move call"""
+    name = 'illegal'
+    description = 'storms of mostly illegal moves sent to make_move'
+
+    def prepare(self, rng, scale):
+        storms = []
+        spots = list(SQUARES)
+        for position in random_positions(rng, 40 * scale, 4, 40):
+            moves = []
+            for _ in range(100):
+                move_from = rng.choice(BAD_SPOTS) if rng.random() < 0.05 else rng.choice(spots)
+                moves.append((move_from, rng.choice(spots)))
+            storms.append((position, moves))
+        return storms
+
+    def run(self, board_class, data):
+        perf_counter = time.perf_counter
+        latencies = []
+        results = []
+        game = ChessVar(board_class(), headless=True)
+        for position, moves in data:
+            game.set_position(position)
+            accepted = []
+            for number, (move_from, move_to) in enumerate(moves):
+                start = perf_counter()
+                made = game.make_move(move_from, move_to)
+                latencies.append(perf_counter() - start)
+                if made:
+                    game.pop()
+                    accepted.append(number)
+            results.append(tuple(accepted))
+        return len(latencies), latencies, results
+
+
+class AccessWorkload(Workload):
+    """Asks valid_movement of every piece of the player to move about every spot not held by its own side, in
+    middlegame positions. Each accepted candidate runs the all_pc_access king safety check. One op is one
+    valid_movement call"""
+    name = 'access'
+    description = 'valid_movement and all_pc_access on every spot of middlegame positions'
+
+    def prepare(self, rng, scale):
+        return random_positions(rng, 40 * scale, 10, 40)
+
+    def run(self, board_class, data):
+        perf_counter = time.perf_counter
+        latencies = []
+        results = []
+        game = ChessVar(board_class(), headless=True)
+        board = game.get_board()
+        for position in data:
+            game.set_position(position)
+            pieces = board.get_white_pcs() if game.get_to_move() == 'w' else board.get_black_pcs()
+            for piece in pieces:
+                if piece.get_current_pos() == '0':
+                    continue
+                valid = []
+                for spot in SQUARES:
+                    held = board.get_piece(spot)
+                    if held != '___' and held.get_color() == piece.get_color():
+                        continue
+                    start = perf_counter()
+                    accepted = piece.valid_movement(spot, board)
+                    latencies.append(perf_counter() - start)
+                    if accepted:
+                        valid.append(spot)
+                results.append((piece.get_current_pos(), tuple(valid)))
+        return len(latencies), latencies, results
+
+
+class PerftWorkload(Workload):
+    """Counts the legal move tree below each move of the starting position and of a few random positions. One op is
+    one leaf node, and each timed step is the count below one root move"""
+    name = 'perft'
+    description = 'perft leaf counts with push and pop'
+
+    def __init__(self, depth=3):
+        self._depth = depth
+
+    def prepare(self, rng, scale):
+        return [ChessVar(CompactBoard(), headless=True).get_position()] + random_positions(rng, scale, 4, 12)
+
+    def run(self, board_class, data):
+        perf_counter = time.perf_counter
+        latencies = []
+        results = []
+        game = ChessVar(board_class(), headless=True)
+        for position in data:
+            game.set_position(position)
+            for move in game.legal_moves():
+                start = perf_counter()
+                game.push(move)
+                nodes = perft(game, self._depth - 1)
+                game.pop()
+                latencies.append(perf_counter() - start)
+                results.append(nodes)
+        return sum(results), latencies, results
+
+
+class SearchWorkload(Workload):
+    """Runs a fixed depth alpha-beta search from random positions with a new Searcher per run. One op is one node
+    searched, and each timed step is one search. The moves and scores found also depend on the move order, so a
+    change of them is reported apart from legality changes and board classes may differ"""
+    name = 'search'
+    description = 'fixed depth alpha-beta engine searches'
+    legality = False
+
+    def __init__(self, depth=3):
+        self._depth = depth
+
+    def prepare(self, rng, scale):
+        return random_positions(rng, 6 * scale, 4, 20)
+
+    def run(self, board_class, data):
+        perf_counter = time.perf_counter
+        latencies = []
+        results = []
+        nodes = 0
+        searcher = Searcher(table_megabytes=4)
+        game = ChessVar(board_class(), headless=True)
+        for position in data:
+            game.set_position(position)
+            start = perf_counter()
+            move = searcher.search(game, max_depth=self._depth)
+            latencies.append(perf_counter() - start)
+            info = searcher.get_info()
+            nodes += info['nodes']
+            results.append((move, info['score']))
+        return nodes, latencies, results
+
+
+def get_workloads(perft_depth=3, search_depth=3):
+    """Returns a dictionary from name to Workload of every workload in the suite"""
+    workloads = [ReplayWorkload(), IllegalWorkload(), AccessWorkload(), PerftWorkload(perft_depth),
+                 SearchWorkload(search_depth)]
+    return {workload.name: workload for workload in workloads}
+
+
+def digest(results):
+    """Returns a short hex digest of a list of workload results"""
+    return hashlib.sha256(repr(results).encode()).hexdigest()[:16]
+
+
+def measure(workload, board_class, data, repeats=3, memory=True):
+    """Returns a dictionary of the results of running a workload repeats times on a board class: ops, the best
+    ops/second, the p50, p90, p99 and max latency in microseconds over every run, the peak memory in kilobytes
+    allocated during one more run under tracemalloc, the digest of the results and if they are legality results.
+    Raises ValueError if the runs do not agree on the results"""
+    best = None
+    latencies = []
+    result_digest = None
+    ops = 0
+    for _ in range(repeats):
+        # as timeit does, collect first and keep the cyclic collector out of the timing, so a collection started by
+        # an earlier workload's garbage is not charged to this one
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            ops, run_latencies, results = workload.run(board_class, data)
+            seconds = time.perf_counter() - start
+        finally:
+            gc.enable()
+        run_digest = digest(results)
+        if result_digest is not None and run_digest != result_digest:
+            raise ValueError('runs of ' + workload.name + ' disagree on the results')
+        result_digest = run_digest
+        latencies.extend(run_latencies)
+        if best is None or seconds < best:
+            best = seconds
+    latencies.sort()
+    peak_kb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            workload.run(board_class, data)
+            peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+    return {
+        'ops': ops,
+        'seconds': best,
+        'ops_per_second': ops / best if best > 0 else 0.0,
+        'p50_us': 1e6 * percentile(latencies, 0.50),
+        'p90_us': 1e6 * percentile(latencies, 0.90),
+        'p99_us': 1e6 * percentile(latencies, 0.99),
+        'max_us': 1e6 * latencies[-1] if latencies else 0.0,
+        'peak_kb': peak_kb,
+        'digest': result_digest,
+        'legality': workload.legality,
+    }
+
+
+def run_suite(names=None, boards=None, seed=0, scale=1, repeats=3, memory=True, perft_depth=3, search_depth=3,
+              progress=None):
+    """Runs the named workloads, or all of them, on the named board classes, or all of them, and returns the JSON
+    results: the settings, the Python version and machine, and a 'results' dictionary keyed 'workload/board'. If a
+    progress function is entered it is called with each key and result as they finish"""
+    workloads = get_workloads(perft_depth, search_depth)
+    names = list(workloads) if names is None else names
+    boards = list(BOARD_CLASSES) if boards is None else boards
+    for name in names:
+        if name not in workloads:
+            raise ValueError('unknown workload ' + str(name))
+    for board in boards:
+        if board not in BOARD_CLASSES:
+            raise ValueError('unknown board ' + str(board))
+    results = {}
+    for name in names:
+        workload = workloads[name]
+        # every workload gets its own generator so adding or leaving out one does not change the others' inputs
+        data = workload.prepare(random.Random(str(seed) + '-' + name), scale)
+        for board in boards:
+            key = name + '/' + board
+            results[key] = measure(workload, BOARD_CLASSES[board], data, repeats, memory)
+            if progress is not None:
+                progress(key, results[key])
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'seed': seed,
+        'scale': scale,
+        'repeats': repeats,
+        'perft_depth': perft_depth,
+        'search_depth': search_depth,
+        'results': results,
+    }
+
+
+def compare_boards(current):
+    """Returns a list of (key, 'mismatch', text) differences for every legality workload of a run_suite result
+    whose board classes did not all give the same results. The key is the workload name"""
+    digests = {}
+    for key, result in current['results'].items():
+        if result['legality']:
+            name, board = key.split('/')
+            digests.setdefault(name, {}).setdefault(result['digest'], []).append(board)
+    differences = []
+    for name, boards in digests.items():
+        if len(boards) > 1:
+            differences.append((name, 'mismatch', 'boards disagree: ' + '; '.join(
+                ', '.join(names) + ' ' + result_digest for result_digest, names in boards.items())))
+    return differences
+
+
+def compare(baseline, current, threshold=0.1):
+    """Returns a list of (key, kind, text) differences between two results of run_suite. kind is 'legality' if a
+    workload's rules results changed, 'changed' if the results of a workload that does not check legality changed,
+    'regression' if its ops/second fell by more than the threshold fraction and 'improvement' if it rose by more
+    than it. Raises ValueError if the results were made with different settings, so their workloads are not the
+    same"""
+    for setting in ('version', 'seed', 'scale', 'perft_depth', 'search_depth'):
+        if baseline.get(setting) != current.get(setting):
+            raise ValueError('results differ in ' + setting + ': ' + str(baseline.get(setting)) + ' and ' +
+                             str(current.get(setting)))
+    differences = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        if base['digest'] != result['digest']:
+            if result['legality']:
+                differences.append((key, 'legality', 'rules results changed: ' + base['digest'] + ' -> ' +
+                                    result['digest']))
+            else:
+                differences.append((key, 'changed', 'results changed: ' + base['digest'] + ' -> ' +
+                                    result['digest']))
+        if base['ops_per_second'] > 0:
+            change = result['ops_per_second'] / base['ops_per_second'] - 1
+            text = format(base['ops_per_second'], '.0f') + ' -> ' + format(result['ops_per_second'], '.0f') + \
+                ' ops/s (' + format(100 * change, '+.1f') + '%)'
+            if change < -threshold:
+                differences.append((key, 'regression', text))
+            elif change > threshold:
+                differences.append((key, 'improvement', text))
+    return differences
+
+
+def _print_result(key, result):
+    """Prints one line of a workload result"""
+    peak = '-' if result['peak_kb'] is None else str(result['peak_kb'])
+    print('{:<18} {:>9} {:>12.0f} {:>9.1f} {:>9.1f} {:>9.1f} {:>9} {}'.format(
+        key, result['ops'], result['ops_per_second'], result['p50_us'], result['p90_us'], result['p99_us'], peak,
+        result['digest']))
+
+
+def main(args=None):
+    """Command line entry point. Runs the suite, prints a line per workload and board, and saves and compares the
+    results if asked. Returns 1 if the boards disagreed on legality, or if a comparison found a regression or a
+    change of legality"""
+    workloads = get_workloads()
+    parser = argparse.ArgumentParser(description='Benchmarks the ChessVar rules engine on fixed-seed workloads.')
+    parser.add_argument('workloads', nargs='*', default=[],
+                        help='workloads to run, out of ' + ', '.join(workloads) + ' (default: all of them)')
+    parser.add_argument('--boards', nargs='+', choices=list(BOARD_CLASSES), default=None,
+                        help='board implementations to run on (default: all of them)')
+    parser.add_argument('--seed', type=int, default=0, help='seed the workloads are built from')
+    parser.add_argument('--scale', type=int, default=1, help='multiplies the size of every workload')
+    parser.add_argument('--repeats', type=int, default=3, help='timed runs of each workload; the fastest counts')
+    parser.add_argument('--perft-depth', type=int, default=3)
+    parser.add_argument('--search-depth', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run that finds peak memory')
+    parser.add_argument('--output', default=None, metavar='FILE', help='save the results as JSON')
+    parser.add_argument('--baseline', default=None, metavar='FILE', help='compare with results saved earlier')
+    parser.add_argument('--threshold', type=float, default=10.0, metavar='PERCENT',
+                        help='slowdown in percent counted as a regression (default: 10)')
+    options = parser.parse_args(args)
+    if options.scale < 1 or options.repeats < 1:
+        parser.error('scale and repeats must be at least 1')
+
+    baseline = None
+    if options.baseline is not None:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+    for name in options.workloads:
+        if name not in workloads:
+            parser.error('unknown workload ' + name)
+
+    print('{:<18} {:>9} {:>12} {:>9} {:>9} {:>9} {:>9} {}'.format(
+        'workload', 'ops', 'ops/s', 'p50 us', 'p90 us', 'p99 us', 'peak KB', 'digest'))
+    current = run_suite(options.workloads or None, options.boards, options.seed, options.scale, options.repeats,
+                        not options.no_memory, options.perft_depth, options.search_depth, _print_result)
+    if options.output is not None:
+        with open(options.output, 'w') as file:
+            json.dump(current, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+    differences = compare_boards(current)
+    if baseline is not None:
+        try:
+            differences += compare(baseline, current, options.threshold / 100)
+        except ValueError as error:
+            print('Can not compare with ' + options.baseline + ': ' + str(error))
+            return 1
+    if differences:
+        print()
+    failed = False
+    for key, kind, text in differences:
+        print('{:<18} {:<12} {}'.format(key, kind.upper(), text))
+        failed = failed or kind in ('mismatch', 'legality', 'regression')
+    if failed:
+        print('FAILED')
+    elif baseline is not None:
+        print('No regressions against ' + options.baseline)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
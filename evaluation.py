@@ -0,0 +1,160 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: An incremental evaluator for the ChessVar search. The king row and piece terms of search.evaluate are
+# kept as a running score from piece-square tables that every push and pop adjusts by the moved and captured pieces
+# alone, and the king race distances are cached with the part of the attack map each path search looked at, so a
+# path is only searched again when a spot it depended on has changed. A leaf is then scored without a board sweep
+
+from ChessVar import King, Rook, Bishop, Knight, KNIGHT_BITS, RAYS, SQUARE_INDEX, ROW_8
+from search import (WIN_SCORE, NO_PATH, PIECE_VALUES, ROW_VALUE, PATH_VALUE, RACE_VALUE, ALL_SPOTS, race_result,
+                    _spread, _occupied)
+
+# Number of (king spot, allowed spots) distances kept before the shared distance cache is emptied
+DISTANCE_CACHE_SIZE = 1 << 16
+
+
+def _mobility(index, piece_type):
+    """Returns the number of spots a piece of the inputted class reaches from the spot numbered index on an empty
+    board"""
+    if piece_type is Knight:
+        return bin(KNIGHT_BITS[index]).count('1')
+    if piece_type is Bishop:
+        return sum(bin(RAYS[step][index]).count('1') for step in ((1, 1), (-1, 1), (1, -1), (-1, -1)))
+    return 0
+
+
+def piece_square_tables(activity=True):
+    """Returns a dictionary from piece class to a list of 64 scores, one per spot, for a piece of that class. A king
+    is worth ROW_VALUE for each row it has climbed and the other pieces their PIECE_VALUES. With activity, knights
+    and bishops also gain a point for each spot they would reach from the spot on an empty board, so central pieces
+    score higher. Without it, the tables give exactly the row and piece terms of search.evaluate"""
+    tables = {King: [ROW_VALUE * (index // 8) for index in range(64)]}
+    for piece_type in (Rook, Bishop, Knight):
+        value = PIECE_VALUES[piece_type.__name__]
+        tables[piece_type] = [value + (_mobility(index, piece_type) if activity else 0) for index in range(64)]
+    return tables
+
+
+PIECE_SQUARE_TABLES = piece_square_tables()
+
+
+def king_path(king_bit, allowed):
+    """Returns (distance, inspected): the fewest king moves from the spot in king_bit to row 8 over the allowed spots
+    as search.king_distance finds it, and the bitboard of every spot the search looked at. The same distance comes
+    out for any other allowed bitboard that agrees with this one on the inspected spots"""
+    reached = king_bit
+    distance = 0
+    while not reached & ROW_8:
+        grown = _spread(reached) & allowed | reached
+        if grown == reached or distance == NO_PATH:
+            return NO_PATH, _spread(reached)
+        reached = grown
+        distance += 1
+    return distance, _spread(reached)
+
+
+class Evaluator:
+    """Keeps the static score of a ChessVar game up to date as moves are pushed and popped through it. Moves must be
+    played with the evaluator's push and pop, not the game's, while it is in use; after the game is changed in any
+    other way call reset. It is fastest on a BitBoard, which keeps the occupied and attacked spots of each color up
+    to date itself"""
+    def __init__(self, game, tables=None):
+        self._game = game
+        self._tables = PIECE_SQUARE_TABLES if tables is None else tables
+        self._distances = {}
+        self._paths = {}
+        self._stack = []
+        self._score = 0
+        self._hits = 0
+        self._searches = 0
+        # a BitBoard keeps the occupied bitboard of each color, other boards have it built from the piece lists
+        board = game.get_board()
+        if hasattr(board, 'get_occupied'):
+            self._occupied = board.get_occupied
+        else:
+            self._occupied = lambda color: _occupied(board, color)
+        self.reset()
+
+    def get_game(self):
+        """Returns the game being evaluated"""
+        return self._game
+
+    def get_material_score(self):
+        """Returns the running piece-square score from white's point of view"""
+        return self._score
+
+    def get_cache_stats(self):
+        """Returns a dictionary with the number of king distances found by a path search and found in a cache"""
+        return {'searches': self._searches, 'hits': self._hits}
+
+    def reset(self):
+        """Works out the piece-square score of the game's position from scratch and forgets the moves pushed"""
+        score = 0
+        board = self._game.get_board()
+        for pc_list, sign in ((board.get_white_pcs(), 1), (board.get_black_pcs(), -1)):
+            for piece in pc_list:
+                if piece.get_current_pos() != '0':
+                    score += sign * self._tables[type(piece)][SQUARE_INDEX[piece.get_current_pos()]]
+        self._score = score
+        self._stack = []
+
+    def push(self, move):
+        """Plays a (move_from, move_to) move on the game with push, changing the score by the moved piece's change of
+        spot and any captured piece"""
+        move_from, move_to = move
+        board = self._game.get_board()
+        piece = board.get_piece(move_from)
+        captured = board.get_piece(move_to)
+        table = self._tables[type(piece)]
+        change = table[SQUARE_INDEX[move_to]] - table[SQUARE_INDEX[move_from]]
+        if captured != '___':
+            change += self._tables[type(captured)][SQUARE_INDEX[move_to]]
+        self._stack.append(self._score)
+        self._score += change if piece.get_color() == 'w' else -change
+        self._game.push(move)
+
+    def pop(self):
+        """Takes back the last move pushed through the evaluator and its score change. Returns the move"""
+        self._score = self._stack.pop()
+        return self._game.pop()
+
+    def king_distance(self, color):
+        """Returns search.king_distance for the king of the inputted color. The last path searched for each color is
+        reused while the king has not moved and no spot the search looked at has changed between allowed and not
+        allowed; other results are kept in a cache shared by the positions met"""
+        board = self._game.get_board()
+        king = board.get_white_pcs()[1] if color == 'w' else board.get_black_pcs()[1]
+        king_bit = 1 << SQUARE_INDEX[king.get_current_pos()]
+        allowed = ALL_SPOTS & ~self._occupied(color) & ~board.get_king_danger(color)
+        path = self._paths.get(color)
+        if path is not None and path[0] == king_bit and allowed & path[1] == path[2]:
+            self._hits += 1
+            return path[3]
+        key = (king_bit, allowed)
+        found = self._distances.get(key)
+        if found is None:
+            self._searches += 1
+            found = king_path(king_bit, allowed)
+            if len(self._distances) >= DISTANCE_CACHE_SIZE:
+                self._distances.clear()
+            self._distances[key] = found
+        else:
+            self._hits += 1
+        distance, inspected = found
+        self._paths[color] = (king_bit, inspected, allowed & inspected, distance)
+        return distance
+
+    def evaluate(self):
+        """Returns the score of the game's position from the point of view of the player whose turn it is, as
+        search.evaluate scores it with the piece-square tables in place of the row and piece terms"""
+        game = self._game
+        black_distance = self.king_distance('b')
+        if game.get_board().get_white_king_row() == 8:
+            # white has arrived and black is using its last move: only a black king one move from row 8 can tie
+            return 0 if black_distance <= 1 else -WIN_SCORE + 1
+        white_distance = self.king_distance('w')
+        to_move = game.get_to_move()
+        score = self._score + PATH_VALUE * (black_distance - white_distance)
+        score += RACE_VALUE * race_result(white_distance, black_distance, to_move)
+        return score if to_move == 'w' else -score
@@ -0,0 +1,184 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Opt-in call counting and timing for the move checking hot path of ChessVar. While enabled, the
+# piece_access, valid_movement, all_pc_access and make_move methods are replaced on their classes by wrappers that
+# count calls and add up wall time per piece type. Disabling puts the original methods back, so nothing is paid
+# when instrumentation is off. Includes a command line profiler that replays a file of moves
+
+import argparse
+import contextlib
+import json
+import time
+
+from ChessVar import ChessVar, Board, BitBoard, CompactBoard, King, Rook, Bishop, Knight, SQUARE_INDEX
+from records import read_records
+
+# The (class, method name) pairs that are wrapped. all_pc_access is wrapped on each board class that defines it
+PIECE_METHODS = [(piece_class, name) for piece_class in (King, Rook, Bishop, Knight)
+                 for name in ('piece_access', 'valid_movement')]
+BOARD_METHODS = [(Board, 'all_pc_access'), (BitBoard, 'all_pc_access'), (CompactBoard, 'all_pc_access')]
+GAME_METHODS = [(ChessVar, 'make_move')]
+
+_originals = {}
+_counters = {}
+
+
+def _piece_name(board, pos):
+    """Returns the class name of the piece at pos, or 'None' if there is no piece there"""
+    if pos not in SQUARE_INDEX:
+        return 'None'
+    piece = board.get_piece(pos)
+    return 'None' if piece == '___' else type(piece).__name__
+
+
+def _wrap(original, method_name, key_of):
+    """Returns a wrapper of original that counts its calls and adds up their wall time under
+    _counters[method_name][key_of(args)]"""
+    counters = _counters.setdefault(method_name, {})
+    perf_counter = time.perf_counter
+
+    def instrumented(*args, **kwargs):
+        key = key_of(args)
+        start = perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            entry = counters.get(key)
+            if entry is None:
+                counters[key] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+    instrumented.__wrapped__ = original
+    instrumented.__doc__ = original.__doc__
+    return instrumented
+
+
+def is_enabled():
+    """Returns True if the instrumented methods are in place"""
+    return bool(_originals)
+
+
+def enable():
+    """Replaces the hot path methods with instrumented ones. Counts carry on from where they were; use reset to
+    start again"""
+    if _originals:
+        return
+    for owner, name in PIECE_METHODS:
+        _originals[(owner, name)] = owner.__dict__[name]
+        setattr(owner, name, _wrap(owner.__dict__[name], name, lambda args: type(args[0]).__name__))
+    for owner, name in BOARD_METHODS:
+        if name in owner.__dict__:
+            _originals[(owner, name)] = owner.__dict__[name]
+            setattr(owner, name, _wrap(owner.__dict__[name], name, lambda args: _piece_name(args[0], args[1])))
+    for owner, name in GAME_METHODS:
+        _originals[(owner, name)] = owner.__dict__[name]
+        setattr(owner, name, _wrap(owner.__dict__[name], name,
+                                   lambda args: _piece_name(args[0].get_board(), args[1])))
+
+
+def disable():
+    """Puts the original methods back. The counts are kept until reset"""
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+def reset():
+    """Sets every count and time back to zero"""
+    for counters in _counters.values():
+        counters.clear()
+
+
+@contextlib.contextmanager
+def instrumented():
+    """Enables instrumentation for the body of a with statement and disables it afterwards"""
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def snapshot():
+    """Returns the counts as a dictionary from method name to piece type name to a dictionary of calls, total
+    seconds and mean microseconds per call. Times include the time spent in the other instrumented methods a
+    method calls. piece_access and valid_movement are keyed by the piece they belong to, all_pc_access and
+    make_move by the piece on the moving spot"""
+    result = {}
+    for method_name, counters in _counters.items():
+        result[method_name] = {}
+        for key, (calls, seconds) in sorted(counters.items()):
+            result[method_name][key] = {'calls': calls, 'seconds': seconds,
+                                        'mean_us': 1e6 * seconds / calls if calls else 0.0}
+    return result
+
+
+def snapshot_json(indent=2):
+    """Returns snapshot() as JSON text"""
+    return json.dumps(snapshot(), indent=indent, sort_keys=True)
+
+
+def read_moves(path):
+    """Returns the (move_from, move_to) moves of the first game in a game file, which is either a plain list of
+    moves written like a2a3 or a2-a3 or a file of records as read by records.read_records"""
+    with open(path) as game_file:
+        for record in read_records(game_file):
+            return record.get_moves()
+    return []
+
+
+def format_snapshot(counts):
+    """Returns a table of a snapshot, one line per method and piece type, slowest total first"""
+    rows = [(method_name, key, entry) for method_name, counters in counts.items()
+            for key, entry in counters.items()]
+    rows.sort(key=lambda row: row[2]['seconds'], reverse=True)
+    lines = ['{:<16} {:<8} {:>10} {:>12} {:>10}'.format('method', 'piece', 'calls', 'total ms', 'mean us')]
+    for method_name, key, entry in rows:
+        lines.append('{:<16} {:<8} {:>10} {:>12.2f} {:>10.2f}'.format(method_name, key, entry['calls'],
+                                                                      1000 * entry['seconds'], entry['mean_us']))
+    return '\n'.join(lines)
+
+
+def profile_game(moves, board_class=Board, generate=False, repeat=1):
+    """Replays the inputted moves repeat times, each in a new headless game on a board of board_class, with
+    instrumentation enabled from zero. Returns (snapshot, number of moves accepted). If generate is True,
+    legal_moves is also called before every move, as an engine would"""
+    reset()
+    accepted = 0
+    with instrumented():
+        for _ in range(repeat):
+            game = ChessVar(board_class(), headless=True)
+            for move_from, move_to in moves:
+                if generate:
+                    game.legal_moves()
+                if game.make_move(move_from, move_to):
+                    accepted += 1
+    return snapshot(), accepted
+
+
+def main(args=None):
+    """Command line entry point that replays a game file and prints where the time went"""
+    parser = argparse.ArgumentParser(description='Replays a ChessVar game file with call counting and timing.')
+    parser.add_argument('game_file', help='file of moves written like a2a3')
+    parser.add_argument('--board', choices=('board', 'bitboard', 'compact'), default='board')
+    parser.add_argument('--generate', action='store_true', help='also generate the legal moves before each move')
+    parser.add_argument('--repeat', type=int, default=1, help='replay the game this many times')
+    parser.add_argument('--json', action='store_true', help='print the snapshot as JSON')
+    options = parser.parse_args(args)
+
+    moves = read_moves(options.game_file)
+    board_class = {'board': Board, 'bitboard': BitBoard, 'compact': CompactBoard}[options.board]
+    counts, accepted = profile_game(moves, board_class, options.generate, options.repeat)
+    if options.json:
+        print(json.dumps(counts, indent=2, sort_keys=True))
+    else:
+        print(str(accepted) + ' of ' + str(len(moves) * options.repeat) + ' moves accepted')
+        print(format_snapshot(counts))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: A client for the JSON-lines protocol of server.py and a load generator that plays thousands of games
+# on the server at once, measuring how long each move request takes to be answered. The results give the p50 and
+# p99 move latency for each number of concurrent games
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+from server import LINE_LIMIT
+from stats import percentile
+
+
+class RequestFailed(Exception):
+    """The server turned down a request. The message is the error the server sent back"""
+
+
+class GameClient:
+    """One connection to a GameServer. Requests can be sent from many tasks at once; each reply is matched to its
+    request by id. Events are passed to on_event if one is entered, or else only counted"""
+    def __init__(self, reader, writer, on_event=None):
+        self._reader = reader
+        self._writer = writer
+        self._on_event = on_event
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._event_count = 0
+        self._read_task = asyncio.ensure_future(self._read_replies())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765, path=None, on_event=None):
+        """Returns a client connected to the server at the Unix socket path, or else at the TCP host and port"""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer, on_event)
+
+    def get_event_count(self):
+        """Returns the number of events received"""
+        return self._event_count
+
+    async def request(self, op, **fields):
+        """Sends one request and returns the server's reply. Raises RequestFailed if the server turns it down"""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        fields['op'] = op
+        fields['id'] = request_id
+        self._writer.write(json.dumps(fields, separators=(',', ':')).encode() + b'\n')
+        reply = await future
+        if not reply['ok']:
+            raise RequestFailed(reply['error'])
+        return reply
+
+    async def _read_replies(self):
+        """Reads every line the server sends, finishing the matching request or passing on the event"""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if 'event' in message:
+                    self._event_count += 1
+                    if self._on_event is not None:
+                        self._on_event(message)
+                    continue
+                future = self._pending.pop(message.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('connection to the server closed'))
+
+    async def close(self):
+        """Closes the connection"""
+        self._writer.close()
+        await self._read_task
+
+
+async def _play(client, game_id, moves, rng, latencies):
+    """Plays up to the inputted number of random legal moves in one game, recording how long each move took"""
+    for _ in range(moves):
+        legal = (await client.request('legal_moves', game=game_id))['moves']
+        if not legal:
+            break
+        move = rng.choice(legal)
+        start = time.perf_counter()
+        reply = await client.request('move', game=game_id, **{'from': move[:2], 'to': move[2:]})
+        latencies.append(time.perf_counter() - start)
+        if reply['game_state'] != 'UNFINISHED':
+            break
+
+
+async def run_load(games, moves=5, connections=50, host='127.0.0.1', port=8765, path=None, seed=0):
+    """Creates the inputted number of games on the server, spread over a number of connections that hold both
+    seats of their games, and plays moves in all of them at once. Returns a dictionary with the number of games
+    and moves, the seconds taken, moves/second, and the mean, p50 and p99 move latency in milliseconds"""
+    rng = random.Random(seed)
+    clients = [await GameClient.connect(host, port, path) for _ in range(connections)]
+    try:
+        created = await asyncio.gather(*(clients[number % connections].request('create')
+                                         for number in range(games)))
+        game_ids = [reply['game'] for reply in created]
+        await asyncio.gather(*(clients[number % connections].request('join', game=game_id)
+                               for number, game_id in enumerate(game_ids)))
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(_play(clients[number % connections], game_id, moves,
+                                     random.Random(rng.getrandbits(32)), latencies)
+                               for number, game_id in enumerate(game_ids)))
+        seconds = time.perf_counter() - start
+        await asyncio.gather(*(clients[number % connections].request('close', game=game_id)
+                               for number, game_id in enumerate(game_ids)))
+    finally:
+        for client in clients:
+            await client.close()
+    latencies.sort()
+    return {
+        'games': games,
+        'moves': len(latencies),
+        'seconds': seconds,
+        'moves_per_second': int(len(latencies) / seconds) if seconds > 0 else 0,
+        'mean_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+        'p50_ms': 1000 * percentile(latencies, 0.50),
+        'p99_ms': 1000 * percentile(latencies, 0.99),
+    }
+
+
+async def _spawn_server(port, path):
+    """Starts server.py in a child process and waits until it accepts connections"""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')]
+    command += ['--unix', path] if path is not None else ['--port', str(port)]
+    process = await asyncio.create_subprocess_exec(*command)
+    for _ in range(100):
+        try:
+            client = await GameClient.connect(port=port, path=path)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        await client.close()
+        return process
+    process.kill()
+    raise RuntimeError('the server did not start')
+
+
+async def _main(options):
+    """Runs every load level and prints a line of results for each"""
+    process = await _spawn_server(options.port, options.unix) if options.spawn else None
+    try:
+        print('games   moves  moves/s   mean ms   p50 ms   p99 ms')
+        for games in options.levels:
+            result = await run_load(games, options.moves, options.connections, options.host, options.port,
+                                    options.unix, options.seed)
+            print('{games:>5} {moves:>7} {moves_per_second:>8} {mean_ms:>9.2f} {p50_ms:>8.2f} '
+                  '{p99_ms:>8.2f}'.format(**result))
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+
+
+def main(args=None):
+    """Command line entry point for the load generator"""
+    parser = argparse.ArgumentParser(description='Measures move latency of server.py under many concurrent games.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='connect to this Unix socket path instead of TCP')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1000, 5000, 10000],
+                        help='numbers of concurrent games to measure')
+    parser.add_argument('--moves', type=int, default=5, help='moves played in each game')
+    parser.add_argument('--connections', type=int, default=50, help='client connections the games share')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--spawn', action='store_true', help='start a server in a child process first')
+    options = parser.parse_args(args)
+    asyncio.run(_main(options))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
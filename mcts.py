@@ -0,0 +1,326 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: A Monte Carlo Tree Search player for ChessVar. The tree is grown with UCT selection and every new
+# leaf is scored by random playouts made with push and pop on a headless BitBoard game, so no board is printed and
+# no move text is checked. Playouts are run in batches, which can be spread over worker processes, and the tree is
+# kept between moves by moving its root down to the position actually reached
+
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, BitBoard
+from movegen import random_legal_move
+
+# Playout results from white's point of view
+WHITE_WIN = 1.0
+DRAW = 0.5
+BLACK_WIN = 0.0
+RESULTS = {'WHITE_WON': WHITE_WIN, 'BLACK_WON': BLACK_WIN, 'TIE': DRAW, 'UNFINISHED': DRAW}
+
+
+def _new_game(position=None):
+    """Returns a headless ChessVar game on a BitBoard, put into the inputted position if there is one"""
+    game = ChessVar(BitBoard(), headless=True)
+    if position is not None:
+        game.set_position(position)
+    return game
+
+
+def playout(game, rng, max_plies=200, forward_bias=0.5):
+    """Plays moves from the current position of the inputted game until it is over, a player has no legal move or
+    max_plies moves have been played, then takes them all back. A king move onto row 8 is always played; otherwise,
+    with probability forward_bias, a random king move up the board, and if not a random legal move. Returns the
+    result from white's point of view: 1 for a white win, 0 for a black win and 0.5 otherwise"""
+    board = game.get_board()
+    plies = 0
+    while plies < max_plies and game.get_game_state() == 'UNFINISHED':
+        color = game.get_to_move()
+        king = board.get_white_pcs()[1] if color == 'w' else board.get_black_pcs()[1]
+        king_pos = king.get_current_pos()
+        captures, others = board.generate_candidate_moves(color)
+        candidates = captures + others
+        # only the few king moves up the board are checked up front; a random move is checked when it is drawn
+        forward = [move for move in candidates if move[0] == king_pos and move[1][1] > king_pos[1]
+                   and board.is_king_safe(move[0], move[1], color)]
+        arriving = [move for move in forward if move[1][1] == '8']
+        if arriving:
+            move = arriving[0]
+        elif forward and rng.random() < forward_bias:
+            move = forward[rng.randrange(len(forward))]
+        else:
+            move = random_legal_move(game, rng, candidates)
+            if move is None:
+                break
+        game.push(move)
+        plies += 1
+    result = RESULTS[game.get_game_state()]
+    for _ in range(plies):
+        game.pop()
+    return result
+
+
+def _playout_task(position, seed, count, max_plies, forward_bias):
+    """Worker task: returns the summed results of count playouts from the inputted position"""
+    game = _new_game(position)
+    rng = random.Random(seed)
+    return sum(playout(game, rng, max_plies, forward_bias) for _ in range(count))
+
+
+class _Node:
+    """A position in the search tree. Rewards are summed from the point of view of the player who made the move
+    leading here, so a parent picks the child with the best reward for itself"""
+    def __init__(self, move, parent, mover, moves, key):
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        self.untried = moves
+        self.children = []
+        self.visits = 0
+        self.reward = 0.0
+        self.key = key
+
+
+class MCTSPlayer:
+    """Picks moves with UCT Monte Carlo Tree Search. exploration is the UCT constant that trades trying less visited
+    moves against playing the best ones found so far. Each batch selects batch_size leaves, with a virtual loss on
+    the paths already chosen so the batch spreads over the tree, then scores them all with playouts_per_leaf
+    playouts each. With workers above 1 the playouts of a batch run in a process pool. forward_bias is passed on
+    to playout"""
+    def __init__(self, exploration=1.4, batch_size=8, playouts_per_leaf=1, workers=None, max_plies=200,
+                 forward_bias=0.5, seed=None):
+        self._exploration = exploration
+        self._forward_bias = forward_bias
+        self._batch_size = batch_size
+        self._playouts_per_leaf = playouts_per_leaf
+        self._workers = workers
+        self._max_plies = max_plies
+        self._rng = random.Random(seed)
+        self._pool = None
+        self._root = None
+        self._info = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes, if any were started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def get_info(self):
+        """Returns a dictionary describing the last search: move, iterations, playouts, seconds, playouts/second,
+        the number of root visits kept from earlier searches, and (move, visits, average reward) for every root
+        move, most visited first"""
+        return self._info
+
+    def get_root_visits(self):
+        """Returns how many playouts the current root of the tree has been scored with"""
+        return 0 if self._root is None else self._root.visits
+
+    def reset(self):
+        """Throws away the tree"""
+        self._root = None
+
+    def advance(self, move):
+        """Moves the root of the tree down to the child reached by the inputted move, keeping everything searched
+        below it. Call this for every move played in the game, the player's own and the opponent's"""
+        if self._root is None:
+            return
+        for child in self._root.children:
+            if child.move == move:
+                child.parent = None
+                self._root = child
+                return
+        self._root = None
+
+    def search(self, game, time_limit=None, iterations=None):
+        """Returns the (move_from, move_to) move with the most visits for the player whose turn it is in the
+        inputted game, or None if there is no legal move. Searches until time_limit seconds have passed or the
+        inputted number of playouts have been made (1000 if neither is entered), so more time gives a stronger
+        move. The inputted game is not changed"""
+        if time_limit is None and iterations is None:
+            iterations = 1000
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit is not None else None
+        position = game.get_position()
+        work = _new_game(position)
+        key = work.get_zobrist_key()
+        if self._root is None or self._root.key != key:
+            self._root = _Node(None, None, None, work.legal_moves(), key)
+        root = self._root
+        reused = root.visits
+
+        playouts = 0
+        rounds = 0
+        while root.untried or root.children:
+            if iterations is not None and playouts >= iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            leaves = [self._select(work) for _ in range(self._batch_size)]
+            results = self._score(work, leaves, position)
+            for (node, leaf_position), result in zip(leaves, results):
+                self._backup(node, result)
+            playouts += len(leaves) * self._playouts_per_leaf
+            rounds += 1
+
+        seconds = time.perf_counter() - start
+        ranked = sorted(root.children, key=lambda child: child.visits, reverse=True)
+        self._info = {
+            'move': ranked[0].move if ranked else None,
+            'iterations': rounds * self._batch_size,
+            'playouts': playouts,
+            'seconds': seconds,
+            'playouts_per_second': int(playouts / seconds) if seconds > 0 else 0,
+            'reused_visits': reused,
+            'moves': [(child.move, child.visits, child.reward / child.visits if child.visits else 0.0)
+                      for child in ranked],
+        }
+        return self._info['move']
+
+    def _select(self, game):
+        """Walks from the root to a leaf with UCT, expanding one untried move, and returns (leaf, position) where
+        position is what the leaf's playouts start from. Every node on the path gets a visit straight away, a
+        virtual loss that steers the rest of the batch elsewhere until the result is backed up"""
+        node = self._root
+        node.visits += 1
+        depth = 0
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best_child, best_value = None, None
+            for child in node.children:
+                if child.visits == 0:
+                    value = math.inf
+                else:
+                    value = child.reward / child.visits \
+                        + self._exploration * math.sqrt(log_visits / child.visits)
+                if best_value is None or value > best_value:
+                    best_child, best_value = child, value
+            node = best_child
+            game.push(node.move)
+            depth += 1
+            node.visits += 1
+        if node.untried:
+            move = node.untried.pop(self._rng.randrange(len(node.untried)))
+            mover = game.get_to_move()
+            game.push(move)
+            depth += 1
+            child = _Node(move, node, mover, game.legal_moves(), game.get_zobrist_key())
+            node.children.append(child)
+            node = child
+            node.visits += 1
+        position = game.get_position()
+        for _ in range(depth):
+            game.pop()
+        return node, position
+
+    def _score(self, game, leaves, root_position):
+        """Returns the summed white point of view playout results of each (leaf, position) pair. Leaves where the
+        game is over are scored from the final result without playing out. The game is left in root_position"""
+        results = [None] * len(leaves)
+        pending = []
+        for number, (node, position) in enumerate(leaves):
+            if position[3] != 'UNFINISHED' or not node.untried and not node.children:
+                results[number] = RESULTS[position[3]] * self._playouts_per_leaf
+            else:
+                pending.append(number)
+        if self._workers is not None and self._workers > 1 and len(pending) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self._workers)
+            seeds = [self._rng.getrandbits(32) for _ in pending]
+            scored = self._pool.map(_playout_task, [leaves[number][1] for number in pending], seeds,
+                                    [self._playouts_per_leaf] * len(pending), [self._max_plies] * len(pending),
+                                    [self._forward_bias] * len(pending))
+            for number, result in zip(pending, scored):
+                results[number] = result
+        else:
+            for number in pending:
+                game.set_position(leaves[number][1])
+                results[number] = sum(playout(game, self._rng, self._max_plies, self._forward_bias)
+                                      for _ in range(self._playouts_per_leaf))
+            if pending:
+                game.set_position(root_position)
+        return results
+
+    def _backup(self, node, result):
+        """Adds a summed white point of view playout result to every node from the inputted leaf up to the root. The
+        visits were already counted by _select"""
+        count = self._playouts_per_leaf
+        while node is not None:
+            if node.mover == 'w':
+                node.reward += result
+            elif node.mover == 'b':
+                node.reward += count - result
+            # each extra playout of a leaf is one more visit on top of the one _select counted
+            node.visits += count - 1
+            node = node.parent
+
+
+def play_match(games=2, time_limit=0.5, depth=2, seed=0, workers=None, max_plies=300):
+    """Plays MCTS against the alpha-beta searcher, changing colors every game. Returns the count of MCTS wins,
+    losses and other results"""
+    from search import Searcher
+    score = {'wins': 0, 'losses': 0, 'other': 0}
+    for number in range(games):
+        mcts_color = 'w' if number % 2 == 0 else 'b'
+        game = _new_game()
+        searcher = Searcher()
+        with MCTSPlayer(seed=seed + number, workers=workers) as player:
+            plies = 0
+            while game.get_game_state() == 'UNFINISHED' and game.legal_moves() and plies < max_plies:
+                if game.get_to_move() == mcts_color:
+                    move = player.search(game, time_limit)
+                else:
+                    move = searcher.search(game, max_depth=depth)
+                game.push(move)
+                player.advance(move)
+                plies += 1
+        state = game.get_game_state()
+        if state == ('WHITE_WON' if mcts_color == 'w' else 'BLACK_WON'):
+            score['wins'] += 1
+        elif state in ('WHITE_WON', 'BLACK_WON'):
+            score['losses'] += 1
+        else:
+            score['other'] += 1
+    return score
+
+
+def main(args=None):
+    """Command line entry point to find an MCTS move for a position or play MCTS against the alpha-beta engine"""
+    parser = argparse.ArgumentParser(description='Monte Carlo Tree Search for ChessVar.')
+    parser.add_argument('--time', type=float, default=1.0, help='seconds per move')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes for playouts')
+    parser.add_argument('--moves', nargs='*', default=[], help='moves to play first, written like a2a5')
+    parser.add_argument('--match', type=int, default=0, help='play this many games against alpha-beta instead')
+    parser.add_argument('--depth', type=int, default=2, help='alpha-beta depth in a match')
+    options = parser.parse_args(args)
+
+    if options.match:
+        score = play_match(options.match, options.time, options.depth, workers=options.workers)
+        for name, count in score.items():
+            print(name + ': ' + str(count))
+        return 0
+    game = _new_game()
+    for move in options.moves:
+        if not game.make_move(move[:2], move[2:]):
+            parser.error('illegal move ' + move)
+    with MCTSPlayer(workers=options.workers) as player:
+        move = player.search(game, options.time)
+        info = player.get_info()
+    print('Best move: ' + (move[0] + move[1] if move else 'none'))
+    print('playouts: ' + str(info['playouts']) + ' (' + str(info['playouts_per_second']) + '/s)')
+    for candidate, visits, reward in info['moves'][:5]:
+        print(candidate[0] + candidate[1] + ': ' + str(visits) + ' visits, ' + format(reward, '.3f'))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
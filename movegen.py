@@ -0,0 +1,92 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Lazy move generation for ChessVar engines. A search usually stops after the first good move of a
+# position, so instead of building and checking the whole legal move list up front, staged_moves yields moves one
+# at a time in stages: the transposition table move, captures, killer moves, king moves toward the goal row and then
+# the quiet moves. Candidates come from the board's movement rules alone, and the king safety tests that make up
+# all_pc_access are only run on a move when it is about to be yielded
+
+def staged_moves(game, table_move=None, killers=(), history=None, capture_values=None):
+    """Yields every legal (move_from, move_to) move of the player to move in the inputted game once, in stages:
+    table_move if it is legal, captures (of the most valuable pieces first if a dictionary from piece class name to
+    value is entered), the entered killer moves that are legal quiet moves here, king moves up the board (furthest
+    first) and then the other moves by their score in the history dictionary, king moves down the board last. Each
+    stage is only built when the one before it is used up. Between moves the game must be back in the position the
+    generator was made for, as it is after push and pop"""
+    if game.get_game_state() != 'UNFINISHED':
+        return
+    board = game.get_board()
+    color = game.get_to_move()
+    if table_move is not None and game.get_illegal_reason(table_move[0], table_move[1]) is None:
+        yield table_move
+
+    captures, others = board.generate_candidate_moves(color)
+    # moves played and taken back by the caller throw the pins away, so the ones of this position are put back
+    pins = board.get_pins()
+    restore_pins = board.restore_pins
+    is_king_safe = board.is_king_safe
+
+    if capture_values is not None and len(captures) > 1:
+        captures.sort(key=lambda move: capture_values[type(board.get_piece(move[1])).__name__], reverse=True)
+    for move in captures:
+        if move != table_move:
+            restore_pins(pins)
+            if is_king_safe(move[0], move[1], color):
+                yield move
+
+    tried = [table_move]
+    for killer in killers:
+        if killer is not None and killer not in tried and killer in others:
+            tried.append(killer)
+            restore_pins(pins)
+            if is_king_safe(killer[0], killer[1], color):
+                yield killer
+
+    geometry = board.get_geometry()
+    square_index = geometry.square_index
+    width = geometry.width
+    king_from = geometry.squares[pins[4][color]]
+    king_row = pins[4][color] // width
+    advances = []
+    quiet = []
+    for move in others:
+        if move in tried:
+            continue
+        order = history.get(move, 0) if history else 0
+        if move[0] == king_from:
+            rows = square_index[move[1]] // width - king_row
+            if rows > 0:
+                advances.append((order + 100000 * rows, move))
+                continue
+            order += 100000 * rows
+        quiet.append((order, move))
+    for stage in (advances, quiet):
+        stage.sort(key=lambda pair: pair[0], reverse=True)
+        for order, move in stage:
+            restore_pins(pins)
+            if is_king_safe(move[0], move[1], color):
+                yield move
+
+
+def random_legal_move(game, rng, candidates=None):
+    """Returns a legal move of the player to move in the inputted game picked uniformly at random with the inputted
+    random.Random, or None if there is none. Candidates are drawn at random and only the one drawn is checked, so
+    the whole legal move list is never built. A list of candidates from the board's generate_candidate_moves can be
+    entered; it is used up"""
+    if game.get_game_state() != 'UNFINISHED':
+        return None
+    board = game.get_board()
+    color = game.get_to_move()
+    if candidates is None:
+        captures, others = board.generate_candidate_moves(color)
+        candidates = captures + others
+    while candidates:
+        number = rng.randrange(len(candidates))
+        move = candidates[number]
+        if board.is_king_safe(move[0], move[1], color):
+            return move
+        # drawing again from the rest keeps the pick uniform over the legal moves
+        candidates[number] = candidates[-1]
+        candidates.pop()
+    return None
@@ -0,0 +1,153 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Runs the ChessVar search engine on every core with a process pool. Root moves of one position can be
+# split between worker processes, and many independent self-play games can be played at once. Positions are sent
+# to the workers as the small tuples from ChessVar.get_position instead of pickled game objects
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, BitBoard
+from search import Searcher
+
+
+def _new_game(position=None):
+    """Returns a headless ChessVar game on a BitBoard, put into the inputted position if there is one"""
+    game = ChessVar(BitBoard(), headless=True)
+    if position is not None:
+        game.set_position(position)
+    return game
+
+
+def _search_root_moves(position, moves, time_limit, max_depth):
+    """Worker task: searches only the inputted root moves of a position. Returns the (depth, score, move) result of
+    every finished depth and the number of nodes searched"""
+    game = _new_game(position)
+    searcher = Searcher()
+    searcher.search(game, time_limit, max_depth, moves)
+    info = searcher.get_info()
+    return info['results'], info['nodes']
+
+
+def parallel_best_move(game, time_limit=None, max_depth=None, workers=None, executor=None):
+    """Returns the best move for the player whose turn it is in the inputted game, found by splitting the root moves
+    between worker processes. Each worker searches its share with iterative deepening, and the best move is taken
+    from the deepest depth every worker finished. Returns a (move, info) pair where info holds the depth, score,
+    total nodes and nodes/second"""
+    moves = game.legal_moves()
+    if not moves:
+        return None, {'depth': 0, 'score': 0, 'nodes': 0, 'seconds': 0, 'nps': 0}
+    workers = workers or os.cpu_count() or 1
+    shares = [moves[index::workers] for index in range(min(workers, len(moves)))]
+    position = game.get_position()
+
+    start = time.perf_counter()
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=len(shares)) as pool:
+            outcomes = list(pool.map(_search_root_moves, [position] * len(shares), shares,
+                                     [time_limit] * len(shares), [max_depth] * len(shares)))
+    else:
+        outcomes = list(executor.map(_search_root_moves, [position] * len(shares), shares,
+                                     [time_limit] * len(shares), [max_depth] * len(shares)))
+    seconds = time.perf_counter() - start
+
+    common_depth = min(results[-1][0] if results else 0 for results, nodes in outcomes)
+    best_move, best_score = moves[0], None
+    for results, nodes in outcomes:
+        for depth, score, move in results:
+            if depth == common_depth and (best_score is None or score > best_score):
+                best_move, best_score = move, score
+    total_nodes = sum(nodes for results, nodes in outcomes)
+    info = {
+        'depth': common_depth,
+        'score': best_score if best_score is not None else 0,
+        'nodes': total_nodes,
+        'seconds': seconds,
+        'nps': int(total_nodes / seconds) if seconds > 0 else 0,
+    }
+    return best_move, info
+
+
+def play_game(seed, time_limit=None, max_depth=2, random_plies=4, max_plies=300):
+    """Worker task: plays one engine against engine game. The first random_plies moves are picked at random from
+    the seed so games differ from each other. Returns the final game state and the number of moves played"""
+    rng = random.Random(seed)
+    game = _new_game()
+    searcher = Searcher()
+    plies = 0
+    while game.get_game_state() == 'UNFINISHED' and plies < max_plies:
+        moves = game.legal_moves()
+        if not moves:
+            break
+        if plies < random_plies:
+            move = rng.choice(moves)
+        else:
+            move = searcher.search(game, time_limit, max_depth)
+        game.push(move)
+        plies += 1
+    return game.get_game_state(), plies
+
+
+def self_play(games, workers=None, time_limit=None, max_depth=2, random_plies=4, seed=0):
+    """Plays the inputted number of independent self-play games spread over a process pool and returns a dictionary
+    with the count of each final game state, the list of game lengths and the average game length"""
+    counts = {'WHITE_WON': 0, 'BLACK_WON': 0, 'TIE': 0, 'UNFINISHED': 0}
+    lengths = []
+    seeds = [seed + number for number in range(games)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for state, plies in pool.map(play_game, seeds, [time_limit] * games, [max_depth] * games,
+                                     [random_plies] * games):
+            counts[state] += 1
+            lengths.append(plies)
+    return {
+        'results': counts,
+        'lengths': lengths,
+        'average_length': sum(lengths) / len(lengths) if lengths else 0,
+    }
+
+
+def main(args=None):
+    """Command line entry point for parallel analysis of a position or a batch of self-play games"""
+    shared = argparse.ArgumentParser(add_help=False)
+    shared.add_argument('--workers', type=int, default=None, help='number of worker processes (default: all cores)')
+    shared.add_argument('--time', type=float, default=None, help='seconds per search')
+    shared.add_argument('--depth', type=int, default=None, help='maximum search depth')
+    parser = argparse.ArgumentParser(description='Runs the ChessVar engine across a process pool.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    analyse = commands.add_parser('analyse', parents=[shared],
+                                  help='split the root moves of one position between workers')
+    analyse.add_argument('--moves', nargs='*', default=[], help='moves to play first, written like a2a5')
+    play = commands.add_parser('selfplay', parents=[shared], help='play many independent engine games at once')
+    play.add_argument('--games', type=int, default=16, help='number of games to play')
+    play.add_argument('--random-plies', type=int, default=4, help='random moves at the start of each game')
+    play.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    options = parser.parse_args(args)
+
+    if options.command == 'analyse':
+        game = _new_game()
+        for move in options.moves:
+            if not game.make_move(move[:2], move[2:]):
+                parser.error('illegal move ' + move)
+        depth = options.depth if options.depth is not None or options.time is not None else 4
+        move, info = parallel_best_move(game, options.time, depth, options.workers)
+        print('Best move: ' + (move[0] + move[1] if move else 'none'))
+        for name in ('depth', 'score', 'nodes', 'nps'):
+            print(name + ': ' + str(info[name]))
+    else:
+        depth = options.depth if options.depth is not None or options.time is not None else 2
+        start = time.perf_counter()
+        summary = self_play(options.games, options.workers, options.time, depth, options.random_plies,
+                            options.seed)
+        for state, count in summary['results'].items():
+            print(state + ': ' + str(count))
+        print('Average length: ' + format(summary['average_length'], '.1f') + ' moves')
+        print('Time: ' + format(time.perf_counter() - start, '.1f') + 's')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Perft (performance test) node counting for the ChessVar rules engine. Counts the leaf nodes of the
+# legal move tree to a fixed depth, both as a check that move generation is still correct and as a benchmark of
+# how fast it runs
+
+import argparse
+import re
+import time
+
+from ChessVar import ChessVar, Board, BitBoard, CompactBoard, Variant
+from transposition import TranspositionTable
+
+# Leaf node counts from the starting position of Board(). A change to any of these means the rules engine now
+# accepts a different set of moves
+PERFT_COUNTS = {
+    1: 21,
+    2: 441,
+    3: 11366,
+    4: 288315,
+    5: 8261293,
+}
+
+
+def split_move(text):
+    """Returns the (move_from, move_to) of a move written like a2a5, or like a10b12 on boards with more than 9 rows"""
+    match = re.fullmatch(r'([a-p][0-9]+)-?([a-p][0-9]+)', text)
+    if match is None:
+        return text[:2], text[2:]
+    return match.group(1), match.group(2)
+
+
+def perft(game, depth, table=None):
+    """Returns the number of leaf nodes depth moves ahead of the current position of the inputted ChessVar game.
+    The game is played forward with push and taken back with pop, so it is left as it was found. If a
+    TranspositionTable is entered, counts of positions reached by different move orders are only found once"""
+    if depth > 1 and table is not None:
+        entry = table.probe(game.get_zobrist_key())
+        if entry is not None and entry[1] == depth:
+            return entry[2]
+    moves = game.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        game.push(move)
+        nodes += perft(game, depth - 1, table)
+        game.pop()
+    if table is not None:
+        table.store(game.get_zobrist_key(), depth, nodes)
+    return nodes
+
+
+def divide(game, depth, table=None):
+    """Returns a list of (move, nodes) pairs giving the perft count below each legal move of the current position"""
+    results = []
+    for move in game.legal_moves():
+        game.push(move)
+        results.append((move, perft(game, depth - 1, table)))
+        game.pop()
+    return results
+
+
+def main(args=None):
+    """Command line entry point. Prints the divide breakdown of a position, the total node count and the number of
+    nodes searched per second"""
+    parser = argparse.ArgumentParser(description='Counts leaf nodes of the ChessVar legal move tree.')
+    parser.add_argument('depth', type=int, help='number of moves to look ahead')
+    parser.add_argument('--moves', nargs='*', default=[],
+                        help='moves to play from the starting position first, written like a2a5')
+    parser.add_argument('--board', choices=('bitboard', 'board', 'compact'), default='bitboard',
+                        help='board implementation to count with')
+    parser.add_argument('--hash', type=float, default=0, metavar='MB',
+                        help='size in megabytes of a transposition table to share counts between move orders')
+    parser.add_argument('--check', action='store_true',
+                        help='compare the total with the reference count for the starting position')
+    parser.add_argument('--size', default='8x8', metavar='WxH', help='width and height of the board, up to 16x16')
+    parser.add_argument('--setup', default=None,
+                        help='starting placement written like 8/8/8/8/8/8/RBN2nbr/KBN2nbk (default: the standard '
+                             'setup stretched to the board)')
+    parser.add_argument('--goal-row', type=int, default=None, help='row the kings race to (default: the top row)')
+    options = parser.parse_args(args)
+
+    try:
+        width, height = (int(number) for number in options.size.lower().split('x'))
+        variant = Variant(width, height, options.setup, options.goal_row)
+    except ValueError as error:
+        parser.error('bad variant: ' + str(error))
+    board = {'bitboard': BitBoard, 'board': Board, 'compact': CompactBoard}[options.board](variant)
+    game = ChessVar(board, headless=True)
+    for move in options.moves:
+        if not game.make_move(*split_move(move)):
+            parser.error('illegal move ' + move)
+
+    table = TranspositionTable(options.hash) if options.hash > 0 else None
+    start = time.perf_counter()
+    results = divide(game, options.depth, table) if options.depth > 0 else []
+    seconds = time.perf_counter() - start
+    total = sum(nodes for move, nodes in results) if options.depth > 0 else 1
+    for move, nodes in results:
+        print(move[0] + move[1] + ': ' + str(nodes))
+    print()
+    print('Nodes: ' + str(total))
+    print('Time: ' + format(seconds, '.3f') + 's')
+    if seconds > 0:
+        print('Nodes/second: ' + str(int(total / seconds)))
+
+    if options.check:
+        if options.moves or options.depth not in PERFT_COUNTS or not variant.is_default():
+            parser.error('reference counts only exist for depths 1 to 5 from the starting position')
+        if total != PERFT_COUNTS[options.depth]:
+            print('MISMATCH: expected ' + str(PERFT_COUNTS[options.depth]))
+            return 1
+        print('Matches reference count')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: An append-only file of ChessVar positions in the packed binary form of ChessVar.to_bytes. The file is
+# memory-mapped for reading, so any position can be read by its index without loading the whole file into memory
+
+import mmap
+import os
+
+from ChessVar import POSITION_BYTES
+
+MAGIC = b'RKPOS001'
+HEADER_BYTES = len(MAGIC)
+
+
+class PositionStore:
+    """A file of fixed-width position records. Positions are added to the end with append and read back by index
+    with get. Each record is POSITION_BYTES long and comes after an 8 byte header. A part record left at the end by
+    a write that was cut off is dropped when the store is opened"""
+    def __init__(self, path):
+        """Opens the store at the inputted path, creating the file if it does not exist yet"""
+        self._path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as new_file:
+                new_file.write(MAGIC)
+        self._file = open(path, 'r+b')
+        if self._file.read(HEADER_BYTES) != MAGIC:
+            self._file.close()
+            raise ValueError('not a position store: ' + path)
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        self._count = (size - HEADER_BYTES) // POSITION_BYTES
+        if size > self._end():
+            # a write that was cut off leaves part of a record at the end, which would shift every later record
+            self._file.truncate(self._end())
+        self._map = None
+        self._mapped_count = 0
+
+    def _end(self):
+        """Returns the file offset just past the last whole record"""
+        return HEADER_BYTES + self._count * POSITION_BYTES
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return self.get(index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self.get(index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, position):
+        """Adds a position to the end of the store and returns its index. The position can be a ChessVar game or
+        the bytes from ChessVar.to_bytes"""
+        data = position if isinstance(position, (bytes, bytearray)) else position.to_bytes()
+        if len(data) != POSITION_BYTES:
+            raise ValueError('a position record must be ' + str(POSITION_BYTES) + ' bytes')
+        self._file.seek(self._end())
+        self._file.write(data)
+        self._count += 1
+        return self._count - 1
+
+    def extend(self, positions):
+        """Adds many positions to the end of the store with a single write"""
+        records = []
+        for position in positions:
+            data = position if isinstance(position, (bytes, bytearray)) else position.to_bytes()
+            if len(data) != POSITION_BYTES:
+                raise ValueError('a position record must be ' + str(POSITION_BYTES) + ' bytes')
+            records.append(bytes(data))
+        self._file.seek(self._end())
+        self._file.write(b''.join(records))
+        self._count += len(records)
+
+    def get(self, index):
+        """Returns the bytes of the position stored at the inputted index. Negative indexes count from the end"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('position index out of range')
+        if index >= self._mapped_count:
+            self._remap()
+        start = HEADER_BYTES + index * POSITION_BYTES
+        return self._map[start:start + POSITION_BYTES]
+
+    def _remap(self):
+        """Maps the file again so positions appended since the last mapping can be read"""
+        self._file.flush()
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_count = self._count
+
+    def flush(self):
+        """Makes sure every appended position has been written to the file"""
+        self._file.flush()
+
+    def close(self):
+        """Closes the mapping and the file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -0,0 +1,344 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: A text format for recorded ChessVar games and a streaming validator for large archives of them. A
+# record is a block of [Name "value"] header lines followed by its moves written like a2a3, the spots make_move
+# takes. Records are read one at a time from the file and replayed on one reused headless game, and the result of
+# each game is yielded as soon as it is known, so archives of any size can be checked without loading them. The
+# work can be spread over a process pool
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, Board, BitBoard, CompactBoard
+
+# Board classes a worker process can be asked to replay on, by class name
+BOARD_CLASSES = {board_class.__name__: board_class for board_class in (Board, BitBoard, CompactBoard)}
+
+
+# A backslash and the quote or backslash after it inside a header value
+HEADER_ESCAPE = re.compile(r'\\(["\\])')
+
+
+class GameRecord:
+    """One recorded game: its headers in file order and its list of (move_from, move_to) moves. number counts the
+    records of a file from 0 and line is the line the record starts on. error describes the first line of the
+    record that could not be read, or is None"""
+    def __init__(self, number, headers, moves, line=0, error=None):
+        self._number = number
+        self._headers = headers
+        self._moves = moves
+        self._line = line
+        self._error = error
+
+    def get_number(self):
+        """Returns the position of the record in its file, counting from 0"""
+        return self._number
+
+    def get_headers(self):
+        """Returns the dictionary of header names to values"""
+        return self._headers
+
+    def get_moves(self):
+        """Returns the list of (move_from, move_to) moves"""
+        return self._moves
+
+    def get_line(self):
+        """Returns the line number the record starts on"""
+        return self._line
+
+    def get_error(self):
+        """Returns why a line of the record could not be read, or None"""
+        return self._error
+
+
+class GameResult:
+    """The outcome of replaying a GameRecord: the game state after the last move played, how many moves were
+    played, the index and IllegalMove reason of the first move make_move would have turned down, or None if
+    every move was accepted, and the error of a record that could not be read, which is not replayed"""
+    def __init__(self, number, headers, game_state, plies, illegal_index=None, illegal_reason=None, error=None):
+        self._number = number
+        self._headers = headers
+        self._game_state = game_state
+        self._plies = plies
+        self._illegal_index = illegal_index
+        self._illegal_reason = illegal_reason
+        self._error = error
+
+    def __repr__(self):
+        return 'GameResult' + repr(vars(self))
+
+    def get_number(self):
+        """Returns the position of the record in its file, counting from 0"""
+        return self._number
+
+    def get_headers(self):
+        """Returns the headers of the record"""
+        return self._headers
+
+    def get_game_state(self):
+        """Returns the game state after the moves that were played"""
+        return self._game_state
+
+    def get_plies(self):
+        """Returns the number of moves that were played"""
+        return self._plies
+
+    def get_illegal_index(self):
+        """Returns the index of the first move that was turned down, or None"""
+        return self._illegal_index
+
+    def get_illegal_reason(self):
+        """Returns why the first turned down move was not accepted, or None"""
+        return self._illegal_reason
+
+    def get_error(self):
+        """Returns why the record could not be read, or None"""
+        return self._error
+
+    def is_valid(self):
+        """Returns True if the record was read and every move of it was accepted"""
+        return self._illegal_index is None and self._error is None
+
+    def result_matches(self):
+        """Returns True if the record has no Result header or it equals the game state that was reached"""
+        return self._headers.get('Result', self._game_state) == self._game_state
+
+    def to_dict(self):
+        """Returns the result as a dictionary that can be written as JSON"""
+        return {'number': self._number, 'headers': self._headers, 'game_state': self._game_state,
+                'plies': self._plies, 'illegal_index': self._illegal_index, 'illegal_reason': self._illegal_reason,
+                'error': self._error}
+
+
+def _parse_header(line):
+    """Returns the (name, value) of a [Name "value"] header line, or raises ValueError"""
+    inside = line.strip()[1:-1].strip()
+    name, _, value = inside.partition(' ')
+    value = value.strip()
+    if not name or len(value) < 2 or value[0] != '"' or value[-1] != '"':
+        raise ValueError('bad header line: ' + line.strip())
+    return name, HEADER_ESCAPE.sub(r'\1', value[1:-1])
+
+
+def _strip_comment(line):
+    """Returns the line without the comment that starts at its first # outside a quoted header value"""
+    if '#' not in line:
+        return line
+    if '"' not in line:
+        return line.split('#')[0]
+    quoted = escaped = False
+    for index, char in enumerate(line):
+        if escaped:
+            escaped = False
+        elif char == '\\' and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char == '#' and not quoted:
+            return line[:index]
+    return line
+
+
+def read_records(lines):
+    """Yields a GameRecord for every record in an iterable of lines, such as an open file, reading only one record
+    at a time. A record ends at a blank line, or where headers begin after moves, so a record of headers with no
+    moves is kept as one. Text after a # outside a header value is ignored, and moves may also be written like
+    a2-a3. A header line that can not be read is given as the record's error rather than raised, so the rest of
+    the file is still read"""
+    number = 0
+    headers, moves, start, error = {}, [], None, None
+    for line_number, line in enumerate(lines, 1):
+        text = _strip_comment(line).strip()
+        if not text:
+            if moves or headers or error:
+                yield GameRecord(number, headers, moves, start, error)
+                number += 1
+                headers, moves, start, error = {}, [], None, None
+            continue
+        if text.startswith('['):
+            if moves:
+                yield GameRecord(number, headers, moves, start, error)
+                number += 1
+                headers, moves, start, error = {}, [], None, None
+            try:
+                name, value = _parse_header(text)
+                headers[name] = value
+            except ValueError as bad_line:
+                if error is None:
+                    error = 'line ' + str(line_number) + ': ' + str(bad_line)
+        else:
+            for word in text.split():
+                word = word.replace('-', '')
+                moves.append((word[:2], word[2:]))
+        if start is None:
+            start = line_number
+    if moves or headers or error:
+        yield GameRecord(number, headers, moves, start, error)
+
+
+def format_record(headers, moves):
+    """Returns the text of one record, ending with a blank line. Moves are written ten to a line"""
+    lines = ['[' + name + ' "' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"]'
+             for name, value in headers.items()]
+    words = [move_from + move_to for move_from, move_to in moves]
+    for start in range(0, len(words), 10):
+        lines.append(' '.join(words[start:start + 10]))
+    return '\n'.join(lines) + '\n\n'
+
+
+def write_record(stream, headers, moves):
+    """Writes one record to an open text stream"""
+    stream.write(format_record(headers, moves))
+
+
+class Replayer:
+    """Replays records on a single headless game that is put back to the starting position for every record, so
+    no board or pieces are made per game. Moves are checked with the same rules and order as make_move"""
+    def __init__(self, board_class=BitBoard):
+        self._game = ChessVar(board_class(), headless=True)
+        self._start = self._game.get_position()
+
+    def replay(self, record):
+        """Returns the GameResult of replaying the inputted GameRecord. A record with an error is not replayed"""
+        game = self._game
+        game.set_position(self._start)
+        if record.get_error() is not None:
+            return GameResult(record.get_number(), record.get_headers(), game.get_game_state(), 0,
+                              error=record.get_error())
+        for index, (move_from, move_to) in enumerate(record.get_moves()):
+            reason = game.get_illegal_reason(move_from, move_to)
+            if reason is not None:
+                return GameResult(record.get_number(), record.get_headers(), game.get_game_state(), index, index,
+                                  reason)
+            game.push((move_from, move_to))
+        return GameResult(record.get_number(), record.get_headers(), game.get_game_state(),
+                          len(record.get_moves()))
+
+
+def validate_records(records, board_class=BitBoard):
+    """Yields the GameResult of every GameRecord in an iterable, one at a time"""
+    replayer = Replayer(board_class)
+    for record in records:
+        yield replayer.replay(record)
+
+
+def _chunks(records, size):
+    """Yields lists of up to size records"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate_chunk(records, board_class_name):
+    """Worker task: returns the GameResults of a list of records"""
+    return list(validate_records(records, BOARD_CLASSES[board_class_name]))
+
+
+def validate_parallel(records, workers=None, chunk_size=500, board_class=BitBoard):
+    """Yields the GameResult of every record in an iterable in record order, replaying chunks of chunk_size records
+    in a process pool. Only a few chunks per worker are read ahead, so memory use does not grow with the size of
+    the archive"""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        ahead = 2 * workers
+        pending = []
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(_validate_chunk, chunk, board_class.__name__))
+            if len(pending) >= ahead:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def validate_file(path, workers=None, chunk_size=500, board_class=BitBoard):
+    """Yields the GameResult of every record in the file at path. With workers above 1 the records are replayed in
+    a process pool"""
+    with open(path) as record_file:
+        records = read_records(record_file)
+        if workers is not None and workers > 1:
+            yield from validate_parallel(records, workers, chunk_size, board_class)
+        else:
+            yield from validate_records(records, board_class)
+
+
+def random_games(count, seed=0, max_plies=200, illegal_rate=0.0):
+    """Yields (headers, moves) for count random games, for making test archives. With illegal_rate above 0, that
+    fraction of the games gets a random move that may be illegal put in at a random point"""
+    rng = random.Random(seed)
+    game = ChessVar(BitBoard(), headless=True)
+    start = game.get_position()
+    spots = [col + str(row) for row in range(1, 9) for col in 'abcdefgh']
+    for number in range(count):
+        game.set_position(start)
+        moves = []
+        while len(moves) < max_plies:
+            legal = game.legal_moves()
+            if not legal:
+                break
+            move = rng.choice(legal)
+            game.push(move)
+            moves.append(move)
+        headers = {'Game': str(number + 1), 'Result': game.get_game_state()}
+        if rng.random() < illegal_rate:
+            moves.insert(rng.randrange(len(moves) + 1), (rng.choice(spots), rng.choice(spots)))
+        yield headers, moves
+
+
+def main(args=None):
+    """Command line entry point to check an archive of records or make a random one"""
+    parser = argparse.ArgumentParser(description='Reads, checks and writes ChessVar game records.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    check = commands.add_parser('validate', help='replay every record of a file and report the results')
+    check.add_argument('path')
+    check.add_argument('--workers', type=int, default=None, help='worker processes (default: replay in process)')
+    check.add_argument('--chunk-size', type=int, default=500, help='records sent to a worker at a time')
+    check.add_argument('--json', action='store_true', help='print one JSON line per game')
+    make = commands.add_parser('generate', help='write a file of random games')
+    make.add_argument('path')
+    make.add_argument('--games', type=int, default=1000)
+    make.add_argument('--seed', type=int, default=0)
+    make.add_argument('--illegal-rate', type=float, default=0.0, help='fraction of games given a random move')
+    options = parser.parse_args(args)
+
+    if options.command == 'generate':
+        with open(options.path, 'w') as record_file:
+            for headers, moves in random_games(options.games, options.seed, illegal_rate=options.illegal_rate):
+                write_record(record_file, headers, moves)
+        return 0
+
+    counts = {'games': 0, 'invalid': 0, 'result_mismatch': 0}
+    states = {}
+    for result in validate_file(options.path, options.workers, options.chunk_size):
+        counts['games'] += 1
+        states[result.get_game_state()] = states.get(result.get_game_state(), 0) + 1
+        if not result.is_valid():
+            counts['invalid'] += 1
+        if result.get_error() is None and not result.result_matches():
+            counts['result_mismatch'] += 1
+        if options.json:
+            sys.stdout.write(json.dumps(result.to_dict()) + '\n')
+        elif result.get_error() is not None:
+            print('game ' + str(result.get_number()) + ': ' + result.get_error())
+        elif not result.is_valid():
+            print('game ' + str(result.get_number()) + ': move ' + str(result.get_illegal_index()) + ' '
+                  + result.get_illegal_reason())
+    if not options.json:
+        for name, count in list(counts.items()) + sorted(states.items()):
+            print(name + ': ' + str(count))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
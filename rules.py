@@ -0,0 +1,74 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: A pure function interface to the ChessVar rules that works on immutable Position snapshots instead of
+# games. Checking moves on a board writes into the pieces' access bits and the board's pin cache, so these functions
+# do the work on a scratch game owned by the calling thread and never touch a game or board another thread can see.
+# Positions can be shared between analysis threads, spectator views and caches without locks or copies
+
+import threading
+
+from ChessVar import ChessVar, CompactBoard, DEFAULT_VARIANT
+
+# Moves a scratch game keeps for pop before it is set up again from its current position
+UNDO_LIMIT = 256
+
+_local = threading.local()
+
+
+def _scratch(position):
+    """Returns the calling thread's scratch game for the Variant of the inputted Position, put into that position.
+    The game is only set up again if it holds a different position, so a run of calls on one position, or apply
+    calls that follow on from each other, only pay for the moves"""
+    games = getattr(_local, 'games', None)
+    if games is None:
+        games = _local.games = {}
+    variant = position.get_variant()
+    entry = games.get(variant)
+    if entry is None:
+        entry = games[variant] = [ChessVar(CompactBoard(variant), headless=True), None]
+    game, loaded = entry
+    if loaded is not position and loaded != position:
+        game.set_position(position)
+        entry[1] = position
+    return game
+
+
+def start_position(variant=None):
+    """Returns the starting Position of the inputted Variant, or of the standard game if none is entered"""
+    game = ChessVar(CompactBoard(DEFAULT_VARIANT if variant is None else variant), headless=True)
+    return game.snapshot()
+
+
+def legal_moves(position):
+    """Returns a tuple of every (move_from, move_to) move the player to move can make in the inputted Position, in
+    the order of ChessVar.legal_moves"""
+    return tuple(_scratch(position).legal_moves())
+
+
+def get_illegal_reason(position, move):
+    """Returns None if a (move_from, move_to) move can be made in the inputted Position, or else the IllegalMove
+    reason ChessVar.make_move would turn it down for"""
+    return _scratch(position).get_illegal_reason(move[0], move[1])
+
+
+def apply(position, move):
+    """Returns the Position reached by making a (move_from, move_to) move in the inputted Position, which is not
+    changed. Raises ValueError if the move is not legal there"""
+    game = _scratch(position)
+    reason = game.get_illegal_reason(move[0], move[1])
+    if reason is not None:
+        raise ValueError('illegal move ' + str(move[0]) + str(move[1]) + ': ' + reason)
+    game.push(move)
+    result = game.snapshot()
+    if game.get_undo_depth() >= UNDO_LIMIT:
+        # a long run of apply calls would otherwise keep every move for a pop that never comes
+        game.set_position(result)
+    _local.games[position.get_variant()][1] = result
+    return result
+
+
+def to_game(position, board_class=None):
+    """Returns a new headless ChessVar game in the inputted Position that the caller owns and can change"""
+    return ChessVar.from_snapshot(position, board_class)
+
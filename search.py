@@ -0,0 +1,307 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: An alpha-beta search engine for ChessVar. Uses iterative deepening under a wall clock budget, a
+# transposition table, move ordering by captures, killer moves and the history heuristic, and an evaluation based on
+# how far each king is from row 8 and how many moves its shortest unattacked path there takes
+
+import time
+
+from ChessVar import SQUARE_INDEX, ROW_8
+from movegen import staged_moves
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 100000
+INFINITE = 1000000
+# Scores at least this far from 0 are wins or losses, which count down by one for every ply to the end of the game
+WIN_BOUND = WIN_SCORE - 1000
+# Nodes searched between looks at the clock. A node on the slowest board takes under half a millisecond, so a
+# search runs at most a few tens of milliseconds past its time limit
+CLOCK_INTERVAL = 64
+# Number of king moves used as the distance of a king that has no unattacked path to row 8
+NO_PATH = 16
+
+PIECE_VALUES = {'Rook': 50, 'Bishop': 30, 'Knight': 30}
+ROW_VALUE = 10
+PATH_VALUE = 40
+RACE_VALUE = 400
+
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+ALL_SPOTS = (1 << 64) - 1
+
+
+def _score_to_table(score, ply):
+    """Returns a score found ply moves from the root as the transposition table keeps it: a win or loss counts its
+    plies from the position itself, so the entry is right whatever ply the position is reached at again"""
+    if score >= WIN_BOUND:
+        return score + ply
+    if score <= -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    """Returns a score kept in the transposition table, or scored from the position itself, as a score found ply
+    moves from the root, the inverse of _score_to_table"""
+    if score >= WIN_BOUND:
+        return score - ply
+    if score <= -WIN_BOUND:
+        return score + ply
+    return score
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out, to unwind back to search"""
+
+
+def _spread(mask):
+    """Returns the bitboard of every spot a king could reach in one move from any spot in mask, plus mask itself"""
+    sideways = mask | (mask << 1 & ~FILE_A) | (mask >> 1 & ~FILE_H)
+    return (sideways | sideways << 8 | sideways >> 8) & ALL_SPOTS
+
+
+def _occupied(board, color):
+    """Returns the bitboard of the spots holding a piece of the inputted color"""
+    pc_list = board.get_white_pcs() if color == 'w' else board.get_black_pcs()
+    occupied = 0
+    for piece in pc_list:
+        if piece.get_current_pos() != '0':
+            occupied |= 1 << SQUARE_INDEX[piece.get_current_pos()]
+    return occupied
+
+
+def king_distance(board, color):
+    """Returns the fewest king moves the king of the inputted color needs to reach row 8 without stepping onto a spot
+    held by its own pieces or attacked by the other color, or NO_PATH if there is no such path"""
+    king = board.get_white_pcs()[1] if color == 'w' else board.get_black_pcs()[1]
+    reached = 1 << SQUARE_INDEX[king.get_current_pos()]
+    allowed = ALL_SPOTS & ~_occupied(board, color) & ~board.get_king_danger(color)
+    distance = 0
+    while not reached & ROW_8:
+        grown = _spread(reached) & allowed | reached
+        if grown == reached or distance == NO_PATH:
+            return NO_PATH
+        reached = grown
+        distance += 1
+    return distance
+
+
+def race_result(white_distance, black_distance, to_move):
+    """Returns 1, 0 or -1 for a white win, tie or black win if both kings simply walk their shortest paths to row 8,
+    using the check_kings rule that black gets one more move after white's king arrives"""
+    if white_distance >= NO_PATH and black_distance >= NO_PATH:
+        return 0
+    if to_move == 'w':
+        if white_distance < black_distance:
+            return 1
+        return 0 if white_distance == black_distance else -1
+    if black_distance <= white_distance:
+        return -1
+    return 0 if black_distance == white_distance + 1 else 1
+
+
+def evaluate(game):
+    """Returns a score for the position of the inputted ChessVar game from the point of view of the player whose turn
+    it is. Positive scores are good for that player"""
+    board = game.get_board()
+    white_row = board.get_white_king_row()
+    black_row = board.get_black_king_row()
+    to_move = game.get_to_move()
+    black_distance = king_distance(board, 'b')
+
+    if white_row == 8:
+        # white has arrived and black is using its last move: only a black king one move from row 8 can tie
+        return 0 if black_distance <= 1 else -WIN_SCORE + 1
+
+    white_distance = king_distance(board, 'w')
+    score = ROW_VALUE * (white_row - black_row) + PATH_VALUE * (black_distance - white_distance)
+    score += RACE_VALUE * race_result(white_distance, black_distance, to_move)
+    for pc_list, sign in ((board.get_white_pcs(), 1), (board.get_black_pcs(), -1)):
+        for piece in pc_list:
+            if piece.get_current_pos() != '0' and not piece.is_king():
+                score += sign * PIECE_VALUES[type(piece).__name__]
+    return score if to_move == 'w' else -score
+
+
+class Searcher:
+    """Finds moves for a ChessVar game with iterative deepening alpha-beta search. The transposition table and
+    history scores are kept between searches so later moves of a game start with what was learned earlier"""
+    def __init__(self, table_megabytes=16, tablebases=None, incremental=False):
+        """Creates a searcher with a transposition table of the inputted size. If a tablebase.TablebaseSet is
+        entered, positions with material it has a table for are scored from the table instead of searched. If
+        incremental is True, leaves are scored by an evaluation.Evaluator kept up to date move by move, which adds
+        the piece activity of its piece-square tables to the evaluate score"""
+        self._table = TranspositionTable(table_megabytes)
+        self._tablebases = tablebases
+        self._incremental = incremental
+        self._evaluator = None
+        self._mover = None
+        self._history = {}
+        self._killers = []
+        self._nodes = 0
+        self._deadline = None
+        self._info = None
+
+    def get_info(self):
+        """Returns a dictionary describing the last search: move, score, depth, nodes, seconds, nodes/second and a list
+        of the (depth, score, move) result of every depth that was finished"""
+        return self._info
+
+    def search(self, game, time_limit=None, max_depth=None, moves=None):
+        """Returns the best (move_from, move_to) move found for the player whose turn it is, or None if there is no
+        legal move. Searches one move deeper at a time until time_limit seconds have passed or max_depth is done.
+        The game is searched in place with push and pop and is left as it was found. If a list of moves is entered,
+        only those root moves are searched. Raises ValueError for a game of any other variant than the standard
+        8 by 8 game, whose row 8 goal and spot numbers the evaluation is built on"""
+        if not game.get_board().get_variant().is_default():
+            raise ValueError('the engine only plays the standard 8 by 8 game')
+        if time_limit is None and max_depth is None:
+            max_depth = 4
+        if max_depth is None:
+            max_depth = 64
+        start = time.perf_counter()
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._nodes = 0
+        self._killers = [[None, None] for _ in range(max_depth + 2)]
+        self._table.new_search()
+        if self._incremental:
+            if self._evaluator is None or self._evaluator.get_game() is not game:
+                from evaluation import Evaluator
+                self._evaluator = Evaluator(game)
+            else:
+                self._evaluator.reset()
+            # moves are played through the evaluator so its score follows them
+            self._mover = self._evaluator
+        else:
+            self._mover = game
+
+        root_moves = game.legal_moves() if moves is None else list(moves)
+        best_move = root_moves[0] if root_moves else None
+        best_score = 0
+        finished_depth = 0
+        results = []
+        for depth in range(1, max_depth + 1):
+            if not root_moves:
+                break
+            try:
+                score, move = self._root(game, root_moves, depth)
+            except _SearchTimeout:
+                break
+            best_move, best_score, finished_depth = move, score, depth
+            results.append((depth, score, move))
+            # search the best move first at the next depth
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if abs(score) >= WIN_SCORE - 64:
+                break
+
+        seconds = time.perf_counter() - start
+        self._info = {
+            'move': best_move,
+            'score': best_score,
+            'depth': finished_depth,
+            'nodes': self._nodes,
+            'seconds': seconds,
+            'nps': int(self._nodes / seconds) if seconds > 0 else 0,
+            'results': results,
+        }
+        return best_move
+
+    def _root(self, game, moves, depth):
+        """Searches every root move to the inputted depth and returns the best (score, move) pair"""
+        alpha = -INFINITE
+        best_move = moves[0]
+        mover = self._mover
+        for move in moves:
+            mover.push(move)
+            try:
+                score = -self._alpha_beta(game, depth - 1, -INFINITE, -alpha, 1)
+            finally:
+                mover.pop()
+            if score > alpha:
+                alpha, best_move = score, move
+        self._table.store(game.get_zobrist_key(), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _alpha_beta(self, game, depth, alpha, beta, ply):
+        """Returns the negamax score of the current position searched depth moves ahead within the alpha-beta
+        window"""
+        self._nodes += 1
+        if self._deadline is not None and self._nodes % CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        state = game.get_game_state()
+        if state != 'UNFINISHED':
+            if state == 'TIE':
+                return 0
+            # black's last move after white's king arrives leaves the winner to move, so the sign comes from the winner
+            if state[0].lower() == game.get_to_move():
+                return WIN_SCORE - ply
+            return -WIN_SCORE + ply
+
+        if self._tablebases is not None:
+            known = self._tablebases.probe(game)
+            if known is not None:
+                if known[0] == 'TIE':
+                    return 0
+                score = WIN_SCORE - ply - known[1]
+                return score if known[0] == 'WIN' else -score
+
+        key = game.get_zobrist_key()
+        entry = self._table.probe(key)
+        table_move = None
+        if entry is not None:
+            table_move = entry[4]
+            if entry[1] >= depth:
+                stored = _score_from_table(entry[2], ply)
+                if entry[3] == EXACT:
+                    return stored
+                if entry[3] == LOWER_BOUND and stored >= beta:
+                    return stored
+                if entry[3] == UPPER_BOUND and stored <= alpha:
+                    return stored
+
+        if depth <= 0:
+            if self._evaluator is not None and self._mover is self._evaluator:
+                return _score_from_table(self._evaluator.evaluate(), ply)
+            # evaluate counts a loss from the position itself
+            return _score_from_table(evaluate(game), ply)
+
+        original_alpha = alpha
+        best_score = -INFINITE
+        best_move = None
+        board = game.get_board()
+        mover = self._mover
+        killers = self._killers[ply] if ply < len(self._killers) else ()
+        # moves are generated and checked one stage at a time, so a cutoff leaves the rest unchecked
+        for move in staged_moves(game, table_move, killers, self._history, PIECE_VALUES):
+            quiet = board.get_piece(move[1]) == '___'
+            mover.push(move)
+            try:
+                score = -self._alpha_beta(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                mover.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if quiet:
+                    killers = self._killers[ply]
+                    if killers[0] != move:
+                        killers[0], killers[1] = move, killers[0]
+                    self._history[move] = self._history.get(move, 0) + depth * depth
+                break
+
+        if best_move is None:
+            # no legal move leaves the game stuck without a winner
+            return 0
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, _score_to_table(best_score, ply), flag, best_move)
+        return best_score
@@ -0,0 +1,362 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: An asyncio server hosting many ChessVar games at once over a local TCP or Unix socket. Clients send
+# one JSON object per line and get one JSON object per line back. Games can be created, joined, moved in and
+# watched; every subscriber of a game is sent the game's move, capture and game over events as they happen.
+# Moves are checked and played in a thread pool and engine searches run in a process pool, so the event loop keeps
+# answering other games while they work
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from ChessVar import ChessVar, BitBoard, Variant, DEFAULT_VARIANT
+from search import Searcher
+
+# Longest request line the server reads
+LINE_LIMIT = 64 * 1024
+
+
+def event_to_json(game_id, event):
+    """Returns the dictionary sent to subscribers for a GameEvent: its class name as 'event', the game id and the
+    event's fields"""
+    message = {'event': type(event).__name__, 'game': game_id}
+    for name, value in vars(event).items():
+        message[name.lstrip('_')] = value
+    return message
+
+
+def _engine_move(position, time_limit, max_depth):
+    """Worker task: returns the alpha-beta engine's move for the inputted Position"""
+    game = ChessVar(BitBoard(), headless=True)
+    game.set_position(position)
+    return Searcher().search(game, time_limit, max_depth)
+
+
+class ServerError(Exception):
+    """A request that can not be carried out. The message is sent back to the client"""
+
+
+class _Session:
+    """One hosted game: the headless ChessVar game, which connection holds each color, the subscribed connections,
+    a lock so moves in the game are played one at a time, and the events waiting to be sent out"""
+    def __init__(self, game_id, variant=DEFAULT_VARIANT):
+        self.game_id = game_id
+        self.variant = variant
+        self.game = ChessVar(BitBoard(variant), headless=True)
+        self.seats = {'w': None, 'b': None}
+        self.subscribers = set()
+        self.lock = asyncio.Lock()
+        self.events = []
+        self.game.add_observer(self.events.append)
+
+
+class _Connection:
+    """A connected client and the writer its replies and events are sent through"""
+    def __init__(self, writer):
+        self.writer = writer
+        self.sessions = set()
+
+    def send(self, message):
+        """Queues one JSON line to the client. Nothing is sent once the connection is closing"""
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+
+class GameServer:
+    """Hosts ChessVar games for clients speaking the JSON-lines protocol. Each request is an object with an 'op'
+    and an optional 'id' that is copied into the reply. The ops are:
+
+    create      {'color': 'w' or 'b'}            starts a game, takes a seat and subscribes to it. 'width',
+                                                  'height', 'setup' and 'goal_row' start a Variant instead
+    join        {'game': id}                      takes the free seat of a game and subscribes to it
+    move        {'game': id, 'from': 'a2', 'to': 'a3'}   plays a move for the seat whose turn it is
+    legal_moves {'game': id}                      lists the legal moves of the player to move
+    state       {'game': id}                      gets the game state, whose turn it is and the position
+    subscribe / unsubscribe {'game': id}          starts or stops the events of a game
+    close       {'game': id}                      removes a game the connection has a seat in
+    engine_move {'game': id, 'time': s, 'depth': n}   asks the engine for a move without playing it
+    stats       {}                                counts games, connections and moves played
+
+    Replies have 'ok' set to True with the results, or False with an 'error'. Events have an 'event' field instead
+    of an 'id'"""
+    def __init__(self, move_workers=4, engine_workers=None):
+        self._sessions = {}
+        self._connections = set()
+        self._ids = itertools.count(1)
+        self._move_pool = ThreadPoolExecutor(max_workers=move_workers)
+        self._engine_workers = engine_workers
+        self._engine_pool = None
+        self._moves_played = 0
+        self._server = None
+        self._path = None
+
+    def get_session_count(self):
+        """Returns the number of games hosted"""
+        return len(self._sessions)
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """Starts listening on a Unix socket at path if one is entered, or else on the TCP host and port"""
+        if path is not None:
+            self._path = path
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        return self._server
+
+    async def serve_forever(self):
+        """Serves until cancelled"""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stops listening, closes every connection and shuts down the worker pools"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._path is not None and os.path.exists(self._path):
+            os.unlink(self._path)
+        for connection in list(self._connections):
+            connection.writer.close()
+        self._move_pool.shutdown(wait=False)
+        if self._engine_pool is not None:
+            self._engine_pool.shutdown(wait=False)
+
+    async def _handle(self, reader, writer):
+        """Reads the requests of one connection. Each request runs as its own task so a slow move in one game does
+        not hold up the connection's requests for other games"""
+        connection = _Connection(writer)
+        self._connections.add(connection)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._request(connection, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > LINE_LIMIT:
+                    await writer.drain()
+        except asyncio.CancelledError:
+            # the server is shutting down
+            pass
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            for session in connection.sessions:
+                session.subscribers.discard(connection)
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _request(self, connection, line):
+        """Carries out one request line and sends the reply"""
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise ServerError('request is not JSON')
+            if not isinstance(request, dict):
+                raise ServerError('request must be a JSON object')
+            request_id = request.get('id')
+            handler = getattr(self, '_op_' + str(request.get('op')), None)
+            if handler is None:
+                raise ServerError('unknown op: ' + str(request.get('op')))
+            reply = await handler(connection, request)
+            reply['ok'] = True
+        except ServerError as error:
+            reply = {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # a request the checks let through must still be answered, or the client waits on its id for ever
+            reply = {'ok': False, 'error': 'internal error: ' + type(error).__name__ + ': ' + str(error)}
+        reply['id'] = request_id
+        connection.send(reply)
+
+    @staticmethod
+    def _get_field(request, name, types, default=None):
+        """Returns a field of the request, or default if it is missing or null. Raises ServerError if it is not of
+        one of the inputted JSON types (bool never counts as a number)"""
+        value = request.get(name)
+        if value is None:
+            return default
+        if isinstance(value, bool) and bool not in types or not isinstance(value, types):
+            raise ServerError(name + ' must be ' + ' or '.join(kind.__name__ for kind in types))
+        return value
+
+    def _get_session(self, request):
+        """Returns the session of the game named in the request"""
+        session = self._sessions.get(self._get_field(request, 'game', (int,)))
+        if session is None:
+            raise ServerError('no such game: ' + str(request.get('game')))
+        return session
+
+    def _subscribe(self, connection, session):
+        """Adds the connection to the subscribers of the session"""
+        session.subscribers.add(connection)
+        connection.sessions.add(session)
+
+    def _publish(self, session):
+        """Sends the session's waiting events to every subscriber"""
+        events = session.events[:]
+        session.events.clear()
+        for event in events:
+            message = event_to_json(session.game_id, event)
+            for subscriber in session.subscribers:
+                subscriber.send(message)
+
+    def _describe(self, session):
+        """Returns the state reply fields of a session"""
+        game = session.game
+        return {'game': session.game_id, 'game_state': game.get_game_state(), 'to_move': game.get_to_move(),
+                'fen': game.get_fen(), 'seats': {color: seat is not None for color, seat in session.seats.items()}}
+
+    async def _op_create(self, connection, request):
+        """Starts a new game with the connection in the requested seat"""
+        color = self._get_field(request, 'color', (str,), 'w')
+        if color not in ('w', 'b'):
+            raise ServerError('color must be w or b')
+        variant = DEFAULT_VARIANT
+        if any(name in request for name in ('width', 'height', 'setup', 'goal_row')):
+            width = self._get_field(request, 'width', (int,), 8)
+            height = self._get_field(request, 'height', (int,), 8)
+            setup = self._get_field(request, 'setup', (str,))
+            goal_row = self._get_field(request, 'goal_row', (int,))
+            try:
+                variant = Variant(width, height, setup, goal_row)
+            except ValueError as error:
+                raise ServerError('bad variant: ' + str(error))
+        session = _Session(next(self._ids), variant)
+        session.seats[color] = connection
+        self._sessions[session.game_id] = session
+        self._subscribe(connection, session)
+        return {'game': session.game_id, 'color': color}
+
+    async def _op_join(self, connection, request):
+        """Seats the connection in the free seat of a game"""
+        session = self._get_session(request)
+        for color in ('w', 'b'):
+            if session.seats[color] is None:
+                session.seats[color] = connection
+                self._subscribe(connection, session)
+                return {'game': session.game_id, 'color': color}
+        raise ServerError('game is full')
+
+    async def _op_move(self, connection, request):
+        """Plays a move for the connection if it holds the seat of the player to move, then sends out the events"""
+        session = self._get_session(request)
+        move_from = self._get_field(request, 'from', (str,))
+        move_to = self._get_field(request, 'to', (str,))
+        if move_from is None or move_to is None:
+            raise ServerError('a move needs from and to')
+        async with session.lock:
+            game = session.game
+            if session.seats[game.get_to_move()] is not connection:
+                raise ServerError('not your turn')
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(self._move_pool, game.make_move, move_from, move_to):
+                # the turned down move is only reported back to the player who sent it
+                raise ServerError('illegal move: ' + session.events.pop().get_reason())
+            self._moves_played += 1
+            self._publish(session)
+        return {'game': session.game_id, 'game_state': game.get_game_state()}
+
+    async def _op_legal_moves(self, connection, request):
+        """Returns the legal moves of the player to move, written like a2a3"""
+        session = self._get_session(request)
+        async with session.lock:
+            loop = asyncio.get_running_loop()
+            moves = await loop.run_in_executor(self._move_pool, session.game.legal_moves)
+        return {'game': session.game_id, 'moves': [move_from + move_to for move_from, move_to in moves]}
+
+    async def _op_state(self, connection, request):
+        """Returns the game state, whose turn it is, the position and which seats are taken"""
+        session = self._get_session(request)
+        # a move being played in the move pool holds the lock, so the reply never shows half of it
+        async with session.lock:
+            return self._describe(session)
+
+    async def _op_subscribe(self, connection, request):
+        """Starts sending the events of a game to the connection"""
+        session = self._get_session(request)
+        self._subscribe(connection, session)
+        async with session.lock:
+            return self._describe(session)
+
+    async def _op_unsubscribe(self, connection, request):
+        """Stops sending the events of a game to the connection"""
+        session = self._get_session(request)
+        session.subscribers.discard(connection)
+        connection.sessions.discard(session)
+        return {'game': session.game_id}
+
+    async def _op_close(self, connection, request):
+        """Removes a game from the server. Only a connection holding one of its seats can close it"""
+        session = self._get_session(request)
+        if connection not in session.seats.values():
+            raise ServerError('only a player can close a game')
+        del self._sessions[session.game_id]
+        for subscriber in session.subscribers:
+            subscriber.sessions.discard(session)
+        session.subscribers.clear()
+        return {'game': session.game_id}
+
+    async def _op_engine_move(self, connection, request):
+        """Returns the alpha-beta engine's move for the position without playing it"""
+        session = self._get_session(request)
+        if not session.variant.is_default():
+            raise ServerError('the engine only plays the standard game')
+        time_limit = self._get_field(request, 'time', (int, float))
+        max_depth = self._get_field(request, 'depth', (int,), 3 if time_limit is None else None)
+        if time_limit is not None and time_limit <= 0 or max_depth is not None and max_depth < 1:
+            raise ServerError('time must be above 0 and depth at least 1')
+        if self._engine_pool is None:
+            self._engine_pool = ProcessPoolExecutor(max_workers=self._engine_workers)
+        async with session.lock:
+            # the snapshot can not change under the search while later moves are played
+            position = session.game.snapshot()
+        loop = asyncio.get_running_loop()
+        move = await loop.run_in_executor(self._engine_pool, _engine_move, position, time_limit, max_depth)
+        return {'game': session.game_id, 'move': move[0] + move[1] if move else None}
+
+    async def _op_stats(self, connection, request):
+        """Returns the number of games, connections and moves played"""
+        return {'games': len(self._sessions), 'connections': len(self._connections),
+                'moves_played': self._moves_played}
+
+
+async def serve(host='127.0.0.1', port=8765, path=None, move_workers=4, engine_workers=None):
+    """Runs a GameServer until cancelled"""
+    server = GameServer(move_workers, engine_workers)
+    await server.start(host, port, path)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(args=None):
+    """Command line entry point to run the server"""
+    parser = argparse.ArgumentParser(description='Hosts ChessVar games over a JSON-lines socket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--move-workers', type=int, default=4, help='threads that check and play moves')
+    parser.add_argument('--engine-workers', type=int, default=None, help='processes for engine_move requests')
+    options = parser.parse_args(args)
+    try:
+        asyncio.run(serve(options.host, options.port, options.unix, options.move_workers, options.engine_workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
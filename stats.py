@@ -0,0 +1,12 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Small statistics helpers shared by the benchmark and the load generator, kept apart from both so
+# neither has to import the other's dependencies
+
+
+def percentile(values, fraction):
+    """Returns the value at the inputted fraction (0 to 1) of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
@@ -0,0 +1,391 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Endgame tablebases for ChessVar. For a material signature such as KRvK (white king and rook against
+# the black king) every position is enumerated, the legal moves between them are found with the ChessVar rules, and
+# retrograde analysis works backwards from finished games to label each position a win, loss or tie for the player
+# to move with its distance to the result. Tables are written as one byte per position and probed through mmap
+
+import argparse
+import mmap
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, BitBoard, SQUARE_INDEX, SQUARES
+
+MAGIC = b'RKTB0001'
+HEADER_BYTES = len(MAGIC) + 16
+
+# For each piece letter, the slots of the white and of the black pieces of that type in the piece lists of Board
+LETTER_SLOTS = (('K', (1,), (7,)), ('R', (0,), (6,)), ('B', (2, 3), (8, 9)), ('N', (4, 5), (10, 11)))
+
+# One byte per position: 0 for spots that do not make a position, 1 for a tie, 2 + 2 * distance for a win of the
+# player to move and 3 + 2 * distance for a loss. Distances are counted in moves of either player
+INVALID = 0
+TIE = 1
+MAX_DISTANCE = 126
+# Marks positions that have not been solved yet while a table is generated
+UNSOLVED = 255
+
+
+def parse_signature(signature):
+    """Returns the inputted material signature written in the standard order, like 'KRBvKN'. Raises ValueError if
+    it does not have exactly one king per side or has more pieces of a type than a side starts with"""
+    if signature.count('v') != 1:
+        raise ValueError('a signature looks like KRvK: ' + signature)
+    sides = []
+    for side in signature.upper().split('V'):
+        counts = {letter: side.count(letter) for letter, white_slots, black_slots in LETTER_SLOTS}
+        if sum(counts.values()) != len(side) or counts['K'] != 1:
+            raise ValueError('each side needs one king and only K, R, B or N pieces: ' + signature)
+        for letter, white_slots, black_slots in LETTER_SLOTS:
+            if counts[letter] > len(white_slots):
+                raise ValueError('too many ' + letter + ' pieces: ' + signature)
+        sides.append(''.join(letter * counts[letter] for letter, white_slots, black_slots in LETTER_SLOTS))
+    return sides[0] + 'v' + sides[1]
+
+
+def sub_signatures(signature):
+    """Returns the signatures that one capture leads to from the inputted signature"""
+    white, black = signature.split('v')
+    subs = []
+    for letter in 'RBN':
+        if letter in white:
+            subs.append(parse_signature(white.replace(letter, '', 1) + 'v' + black))
+        if letter in black:
+            subs.append(parse_signature(white + 'v' + black.replace(letter, '', 1)))
+    return subs
+
+
+def signature_squares(spots):
+    """Returns the signature of the pieces still on the board in a get_position spots tuple, and the list of their
+    square numbers in signature order"""
+    white, black = '', ''
+    white_squares, black_squares = [], []
+    for letter, white_slots, black_slots in LETTER_SLOTS:
+        for slot in white_slots:
+            if spots[slot] != '0':
+                white += letter
+                white_squares.append(SQUARE_INDEX[spots[slot]])
+        for slot in black_slots:
+            if spots[slot] != '0':
+                black += letter
+                black_squares.append(SQUARE_INDEX[spots[slot]])
+    return white + 'v' + black, white_squares + black_squares
+
+
+def position_index(squares, to_move):
+    """Returns the table index of a position from its square numbers in signature order and whose turn it is"""
+    index = 0
+    for square in squares:
+        index = index * 64 + square
+    return index * 2 + (1 if to_move == 'b' else 0)
+
+
+def index_position(signature, index):
+    """Returns the (spots, to_move, last_move) of the position at the inputted index of a table, or None if two
+    pieces would share a spot"""
+    to_move = 'b' if index & 1 else 'w'
+    index >>= 1
+    count = len(signature) - 1
+    squares = []
+    for _ in range(count):
+        squares.append(index & 63)
+        index >>= 6
+    squares.reverse()
+    if len(set(squares)) != count:
+        return None
+    spots = ['0'] * 12
+    white, black = signature.split('v')
+    square_iter = iter(squares)
+    for side, slot_number in ((white, 1), (black, 2)):
+        for letter, *slots in LETTER_SLOTS:
+            for slot in slots[slot_number - 1][:side.count(letter)]:
+                spots[slot] = SQUARES[next(square_iter)]
+    # white's king on row 8 means it has already used up the extra move check_kings gives
+    return tuple(spots), to_move, spots[1][1] != '8'
+
+
+def table_size(signature):
+    """Returns the number of positions in the table of the inputted signature"""
+    return 2 * 64 ** (len(signature) - 1)
+
+
+def encode(result, distance):
+    """Returns the table byte for a 'WIN', 'LOSS' or 'TIE' of the player to move in distance moves"""
+    if result == 'TIE':
+        return TIE
+    return (2 if result == 'WIN' else 3) + 2 * min(distance, MAX_DISTANCE)
+
+
+def decode(value):
+    """Returns the (result, distance) pair stored in a table byte, or None for INVALID"""
+    if value == INVALID:
+        return None
+    if value == TIE:
+        return 'TIE', 0
+    return ('WIN' if value % 2 == 0 else 'LOSS'), (value - 2) // 2
+
+
+class Tablebase:
+    """One generated table, read through a memory map"""
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        header = self._file.read(HEADER_BYTES)
+        if header[:len(MAGIC)] != MAGIC:
+            self._file.close()
+            raise ValueError('not a tablebase: ' + path)
+        self._signature = header[len(MAGIC):].rstrip(b'\0').decode()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get_signature(self):
+        """Returns the material signature of the table"""
+        return self._signature
+
+    def get_value(self, index):
+        """Returns the raw table byte at the inputted index"""
+        return self._map[HEADER_BYTES + index]
+
+    def close(self):
+        """Closes the memory map and the file"""
+        self._map.close()
+        self._file.close()
+
+
+class TablebaseSet:
+    """Every table in a directory, opened the first time a position with that material is probed"""
+    def __init__(self, directory):
+        self._directory = directory
+        self._tables = {}
+
+    def get_table(self, signature):
+        """Returns the Tablebase for the inputted signature, or None if it has not been generated"""
+        if signature not in self._tables:
+            path = table_path(self._directory, signature)
+            self._tables[signature] = Tablebase(path) if os.path.exists(path) else None
+        return self._tables[signature]
+
+    def probe_value(self, spots, to_move):
+        """Returns the raw table byte of a position given as a spots tuple and whose turn it is, or None if its
+        table has not been generated"""
+        signature, squares = signature_squares(spots)
+        table = self.get_table(signature)
+        if table is None:
+            return None
+        return table.get_value(position_index(squares, to_move))
+
+    def probe(self, game):
+        """Returns the ('WIN' | 'LOSS' | 'TIE', distance) result of the inputted ChessVar game for the player whose
+        turn it is, or None if there is no table for its material"""
+        spots, to_move, last_move, game_state = game.get_position()
+        value = self.probe_value(spots, to_move)
+        return None if value is None else decode(value)
+
+    def close(self):
+        """Closes every open table"""
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables = {}
+
+
+def table_path(directory, signature):
+    """Returns the path of the file for the inputted signature"""
+    return os.path.join(directory, signature + '.rtb')
+
+
+def _expand(signature, start, stop, directory):
+    """Worker task: plays every legal move of each position with index from start to stop. Returns the arrays the
+    retrograde analysis is built from: the known value of each position (UNSOLVED if it needs solving), the number
+    of moves to positions in the same table and their indexes, and a summary of the moves that capture into
+    smaller tables, whose values are already known"""
+    game = ChessVar(BitBoard(), headless=True)
+    smaller = TablebaseSet(directory)
+    values = bytearray(stop - start)
+    edge_counts = array('H', [0]) * (stop - start)
+    edges = array('L')
+    # for captures: fastest win through a lost smaller position, slowest loss, and ties that rule out losing
+    capture_wins = bytearray(stop - start)
+    capture_losses = bytearray(stop - start)
+    capture_ties = bytearray(stop - start)
+    for index in range(start, stop):
+        offset = index - start
+        position = index_position(signature, index)
+        if position is None:
+            continue
+        spots, to_move, last_move = position
+        game.set_position((spots, to_move, last_move, None))
+        state = game.get_game_state()
+        if state != 'UNFINISHED':
+            if state == 'TIE':
+                values[offset] = TIE
+            else:
+                values[offset] = encode('WIN' if state[0].lower() == to_move else 'LOSS', 0)
+            continue
+        moves = game.legal_moves()
+        if not moves:
+            # a player with no legal move leaves the game stuck without a winner
+            values[offset] = TIE
+            continue
+        values[offset] = UNSOLVED
+        for move in moves:
+            game.push(move)
+            next_spots, next_to_move, next_last_move, next_state = game.get_position()
+            next_signature, squares = signature_squares(next_spots)
+            if next_signature == signature:
+                edges.append(position_index(squares, next_to_move))
+                edge_counts[offset] += 1
+            else:
+                result = decode(smaller.probe_value(next_spots, next_to_move))
+                if result[0] == 'LOSS':
+                    if not capture_wins[offset] or result[1] + 1 < capture_wins[offset]:
+                        capture_wins[offset] = result[1] + 1
+                elif result[0] == 'WIN':
+                    capture_losses[offset] = max(capture_losses[offset], result[1] + 1)
+                else:
+                    capture_ties[offset] = 1
+            game.pop()
+    smaller.close()
+    return start, values, edge_counts, edges, capture_wins, capture_losses, capture_ties
+
+
+def _solve(size, chunks):
+    """Runs the retrograde analysis over the expanded chunks and returns the finished table as a bytearray"""
+    values = bytearray(size)
+    edge_counts = array('H', [0]) * size
+    capture_wins = bytearray(size)
+    capture_losses = bytearray(size)
+    remaining = array('H', [0]) * size
+    edge_starts = array('Q', [0]) * (size + 1)
+    edges = array('L')
+    for start, chunk_values, chunk_counts, chunk_edges, chunk_wins, chunk_losses, chunk_ties in chunks:
+        stop = start + len(chunk_values)
+        values[start:stop] = chunk_values
+        edge_counts[start:stop] = chunk_counts
+        capture_wins[start:stop] = chunk_wins
+        capture_losses[start:stop] = chunk_losses
+        for offset in range(len(chunk_values)):
+            remaining[start + offset] = chunk_counts[offset] + chunk_ties[offset]
+        edges.extend(chunk_edges)
+    total = 0
+    for index in range(size):
+        edge_starts[index] = total
+        total += edge_counts[index]
+    edge_starts[size] = total
+
+    # predecessors of every position, grouped by position with a counting sort
+    pred_starts = array('Q', [0]) * (size + 1)
+    for target in edges:
+        pred_starts[target + 1] += 1
+    for index in range(size):
+        pred_starts[index + 1] += pred_starts[index]
+    fill = array('Q', pred_starts)
+    preds = array('L', [0]) * len(edges)
+    for index in range(size):
+        for edge in range(edge_starts[index], edge_starts[index + 1]):
+            target = edges[edge]
+            preds[fill[target]] = index
+            fill[target] += 1
+
+    # buckets[distance] holds (index, value) results to settle at that distance, processed shortest first
+    buckets = [[] for _ in range(MAX_DISTANCE + 2)]
+    for index in range(size):
+        value = values[index]
+        if value == UNSOLVED:
+            if capture_wins[index]:
+                buckets[capture_wins[index]].append((index, encode('WIN', capture_wins[index])))
+            elif remaining[index] == 0:
+                buckets[capture_losses[index]].append((index, encode('LOSS', capture_losses[index])))
+        elif value != INVALID and value != TIE:
+            buckets[0].append((index, value))
+            values[index] = UNSOLVED
+
+    for distance in range(MAX_DISTANCE + 1):
+        for index, value in buckets[distance]:
+            if values[index] != UNSOLVED:
+                continue
+            values[index] = value
+            won = value % 2 == 0
+            for pred in range(pred_starts[index], pred_starts[index + 1]):
+                previous = preds[pred]
+                if values[previous] != UNSOLVED:
+                    continue
+                if not won:
+                    # moving into a lost position for the other player wins
+                    buckets[distance + 1].append((previous, encode('WIN', distance + 1)))
+                else:
+                    remaining[previous] -= 1
+                    if remaining[previous] == 0 and not capture_wins[previous]:
+                        slowest = max(distance + 1, capture_losses[previous])
+                        buckets[min(slowest, MAX_DISTANCE)].append((previous, encode('LOSS', slowest)))
+        buckets[distance] = []
+
+    # whatever is left can be played forever, or only ends in a tie
+    for index in range(size):
+        if values[index] == UNSOLVED:
+            values[index] = TIE
+    return values
+
+
+def generate(signature, directory, workers=None, chunk_size=4096, progress=None):
+    """Generates the table of the inputted signature in directory, generating the tables it captures into first.
+    Tables that already exist are not generated again, so an interrupted run can be restarted. Returns the path of
+    the table"""
+    signature = parse_signature(signature)
+    path = table_path(directory, signature)
+    if os.path.exists(path):
+        return path
+    for sub_signature in sub_signatures(signature):
+        generate(sub_signature, directory, workers, chunk_size, progress)
+    os.makedirs(directory, exist_ok=True)
+
+    start_time = time.perf_counter()
+    size = table_size(signature)
+    starts = list(range(0, size, chunk_size))
+    stops = [min(start + chunk_size, size) for start in starts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = list(pool.map(_expand, [signature] * len(starts), starts, stops, [directory] * len(starts)))
+    values = _solve(size, chunks)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as table_file:
+        table_file.write(MAGIC + signature.encode().ljust(16, b'\0'))
+        table_file.write(values)
+    os.replace(temp_path, path)
+    if progress is not None:
+        progress(signature, size, time.perf_counter() - start_time)
+    return path
+
+
+def main(args=None):
+    """Command line entry point to generate tables or probe a position"""
+    parser = argparse.ArgumentParser(description='Generates and probes ChessVar endgame tablebases.')
+    parser.add_argument('--dir', default='tablebases', help='directory the tables are kept in')
+    commands = parser.add_subparsers(dest='command', required=True)
+    make = commands.add_parser('generate', help='generate the tables for material signatures like KRvK')
+    make.add_argument('signatures', nargs='+')
+    make.add_argument('--workers', type=int, default=None, help='number of worker processes (default: all cores)')
+    probe = commands.add_parser('probe', help='look up a position written as ChessVar.get_fen text')
+    probe.add_argument('fen')
+    options = parser.parse_args(args)
+
+    if options.command == 'generate':
+        def report(signature, size, seconds):
+            print(signature + ': ' + str(size) + ' positions in ' + format(seconds, '.1f') + 's')
+        for signature in options.signatures:
+            generate(signature, options.dir, options.workers, progress=report)
+    else:
+        tables = TablebaseSet(options.dir)
+        result = tables.probe(ChessVar.from_fen(options.fen, BitBoard(), headless=True))
+        if result is None:
+            print('No table for this material')
+            return 1
+        print(result[0] + (' in ' + str(result[1]) if result[0] != 'TIE' else ''))
+        tables.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Tests the correctness side of the benchmark suite in bench.py: every board class gives the same
+# legality results on the fixed-seed workloads, perft matches the reference counts, and comparisons report a
+# change of legality apart from a change of search results
+
+import random
+import unittest
+
+from bench import (BOARD_CLASSES, PerftWorkload, get_workloads, run_suite, compare, compare_boards, digest,
+                   RESULTS_VERSION)
+from ChessVar import ChessVar, Board
+from stats import percentile
+
+
+def _result(board_digest, legality=True, ops_per_second=1000.0):
+    """Returns a measure result dictionary with only the fields the comparisons read"""
+    return {'digest': board_digest, 'legality': legality, 'ops_per_second': ops_per_second}
+
+
+def _suite(results):
+    """Returns a run_suite style dictionary holding the inputted results"""
+    return {'version': RESULTS_VERSION, 'seed': 0, 'scale': 1, 'perft_depth': 2, 'search_depth': 2,
+            'results': results}
+
+
+class BoardAgreementTest(unittest.TestCase):
+    """Runs the legality workloads on every board class and checks they agree"""
+
+    def test_boards_give_the_same_results(self):
+        names = [name for name, workload in get_workloads().items() if workload.legality]
+        current = run_suite(names, repeats=1, memory=False, perft_depth=2, search_depth=1)
+        self.assertEqual(len(current['results']), len(names) * len(BOARD_CLASSES))
+        self.assertEqual(compare_boards(current), [])
+
+    def test_perft_reference_counts(self):
+        workload = PerftWorkload(3)
+        start = ChessVar(Board(), headless=True).get_position()
+        for board_class in BOARD_CLASSES.values():
+            ops, latencies, results = workload.run(board_class, [start])
+            self.assertEqual(ops, 11366)
+            self.assertEqual(len(results), 21)
+
+    def test_workload_inputs_are_reproducible(self):
+        workload = get_workloads()['illegal']
+        self.assertEqual(workload.prepare(random.Random('0-illegal'), 1),
+                         workload.prepare(random.Random('0-illegal'), 1))
+
+
+class CompareTest(unittest.TestCase):
+    """Checks what the comparisons of saved results report"""
+
+    def test_board_mismatch(self):
+        current = _suite({'perft/board': _result('a'), 'perft/bitboard': _result('b'),
+                          'search/board': _result('c', False), 'search/bitboard': _result('d', False)})
+        differences = compare_boards(current)
+        self.assertEqual([(key, kind) for key, kind, text in differences], [('perft', 'mismatch')])
+
+    def test_legality_and_search_changes(self):
+        baseline = _suite({'perft/board': _result('a'), 'search/board': _result('c', False)})
+        current = _suite({'perft/board': _result('b'), 'search/board': _result('d', False)})
+        kinds = {key: kind for key, kind, text in compare(baseline, current)}
+        self.assertEqual(kinds, {'perft/board': 'legality', 'search/board': 'changed'})
+
+    def test_regression_and_improvement(self):
+        baseline = _suite({'replay/board': _result('a'), 'access/board': _result('b')})
+        current = _suite({'replay/board': _result('a', ops_per_second=800.0),
+                          'access/board': _result('b', ops_per_second=1200.0)})
+        kinds = {key: kind for key, kind, text in compare(baseline, current, 0.1)}
+        self.assertEqual(kinds, {'replay/board': 'regression', 'access/board': 'improvement'})
+
+    def test_different_settings_are_not_compared(self):
+        baseline = _suite({})
+        current = dict(_suite({}), seed=1)
+        with self.assertRaises(ValueError):
+            compare(baseline, current)
+
+    def test_digest_and_percentile(self):
+        self.assertEqual(digest([1, (2, 3)]), digest([1, (2, 3)]))
+        self.assertNotEqual(digest([1, (2, 3)]), digest([1, (3, 2)]))
+        values = list(range(101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Tests that the attack counts BitBoard keeps up to date move by move match the counts of a BitBoard
+# set up fresh in the same position, and that BitBoard accepts the same moves as Board
+
+import random
+import unittest
+
+from ChessVar import ChessVar, Board, BitBoard, SQUARES
+
+
+class AttackCountTest(unittest.TestCase):
+    """Plays and takes back random moves on a BitBoard, checking its attack counts against a fresh board"""
+
+    def _assert_counts_match(self, game):
+        """Checks every attack count of the game's board against a BitBoard set up in the same position"""
+        fresh = ChessVar(BitBoard(), headless=True)
+        fresh.set_position(game.get_position())
+        board, fresh_board = game.get_board(), fresh.get_board()
+        for color in ('w', 'b'):
+            attacked = 0
+            for index, spot in enumerate(SQUARES):
+                count = board.get_attack_count(spot, color)
+                self.assertEqual(count, fresh_board.get_attack_count(spot, color), (game.get_fen(), spot, color))
+                if count:
+                    attacked |= 1 << index
+            self.assertEqual(board.get_attacked(color), attacked)
+
+    def test_counts_after_push_and_pop(self):
+        rng = random.Random(11)
+        for _ in range(5):
+            game = ChessVar(BitBoard(), headless=True)
+            for _ in range(40):
+                moves = game.legal_moves()
+                if not moves:
+                    break
+                game.push(rng.choice(moves))
+                self._assert_counts_match(game)
+            while game.get_undo_depth():
+                game.pop()
+                self._assert_counts_match(game)
+
+    def test_starting_counts(self):
+        board = BitBoard()
+        # the bishop on b1 is guarded by the king on a1 and nothing else
+        self.assertEqual(board.get_attack_count('b1', 'w'), 1)
+        self.assertEqual(board.get_attack_count('b1', 'b'), 0)
+
+
+class SameMovesTest(unittest.TestCase):
+    """Plays random games on a Board and a BitBoard side by side"""
+
+    def test_legal_moves_match_board(self):
+        rng = random.Random(5)
+        for _ in range(10):
+            games = [ChessVar(Board(), headless=True), ChessVar(BitBoard(), headless=True)]
+            while games[0].get_game_state() == 'UNFINISHED':
+                moves = sorted(games[0].legal_moves())
+                self.assertEqual(moves, sorted(games[1].legal_moves()), games[0].get_fen())
+                if not moves:
+                    break
+                move = rng.choice(moves)
+                for game in games:
+                    self.assertTrue(game.make_move(*move))
+            self.assertEqual(games[0].get_game_state(), games[1].get_game_state())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Tests the game-level features of ChessVar on every board class: push and pop round trips, Zobrist
+# keys after moves and take-backs, FEN-style and binary position round trips, pins, and the events sent to
+# observers of a headless game
+
+import contextlib
+import io
+import random
+import unittest
+
+from ChessVar import (ChessVar, Board, BitBoard, CompactBoard, POSITION_BYTES, MoveMade, Capture, IllegalMove,
+                      GameOver)
+
+BOARD_CLASSES = (Board, BitBoard, CompactBoard)
+
+
+def _state(game):
+    """Returns everything push and pop must put back: the position, FEN, Zobrist key and legal moves"""
+    return game.get_position(), game.get_fen(), game.get_zobrist_key(), sorted(game.legal_moves())
+
+
+def _random_game(board_class, rng, plies):
+    """Returns a headless game on a new board of board_class after up to plies random legal moves"""
+    game = ChessVar(board_class(), headless=True)
+    for _ in range(plies):
+        moves = game.legal_moves()
+        if not moves:
+            break
+        game.push(rng.choice(moves))
+    return game
+
+
+class PushPopTest(unittest.TestCase):
+    """Plays random moves with push and takes them back with pop"""
+
+    def test_pop_puts_back_every_move(self):
+        for board_class in BOARD_CLASSES:
+            rng = random.Random(1)
+            for _ in range(5):
+                game = ChessVar(board_class(), headless=True)
+                states = []
+                while game.legal_moves() and len(states) < 60:
+                    states.append(_state(game))
+                    game.push(rng.choice(game.legal_moves()))
+                self.assertEqual(game.get_undo_depth(), len(states))
+                while states:
+                    game.pop()
+                    self.assertEqual(_state(game), states.pop(), board_class.__name__)
+
+    def test_pop_returns_the_move(self):
+        game = ChessVar(headless=True)
+        game.push(('c1', 'd3'))
+        self.assertEqual(game.pop(), ('c1', 'd3'))
+        self.assertEqual(game.get_undo_depth(), 0)
+
+    def test_push_then_pop_restores_captures(self):
+        for board_class in BOARD_CLASSES:
+            game = ChessVar.from_fen('8/7k/8/8/8/8/r7/KR6 w -', board_class(), headless=True)
+            before = _state(game)
+            game.push(('b1', 'b2'))
+            game.push(('a2', 'b2'))
+            self.assertEqual(game.get_board().get_piece('b1'), '___')
+            game.pop()
+            game.pop()
+            self.assertEqual(_state(game), before)
+
+
+class ZobristTest(unittest.TestCase):
+    """Checks the Zobrist key kept up to date move by move against a key worked out from scratch"""
+
+    def test_key_matches_a_fresh_game(self):
+        for board_class in BOARD_CLASSES:
+            rng = random.Random(2)
+            game = ChessVar(board_class(), headless=True)
+            for _ in range(80):
+                moves = game.legal_moves()
+                if not moves:
+                    break
+                game.push(rng.choice(moves))
+                fresh = ChessVar(board_class(), headless=True)
+                fresh.set_position(game.get_position())
+                self.assertEqual(game.get_zobrist_key(), fresh.get_zobrist_key(), game.get_fen())
+
+    def test_key_after_make_and_unmake(self):
+        for board_class in BOARD_CLASSES:
+            game = ChessVar(board_class(), headless=True)
+            start = game.get_zobrist_key()
+            for move in game.legal_moves():
+                game.push(move)
+                self.assertNotEqual(game.get_zobrist_key(), start)
+                game.pop()
+                self.assertEqual(game.get_zobrist_key(), start)
+
+    def test_transposed_moves_give_the_same_key(self):
+        first = ChessVar(headless=True)
+        second = ChessVar(headless=True)
+        for move in (('c1', 'd3'), ('f1', 'e3'), ('b2', 'c3'), ('g2', 'f3')):
+            first.push(move)
+        for move in (('b2', 'c3'), ('g2', 'f3'), ('c1', 'd3'), ('f1', 'e3')):
+            second.push(move)
+        self.assertEqual(first.get_fen(), second.get_fen())
+        self.assertEqual(first.get_zobrist_key(), second.get_zobrist_key())
+
+    def test_turn_changes_the_key(self):
+        white = ChessVar.from_fen('8/7k/8/8/8/8/8/K7 w -', headless=True)
+        black = ChessVar.from_fen('8/7k/8/8/8/8/8/K7 b -', headless=True)
+        self.assertNotEqual(white.get_zobrist_key(), black.get_zobrist_key())
+
+
+class PositionTextTest(unittest.TestCase):
+    """Round trips positions through get_fen and from_fen and through to_bytes and from_bytes"""
+
+    def test_starting_position(self):
+        game = ChessVar(headless=True)
+        self.assertEqual(game.get_fen(), '8/8/8/8/8/8/RBN2nbr/KBN2nbk w -')
+        self.assertEqual(len(game.to_bytes()), POSITION_BYTES)
+
+    def test_random_positions_round_trip(self):
+        rng = random.Random(3)
+        for board_class in BOARD_CLASSES:
+            for plies in range(0, 80, 4):
+                game = _random_game(board_class, rng, plies)
+                from_fen = ChessVar.from_fen(game.get_fen(), board_class(), headless=True)
+                from_bytes = ChessVar.from_bytes(game.to_bytes(), board_class(), headless=True)
+                # the piece lists keep their order through bytes, while FEN can not tell two knights apart
+                self.assertEqual(from_bytes.get_position(), game.get_position())
+                for copy in (from_fen, from_bytes):
+                    self.assertEqual(copy.get_fen(), game.get_fen())
+                    self.assertEqual(copy.get_zobrist_key(), game.get_zobrist_key())
+                    self.assertEqual(sorted(copy.legal_moves()), sorted(game.legal_moves()))
+
+    def test_last_move_round_trips(self):
+        fen = '4K3/8/8/8/8/8/8/k7 b g'
+        game = ChessVar.from_fen(fen, headless=True)
+        self.assertEqual(game.get_fen(), fen)
+        self.assertEqual(ChessVar.from_bytes(game.to_bytes(), headless=True).get_fen(), fen)
+        self.assertEqual(game.get_game_state(), 'UNFINISHED')
+        self.assertEqual(ChessVar.from_fen('4K3/8/8/8/8/8/8/k7 w g', headless=True).get_game_state(), 'WHITE_WON')
+
+    def test_bad_fen_raises(self):
+        for fen in ('8/8/8/8/8/8/8/K6k w', '8/8/8/8/8/8/8/K6k x -', '8/8/8/8/8/8/8/K6k w ?'):
+            with self.assertRaises(ValueError):
+                ChessVar.from_fen(fen, headless=True)
+
+
+class PinTest(unittest.TestCase):
+    """Checks that every board turns down moves of a piece standing between its king and a rook"""
+
+    def test_pinned_rook_can_not_move(self):
+        for board_class in BOARD_CLASSES:
+            pinned = ChessVar.from_fen('r7/7k/8/8/8/8/R7/K7 w -', board_class(), headless=True)
+            free = ChessVar.from_fen('8/7k/8/8/8/8/R7/K7 w -', board_class(), headless=True)
+            self.assertEqual(pinned.get_illegal_reason('a2', 'b2'), 'INVALID_MOVEMENT')
+            self.assertIsNone(free.get_illegal_reason('a2', 'b2'))
+            self.assertEqual(sorted(pinned.legal_moves()), [('a1', 'b1'), ('a1', 'b2')])
+
+    def test_moves_can_not_give_check(self):
+        for board_class in BOARD_CLASSES:
+            game = ChessVar.from_fen('8/7k/8/8/8/8/R7/K7 w -', board_class(), headless=True)
+            self.assertEqual(game.get_illegal_reason('a2', 'a7'), 'INVALID_MOVEMENT')
+            self.assertEqual(game.get_illegal_reason('a2', 'h2'), 'INVALID_MOVEMENT')
+
+
+class ObserverTest(unittest.TestCase):
+    """Checks the events a headless game sends its observers"""
+
+    def test_events_of_a_short_game(self):
+        game = ChessVar.from_fen('8/1K6/8/8/8/7k/r7/1R6 w -', headless=True)
+        events = []
+        game.add_observer(events.append)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(game.make_move('b1', 'b1'))
+            for move in (('b1', 'a1'), ('a2', 'a1'), ('b7', 'b8'), ('a1', 'a2')):
+                self.assertTrue(game.make_move(*move))
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(events, [IllegalMove('b1', 'b1', 'BAD_SPOT'),
+                                  MoveMade('b1', 'a1', 'wr', 'UNFINISHED'),
+                                  Capture('a1', 'wr', 'br'),
+                                  MoveMade('a2', 'a1', 'br', 'UNFINISHED'),
+                                  MoveMade('b7', 'b8', 'wki', 'UNFINISHED'),
+                                  MoveMade('a1', 'a2', 'br', 'WHITE_WON'),
+                                  GameOver('WHITE_WON')])
+        self.assertEqual(len(set(events)), len(events))
+
+    def test_removed_observer_hears_nothing(self):
+        game = ChessVar(headless=True)
+        events = []
+        game.add_observer(events.append)
+        game.remove_observer(events.append)
+        game.make_move('c1', 'd3')
+        self.assertEqual(events, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Tests that game records written by records.write_record are read back unchanged by read_records,
+# including records with no moves and header values holding # signs, quotes and backslashes, and that a record that
+# can not be read is reported without stopping the rest of the archive
+
+import io
+import unittest
+
+from records import read_records, write_record, validate_records
+
+
+class RecordRoundTripTest(unittest.TestCase):
+    """Writes records with write_record and reads them back with read_records"""
+
+    def _round_trip(self, records):
+        """Returns the (headers, moves) of every record read back after writing the inputted ones"""
+        stream = io.StringIO()
+        for headers, moves in records:
+            write_record(stream, headers, moves)
+        stream.seek(0)
+        return [(record.get_headers(), record.get_moves()) for record in read_records(stream)]
+
+    def test_zero_move_record(self):
+        records = [({'Event': 'empty', 'Result': 'UNFINISHED'}, [])]
+        self.assertEqual(self._round_trip(records), records)
+
+    def test_zero_move_record_between_games(self):
+        records = [({'Event': 'first'}, [('a2', 'a3'), ('h2', 'h3')]),
+                   ({'Event': 'empty'}, []),
+                   ({'Event': 'last'}, [('b2', 'c4')])]
+        self.assertEqual(self._round_trip(records), records)
+
+    def test_header_values_with_special_characters(self):
+        records = [({'Event': 'Game #1', 'Site': 'a "quoted" name', 'Path': 'C:\\games\\', 'Note': '#'},
+                    [('a2', 'a3')])]
+        self.assertEqual(self._round_trip(records), records)
+
+
+class ReadRecordsTest(unittest.TestCase):
+    """Reads hand-written archives with read_records"""
+
+    def test_comments_are_ignored(self):
+        text = '[Event "Game #2"] # the second game\na2a3 # first move\nb2c3\n'
+        records = list(read_records(io.StringIO(text)))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].get_headers(), {'Event': 'Game #2'})
+        self.assertEqual(records[0].get_moves(), [('a2', 'a3'), ('b2', 'c3')])
+
+    def test_bad_header_is_reported_per_record(self):
+        text = '[Event "first"]\na2a3\n\n[Event broken]\na2a3\n\n[Event "last"]\nc1d3\n'
+        records = list(read_records(io.StringIO(text)))
+        self.assertEqual([record.get_error() is None for record in records], [True, False, True])
+        self.assertIn('line 4', records[1].get_error())
+        results = list(validate_records(records))
+        self.assertEqual([result.is_valid() for result in results], [True, False, True])
+        self.assertEqual(results[1].get_plies(), 0)
+        self.assertEqual(results[1].to_dict()['error'], records[1].get_error())
+
+
+if __name__ == '__main__':
+    unittest.main()
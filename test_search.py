@@ -0,0 +1,93 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Tests the scores the alpha-beta engine in search.py gives finished games and the moves it picks when
+# a king can win the race
+
+import unittest
+
+from ChessVar import ChessVar, Board, Variant
+from search import Searcher, WIN_SCORE, WIN_BOUND
+
+
+class TerminalScoreTest(unittest.TestCase):
+    """Scores finished games with Searcher._alpha_beta from the point of view of the player to move"""
+
+    def _terminal_score(self, fen, ply=3):
+        """Returns the score _alpha_beta gives the finished game described by the inputted get_fen style text"""
+        game = ChessVar.from_fen(fen, headless=True)
+        self.assertNotEqual(game.get_game_state(), 'UNFINISHED')
+        return Searcher()._alpha_beta(game, 2, -WIN_SCORE * 2, WIN_SCORE * 2, ply)
+
+    def test_white_won_with_white_to_move(self):
+        # black's last move is used up, so white is to move and has won
+        self.assertEqual(self._terminal_score('4K3/8/8/8/8/8/8/k7 w g'), WIN_SCORE - 3)
+
+    def test_black_won_with_white_to_move(self):
+        self.assertEqual(self._terminal_score('k7/8/8/8/8/8/8/4K3 w -'), -WIN_SCORE + 3)
+
+    def test_tie(self):
+        self.assertEqual(self._terminal_score('k3K3/8/8/8/8/8/8/8 w g'), 0)
+
+
+class GraceMoveSearchTest(unittest.TestCase):
+    """Searches positions where white's king has reached row 8 and black has one move left"""
+
+    def test_black_cannot_tie_from_far_away(self):
+        game = ChessVar.from_fen('4K3/8/8/8/8/8/8/k7 b g', headless=True)
+        for depth in (1, 2, 3):
+            game.best_move(max_depth=depth)
+            self.assertLessEqual(game.get_search_info()['score'], -WIN_BOUND)
+
+    def test_black_ties_by_reaching_row_8(self):
+        game = ChessVar.from_fen('4K3/k7/8/8/8/8/8/8 b g', headless=True)
+        move = game.best_move(max_depth=2)
+        self.assertEqual(move[1][1], '8')
+        self.assertEqual(game.get_search_info()['score'], 0)
+
+
+class WinDistanceTest(unittest.TestCase):
+    """Checks that wins and losses count down by one for every ply to the end of the game"""
+
+    def _search(self, fen, depth, searcher=None):
+        """Returns the (move, score) a search of the inputted depth finds for a get_fen style position"""
+        searcher = Searcher() if searcher is None else searcher
+        move = searcher.search(ChessVar.from_fen(fen, headless=True), max_depth=depth)
+        return move, searcher.get_info()['score']
+
+    def test_black_wins_in_one(self):
+        move, score = self._search('8/6k1/8/8/8/8/8/K7 b -', 2)
+        self.assertEqual(move[1][1], '8')
+        self.assertEqual(score, WIN_SCORE - 1)
+
+    def test_white_wins_in_two(self):
+        self.assertEqual(self._search('8/1K6/8/8/8/8/8/6k1 w -', 4)[1], WIN_SCORE - 2)
+        self.assertEqual(self._search('8/1K6/8/8/8/8/8/6k1 b -', 4)[1], -WIN_SCORE + 3)
+
+    def test_table_entries_hold_at_another_ply(self):
+        # the second search starts one ply into the first, so its table entries were stored at other plies
+        searcher = Searcher()
+        game = ChessVar.from_fen('8/1K6/8/8/8/8/8/6k1 b -', headless=True)
+        searcher.search(game, max_depth=4)
+        game.push(searcher.get_info()['move'])
+        warm = searcher.search(game, max_depth=3), searcher.get_info()['score']
+        self.assertEqual(warm, self._search(game.get_fen(), 3))
+        self.assertEqual(warm[1], WIN_SCORE - 2)
+
+
+class VariantTest(unittest.TestCase):
+    """Checks that the engine refuses games it can not evaluate"""
+
+    def test_other_variants_raise(self):
+        for variant in (Variant(10, 10), Variant(8, 8, goal_row=5)):
+            game = ChessVar(Board(variant), headless=True)
+            with self.assertRaises(ValueError):
+                game.best_move(max_depth=1)
+
+    def test_standard_game_searches(self):
+        game = ChessVar(Board(Variant()), headless=True)
+        self.assertIn(game.best_move(max_depth=1), game.legal_moves())
+
+
+if __name__ == '__main__':
+    unittest.main()
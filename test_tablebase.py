@@ -0,0 +1,109 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: Tests the retrograde-analysis tablebases in tablebase.py on the small king against king table: known
+# wins, losses and ties, and every entry checked against the ChessVar rules one move ahead
+
+import shutil
+import tempfile
+import unittest
+
+from ChessVar import ChessVar, BitBoard
+from search import Searcher, WIN_SCORE
+from tablebase import (TablebaseSet, generate, decode, index_position, table_size, parse_signature, sub_signatures,
+                       INVALID)
+
+
+class TablebaseTest(unittest.TestCase):
+    """Generates the KvK table once and probes it"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        generate('KvK', cls.directory, workers=1)
+        cls.tables = TablebaseSet(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tables.close()
+        shutil.rmtree(cls.directory)
+
+    def _probe(self, fen):
+        """Returns the probe result of the position described by the inputted get_fen style text"""
+        return self.tables.probe(ChessVar.from_fen(fen, BitBoard(), headless=True))
+
+    def test_known_results(self):
+        # white steps onto row 8 and black's last move can not reach it
+        self.assertEqual(self._probe('8/1K6/8/8/8/8/8/6k1 w -'), ('WIN', 2))
+        self.assertEqual(self._probe('8/1K6/8/8/8/8/8/6k1 b -'), ('LOSS', 3))
+        # black's last move ties a white king that arrives first
+        self.assertEqual(self._probe('8/1K4k1/8/8/8/8/8/8 w -'), ('TIE', 0))
+        # a king one row further from row 8 loses the race, and one move away wins it at once
+        self.assertEqual(self._probe('8/8/8/8/8/8/1K6/6k1 w -'), ('WIN', 12))
+        self.assertEqual(self._probe('8/6k1/8/8/8/8/1K6/8 b -'), ('WIN', 1))
+
+    def test_search_scores_from_the_table(self):
+        # the race is twelve plies long, but the table scores it after the first move
+        game = ChessVar.from_fen('8/8/8/8/8/8/1K6/6k1 w -', BitBoard(), headless=True)
+        searcher = Searcher(tablebases=self.tables)
+        searcher.search(game, max_depth=1)
+        self.assertEqual(searcher.get_info()['score'], WIN_SCORE - 12)
+
+    def test_missing_table(self):
+        self.assertIsNone(self._probe('8/1K6/8/8/8/8/8/R5k1 w -'))
+
+    def test_every_entry_follows_from_the_moves(self):
+        game = ChessVar(BitBoard(), headless=True)
+        table = self.tables.get_table('KvK')
+        checked = 0
+        for index in range(table_size('KvK')):
+            position = index_position('KvK', index)
+            value = table.get_value(index)
+            if position is None:
+                self.assertEqual(value, INVALID)
+                continue
+            spots, to_move, last_move = position
+            game.set_position((spots, to_move, last_move, None))
+            self.assertEqual(decode(value), self._expected(game), game.get_fen())
+            checked += 1
+        self.assertGreater(checked, 3000)
+
+    def _expected(self, game):
+        """Returns the result of the game's position for the player to move worked out from the table results of
+        the positions one move ahead, as the retrograde analysis should have found it"""
+        state = game.get_game_state()
+        if state == 'TIE':
+            return 'TIE', 0
+        if state != 'UNFINISHED':
+            return ('WIN' if state[0].lower() == game.get_to_move() else 'LOSS'), 0
+        results = []
+        for move in game.legal_moves():
+            game.push(move)
+            results.append(self.tables.probe(game))
+            game.pop()
+        if not results:
+            return 'TIE', 0
+        losses = [distance for result, distance in results if result == 'LOSS']
+        if losses:
+            return 'WIN', min(losses) + 1
+        if all(result == 'WIN' for result, distance in results):
+            return 'LOSS', max(distance for result, distance in results) + 1
+        return 'TIE', 0
+
+
+class SignatureTest(unittest.TestCase):
+    """Checks material signatures"""
+
+    def test_parse_signature(self):
+        self.assertEqual(parse_signature('knrvk'), 'KRNvK')
+        for bad in ('KvKvK', 'RvK', 'KRRvK', 'KQvK'):
+            with self.assertRaises(ValueError):
+                parse_signature(bad)
+
+    def test_sub_signatures(self):
+        self.assertEqual(sorted(sub_signatures('KRvKN')), ['KRvK', 'KvKN'])
+        self.assertEqual(sub_signatures('KvK'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# Author: Alex King
+# GitHub username: AlexKing16
+# Date: 10/18/2026
+# Description: A fixed-size transposition table keyed by the Zobrist hashes from ChessVar.get_zobrist_key, so
+# positions reached by different move orders can share cached results such as legal move lists, evaluations and
+# search bounds
+
+# Kinds of stored search results
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Rough number of bytes one stored entry takes up in memory, used to turn a memory budget into a number of slots
+ENTRY_BYTES = 160
+
+
+class TranspositionTable:
+    """A hash table with a fixed number of buckets. Each bucket has two slots: a depth-preferred slot that keeps the
+    result searched to the greatest depth, and an always-replace slot that takes whatever the depth-preferred slot
+    turns away. Entries are tuples of (key, depth, value, flag, move, age)"""
+    def __init__(self, megabytes=16):
+        """Creates an empty table that fits in roughly the inputted number of megabytes. The number of buckets is
+        rounded down to a power of two so a key can be turned into a bucket with a bit mask"""
+        buckets = max(1, int(megabytes * 1024 * 1024) // (2 * ENTRY_BYTES))
+        self._buckets = 1 << (buckets.bit_length() - 1)
+        self._mask = self._buckets - 1
+        self._depth_slots = [None] * self._buckets
+        self._always_slots = [None] * self._buckets
+        self._age = 0
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+
+    def get_size(self):
+        """Returns the number of entries the table can hold"""
+        return 2 * self._buckets
+
+    def get_stats(self):
+        """Returns a dictionary with the number of probes, hits and stores made since the table was created or
+        last cleared"""
+        return {'probes': self._probes, 'hits': self._hits, 'stores': self._stores}
+
+    def new_search(self):
+        """Marks the start of a new search. Entries from older searches are replaced first"""
+        self._age += 1
+
+    def clear(self):
+        """Removes every entry and resets the statistics"""
+        self._depth_slots = [None] * self._buckets
+        self._always_slots = [None] * self._buckets
+        self._age = 0
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+
+    def probe(self, key):
+        """Returns the (key, depth, value, flag, move, age) entry stored for the inputted key, or None if there is
+        not one"""
+        self._probes += 1
+        index = key & self._mask
+        entry = self._depth_slots[index]
+        if entry is not None and entry[0] == key:
+            self._hits += 1
+            return entry
+        entry = self._always_slots[index]
+        if entry is not None and entry[0] == key:
+            self._hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag=EXACT, move=None):
+        """Stores a result for the inputted key. It goes into the depth-preferred slot if that slot is empty, holds
+        the same key, comes from an older search or was searched no deeper than this result. Otherwise it goes into
+        the always-replace slot"""
+        self._stores += 1
+        index = key & self._mask
+        entry = (key, depth, value, flag, move, self._age)
+        current = self._depth_slots[index]
+        if current is None or current[0] == key or current[5] != self._age or current[1] <= depth:
+            self._depth_slots[index] = entry
+        else:
+            self._always_slots[index] = entry